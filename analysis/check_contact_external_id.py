@@ -1,16 +1,11 @@
 from dotenv import load_dotenv
-import os
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 env_file = '.env.sit'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 desc = sf.Contact.describe()
 external_fields = [f['name'] for f in desc['fields'] if f.get('externalId') == True]
@@ -2,18 +2,13 @@
 Check if Contact.External_Id__c field exists in SIT
 """
 
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv('.env.sit')
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\nChecking Contact object for External_Id__c field...")
 
@@ -3,17 +3,15 @@ Check Contact load results in Salesforce
 """
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
+get_governor(sf, priority='low').checkpoint('api')
 
 print("="*80)
 print("Contact Load Status Check")
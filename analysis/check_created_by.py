@@ -1,14 +1,10 @@
 from dotenv import load_dotenv
 import os
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv('.env.sit')
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 # Get current user ID
 user_info = sf.query(f"SELECT Id, Name, Username FROM User WHERE Username = '{os.getenv('SF_USERNAME')}'")
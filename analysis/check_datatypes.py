@@ -8,7 +8,8 @@ import os
 from dotenv import load_dotenv
 import oracledb
 import pyodbc
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv('.env.sit')
 
@@ -146,12 +147,7 @@ print("\n[3/3] SALESFORCE DATA TYPES (Account Object)")
 print("-" * 80)
 
 try:
-    sf = Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain='test'
-    )
+    sf = get_salesforce(domain='test')
     
     account_desc = sf.Account.describe()
     
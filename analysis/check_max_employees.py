@@ -1,18 +1,14 @@
 """
 Check which employer has the maximum NumberOfEmployees
 """
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 from dotenv import load_dotenv
 import os
 
 load_dotenv('.env.sit')
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN')
-)
+sf = get_salesforce(domain=os.getenv('SF_DOMAIN', 'login'))
 
 print("Checking employer with maximum employees...")
 print("="*80)
@@ -1,14 +1,11 @@
 from dotenv import load_dotenv
-import os
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 load_dotenv('.env.sit')
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
+get_governor(sf, priority='low').checkpoint('api')
 
 print("Checking for related records blocking deletion:")
 print("="*70)
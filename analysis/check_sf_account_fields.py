@@ -2,9 +2,9 @@
 Check if new Salesforce Account fields exist before loading data
 """
 
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv('.env.sit')
 
@@ -12,12 +12,7 @@ print("\n" + "="*80)
 print("SALESFORCE ACCOUNT FIELD VERIFICATION")
 print("="*80)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 account_desc = sf.Account.describe()
 
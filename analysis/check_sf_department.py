@@ -5,18 +5,16 @@ Query field metadata and actual values
 
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 # Connect to Salesforce (use .env.sit file)
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
+get_governor(sf, priority='low').checkpoint('api')
 
 print("=" * 80)
 print("SALESFORCE CONTACT DEPARTMENT FIELDS ANALYSIS")
@@ -5,7 +5,9 @@ Query actual values to understand what this field represents
 
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 # Load environment variables
 load_dotenv()
@@ -14,12 +16,8 @@ load_dotenv()
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
+get_governor(sf, priority='low').checkpoint('api')
 
 print("=" * 80)
 print("SALESFORCE CONTACT.IDSTATUS__C FIELD VALUES ANALYSIS")
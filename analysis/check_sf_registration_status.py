@@ -2,20 +2,15 @@
 Check if Salesforce Contact.RegistrationStatus__c has all required picklist values
 """
 
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv('.env.sit')
 
 def connect_salesforce():
     """Establish Salesforce connection"""
-    return Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain=os.getenv('SF_DOMAIN', 'test')
-    )
+    return get_salesforce()
 
 print("="*80)
 print("Checking Contact.RegistrationStatus__c picklist values")
@@ -98,14 +98,10 @@ print('\n' + '='*80)
 print('Salesforce Account Object - Communication Preference Fields')
 print('='*80)
 
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 account_desc = sf.Account.describe()
 
@@ -1,18 +1,14 @@
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 # Load environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
 
 print("=" * 80)
 print("Salesforce Contact.Union__c Field Metadata")
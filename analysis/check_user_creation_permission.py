@@ -4,16 +4,14 @@ Check if current user has permission to create Salesforce users
 
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 load_dotenv()
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
+get_governor(sf, priority='low').checkpoint('api')
 
 print("=" * 80)
 print("CHECKING USER PERMISSIONS FOR USER CREATION")
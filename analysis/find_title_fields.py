@@ -1,16 +1,12 @@
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
 
 print("Searching for Title/Gender related fields on Contact object...\n")
 
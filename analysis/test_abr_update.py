@@ -2,10 +2,10 @@
 Quick test - Update 10 accounts with ABR data
 """
 
-import os
 from dotenv import load_dotenv
 import pandas as pd
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 import pyodbc
 
 load_dotenv('.env.sit')
@@ -13,12 +13,7 @@ load_dotenv('.env.sit')
 print("Testing ABR enrichment on 10 accounts...")
 
 # Connect to SF
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 # Get 10 accounts
 result = sf.query("SELECT Id, ABN__c FROM Account WHERE External_Id__c != null AND ABN__c != null LIMIT 10")
@@ -3,7 +3,8 @@ Quick test to identify Contact load error
 """
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 import pandas as pd
 
 # Load environment
@@ -11,12 +12,7 @@ env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
 
 print("Testing Contact field permissions and data format...\n")
 
@@ -1,20 +1,17 @@
 """
 Verify SQL Server ABR enrichment fields loaded successfully
 """
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
+from sf_limits import get_governor
 
 # Load SIT credentials
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
+get_governor(sf, priority='low').checkpoint('api')
 
 print("\n" + "="*70)
 print("SQL Server ABR Field Verification")
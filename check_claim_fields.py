@@ -3,18 +3,14 @@ Check Claim__c and ClaimComponent__c object fields in Salesforce SIT
 """
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 # Load SIT environment
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 100)
 print("CLAIM__C OBJECT FIELDS - SALESFORCE SIT")
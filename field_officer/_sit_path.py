@@ -0,0 +1,8 @@
+"""Puts the shared Salesforce helpers in sit/ on sys.path - import before any sf_* module"""
+
+import os
+import sys
+
+SIT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sit')
+if SIT_DIR not in sys.path:
+    sys.path.insert(0, SIT_DIR)
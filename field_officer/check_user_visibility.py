@@ -2,7 +2,8 @@
 Check User visibility settings for failing Field Officers
 """
 import os
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 from dotenv import load_dotenv
 
 # Load SIT environment variables (same as sit_contact_load.py)
@@ -10,12 +11,7 @@ env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
 # Connect to Salesforce SIT
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 80)
 print("FIELD OFFICER USER VISIBILITY CHECK")
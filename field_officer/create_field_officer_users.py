@@ -6,19 +6,17 @@ ONLY RUN THIS IF check_user_creation_permission.py shows you have admin rights
 import os
 import csv
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+
+import _sit_path
+from sf_collections import create_records, find_existing, error_text, has_error_code
+from sf_session import get_salesforce
 
 # Load SIT environment (same as sit_contact_load.py)
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 print(f"Using environment: {env_file}\n")
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 80)
 print("CREATING FIELD OFFICER SALESFORCE USERS")
@@ -59,6 +57,7 @@ print("-" * 80)
 
 created = []
 errors = []
+pending = []  # (officer_code, is_active, user_data) not yet in Salesforce
 
 for officer in officers_to_create:
     officer_code = officer['Officer_Code']
@@ -93,81 +92,72 @@ for officer in officers_to_create:
         'MobilePhone': mobile if mobile else None,
         'IsActive': is_active
     }
-    
-    try:
-        # Check if user already exists
-        existing = sf.query(f"SELECT Id FROM User WHERE Username = '{email}'")
-        
-        if existing['totalSize'] > 0:
-            print(f"⚠️  {officer_code} ({email}): Already exists")
+    pending.append((officer_code, is_active, user_data))
+
+# Check which users already exist (one batched query instead of one per officer)
+existing_users = find_existing(sf, 'User', 'Username', [user_data['Username'] for _, _, user_data in pending])
+
+to_create = []
+for officer_code, is_active, user_data in pending:
+    email = user_data['Username']
+    if email in existing_users:
+        print(f"⚠️  {officer_code} ({email}): Already exists")
+        created.append({
+            'Officer_Code': officer_code,
+            'Salesforce_User_Id': existing_users[email]['Id'],
+            'Email': email,
+            'Status': 'Already Exists',
+            'Is_Active': 'Y' if is_active else 'N'
+        })
+    else:
+        to_create.append((officer_code, is_active, user_data))
+
+# Create new users in sObject Collections calls of 200
+results = create_records(sf, 'User', [user_data for _, _, user_data in to_create])
+
+retry = []  # Duplicates get a second attempt with a numbered suffix
+for (officer_code, is_active, user_data), result in zip(to_create, results):
+    email = user_data['Username']
+    if result['success']:
+        print(f"✅ {officer_code} ({email}): Created successfully")
+        created.append({
+            'Officer_Code': officer_code,
+            'Salesforce_User_Id': result['id'],
+            'Email': email,
+            'Status': 'Created',
+            'Is_Active': 'Y' if is_active else 'N'
+        })
+    elif has_error_code(result, 'DUPLICATE_USERNAME', 'DUPLICATE_VALUE'):
+        # If duplicate, try with .2 suffix
+        email_alt = email.replace('.sit@', '.sit2@')
+        retry.append((officer_code, is_active, dict(user_data, Username=email_alt, Email=email_alt)))
+    else:
+        print(f"❌ {officer_code} ({email}): {error_text(result)}")
+        errors.append({
+            'Officer_Code': officer_code,
+            'Email': email,
+            'Error': error_text(result)
+        })
+
+if retry:
+    results = create_records(sf, 'User', [user_data for _, _, user_data in retry])
+    for (officer_code, is_active, user_data), result in zip(retry, results):
+        email_alt = user_data['Username']
+        if result['success']:
+            print(f"✅ {officer_code} ({email_alt}): Created with alternate email")
             created.append({
                 'Officer_Code': officer_code,
-                'Salesforce_User_Id': existing['records'][0]['Id'],
-                'Email': email,
-                'Status': 'Already Exists',
+                'Salesforce_User_Id': result['id'],
+                'Email': email_alt,
+                'Status': 'Created (Alt)',
                 'Is_Active': 'Y' if is_active else 'N'
             })
         else:
-            # Create new user
-            result = sf.User.create(user_data)
-            
-            if result['success']:
-                print(f"✅ {officer_code} ({email}): Created successfully")
-                created.append({
-                    'Officer_Code': officer_code,
-                    'Salesforce_User_Id': result['id'],
-                    'Email': email,
-                    'Status': 'Created',
-                    'Is_Active': 'Y' if is_active else 'N'
-                })
-            else:
-                print(f"❌ {officer_code} ({email}): {result['errors']}")
-                errors.append({
-                    'Officer_Code': officer_code,
-                    'Email': email,
-                    'Error': str(result['errors'])
-                })
-    
-    except Exception as e:
-        error_msg = str(e)
-        # If duplicate, try with numbered suffix
-        if 'DUPLICATE_USERNAME' in error_msg or 'DUPLICATE_VALUE' in error_msg:
-            try:
-                # Try with .2 suffix
-                email_alt = email.replace('.sit@', '.sit2@')
-                user_data['Username'] = email_alt
-                user_data['Email'] = email_alt
-                
-                result = sf.User.create(user_data)
-                if result['success']:
-                    print(f"✅ {officer_code} ({email_alt}): Created with alternate email")
-                    created.append({
-                        'Officer_Code': officer_code,
-                        'Salesforce_User_Id': result['id'],
-                        'Email': email_alt,
-                        'Status': 'Created (Alt)',
-                        'Is_Active': 'Y' if is_active else 'N'
-                    })
-                else:
-                    print(f"❌ {officer_code} ({email_alt}): {result['errors']}")
-                    errors.append({
-                        'Officer_Code': officer_code,
-                        'Email': email_alt,
-                        'Error': str(result['errors'])
-                    })
-            except Exception as e2:
-                print(f"❌ {officer_code}: {str(e2)}")
-                errors.append({
-                    'Officer_Code': officer_code,
-                    'Email': email,
-                    'Error': str(e2)
-                })
-        else:
-            print(f"❌ {officer_code} ({email}): {error_msg}")
+            print(f"❌ {officer_code} ({email_alt}): {error_text(result)}")
             errors.append({
                 'Officer_Code': officer_code,
-                'Email': email,
-                'Error': error_msg
+                'Email': email_alt,
+                'Error': error_text(result)
             })
 
 # Step 4: Export mapping
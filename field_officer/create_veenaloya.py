@@ -6,7 +6,8 @@ import os
 import csv
 from dotenv import load_dotenv
 import oracledb
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 
 load_dotenv()
 
@@ -61,12 +62,7 @@ if result:
     
     # Create SF user
     print("\nCreating Salesforce user...")
-    sf = Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain='test'
-    )
+    sf = get_salesforce(domain='test')
     
     profiles = sf.query("SELECT Id FROM Profile WHERE Name = 'Standard User' LIMIT 1")
     profile_id = profiles['records'][0]['Id']
@@ -6,7 +6,10 @@ import os
 import csv
 import pandas as pd
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+
+import _sit_path
+from sf_collections import upsert_records, error_text, summarize_results
+from sf_session import get_salesforce
 
 # Load environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -27,12 +30,7 @@ print(f"Loaded {len(FIELD_OFFICER_MAPPING)} Field Officer mappings (active and i
 print("SF Admin confirmed: Can assign contacts to inactive users\n")
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 # Read error file
 error_file = 'error/sit_contact_errors_20260211_125535.csv'
@@ -97,20 +95,22 @@ conn.close()
 # Update Salesforce
 print(f"\nUpdating {len(updates)} contacts...\n")
 
-success = 0
-errors = 0
-
-for update in updates:
-    try:
-        sf.Contact.upsert(
-            'External_Id__c/' + update['External_Id__c'],
-            {'FieldOfficerAllocated__c': update['FieldOfficerAllocated__c']}
-        )
+# Upsert in sObject Collections calls of 200 (one call for a typical retry)
+results = upsert_records(sf, 'Contact', 'External_Id__c', [
+    {
+        'External_Id__c': update['External_Id__c'],
+        'FieldOfficerAllocated__c': update['FieldOfficerAllocated__c']
+    }
+    for update in updates
+])
+
+for update, result in zip(updates, results):
+    if result['success']:
         print(f"✅ {update['External_Id__c']}: {update['Officer_Code']} → {update['Status']}")
-        success += 1
-    except Exception as e:
-        print(f"❌ {update['External_Id__c']}: {str(e)}")
-        errors += 1
+    else:
+        print(f"❌ {update['External_Id__c']}: {error_text(result)}")
+
+success, errors = summarize_results(results)
 
 print("\n" + "=" * 80)
 print("SUMMARY")
@@ -12,18 +12,16 @@ Instructions:
 import os
 import csv
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+
+import _sit_path
+from sf_collections import update_records, error_text
+from sf_session import get_salesforce
 
 # Load SIT environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 80)
 print("UPDATE FIELD OFFICER EMAIL ADDRESSES")
@@ -59,6 +57,7 @@ print(f"Found {len(current_mapping)} officers in current mapping\n")
 success = 0
 errors = 0
 skipped = 0
+updates = []  # (officer_code, real_email, user record)
 
 for officer_code, real_email in real_emails.items():
     if officer_code not in current_mapping:
@@ -67,27 +66,30 @@ for officer_code, real_email in real_emails.items():
         continue
     
     user_id = current_mapping[officer_code]['Salesforce_User_Id']
+    updates.append((officer_code, real_email, {
+        'Id': user_id,
+        'Email': real_email,
+        'Username': real_email  # Username must also be updated for login
+    }))
+
+# Update in sObject Collections calls of 200
+results = update_records(sf, 'User', [record for _, _, record in updates])
+
+for (officer_code, real_email, record), result in zip(updates, results):
     current_email = current_mapping[officer_code]['Email']
     
-    print(f"{officer_code} ({user_id}):")
+    print(f"{officer_code} ({record['Id']}):")
     print(f"  Current: {current_email}")
     print(f"  New:     {real_email}")
     
-    try:
-        # Update Salesforce User
-        sf.User.update(user_id, {
-            'Email': real_email,
-            'Username': real_email  # Username must also be updated for login
-        })
+    if result['success']:
         print(f"  ✅ Updated")
         success += 1
         
         # Update mapping file
         current_mapping[officer_code]['Email'] = real_email
-        
-    except Exception as e:
-        error_msg = str(e)
-        print(f"  ❌ Failed: {error_msg[:80]}")
+    else:
+        print(f"  ❌ Failed: {error_text(result)[:80]}")
         errors += 1
 
 # Write updated mapping
@@ -2,19 +2,15 @@
 Verify Field Officer users exist and check API user's view permissions
 """
 import os
-from simple_salesforce import Salesforce
+import _sit_path
+from sf_session import get_salesforce
 from dotenv import load_dotenv
 
 # Load SIT environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 80)
 print("USER VISIBILITY INVESTIGATION")
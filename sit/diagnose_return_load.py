@@ -6,7 +6,7 @@ Check Account matching and data quality
 import os
 from dotenv import load_dotenv
 import oracledb
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
 
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
 load_dotenv(env_file)
@@ -54,12 +54,7 @@ conn.close()
 
 # Connect to Salesforce
 print("\n[2/3] Checking Salesforce Accounts...")
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN', 'test')
-)
+sf = get_salesforce()
 
 # Total accounts in Salesforce
 result = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null")
@@ -0,0 +1,133 @@
+"""
+sObject Collections writer for small-volume writes
+Groups create/update/upsert/delete into /composite/sobjects calls of up to 200 records
+instead of one REST call per record, and does existence checks with one batched query.
+
+Every write returns one result per input record, in input order:
+    {'index', 'record', 'success', 'id', 'created', 'errors'}
+so partial successes map straight back to the rows that produced them.
+Calls go through the shared keep-alive transport (sf_http), so large collections
+are gzip-compressed; transient 5xx responses are retried for updates, upserts and
+deletes (safe to repeat), never for creates (a retry could insert duplicates).
+"""
+
+from sf_http import get_transport
+
+COLLECTION_SIZE = 200   # Salesforce limit per sObject Collections call
+QUERY_IN_CHUNK = 300    # Values per SOQL IN clause for existence checks
+
+def chunked(items, size):
+    """Yield successive slices of a list"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def soql_quote(value):
+    """Quote a value for a SOQL string literal"""
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def _with_type(sobject, record):
+    """Add the attributes.type block collections calls require"""
+    payload = {'attributes': {'type': sobject}}
+    payload.update(record)
+    return payload
+
+def _map_results(offset, records, responses):
+    """Pair collections responses with the input records"""
+    results = []
+    for i, record in enumerate(records):
+        response = responses[i] if i < len(responses) else {}
+        results.append({
+            'index': offset + i,
+            'record': record,
+            'success': bool(response.get('success')),
+            'id': response.get('id'),
+            'created': response.get('created'),
+            'errors': response.get('errors', []) if response else [{'message': 'No result returned'}],
+        })
+    return results
+
+def _failed_chunk(offset, records, error):
+    """Mark every record in a chunk as failed when the whole call raised"""
+    return [{
+        'index': offset + i,
+        'record': record,
+        'success': False,
+        'id': None,
+        'created': None,
+        'errors': [{'statusCode': 'REQUEST_FAILED', 'message': str(error)}],
+    } for i, record in enumerate(records)]
+
+def _write(sf, method, path, sobject, records, all_or_none, retry_writes=False):
+    results = []
+    for offset in range(0, len(records), COLLECTION_SIZE):
+        chunk = records[offset:offset + COLLECTION_SIZE]
+        payload = {
+            'allOrNone': all_or_none,
+            'records': [_with_type(sobject, record) for record in chunk]
+        }
+        try:
+            responses = get_transport(sf).call(method, path, json=payload, retry_writes=retry_writes)
+            results.extend(_map_results(offset, chunk, responses or []))
+        except Exception as e:
+            results.extend(_failed_chunk(offset, chunk, e))
+    return results
+
+def create_records(sf, sobject, records, all_or_none=False):
+    """Insert records (list of field dicts) in collections of 200"""
+    return _write(sf, 'POST', 'composite/sobjects', sobject, records, all_or_none)
+
+def update_records(sf, sobject, records, all_or_none=False):
+    """Update records (each dict must include 'Id') in collections of 200"""
+    return _write(sf, 'PATCH', 'composite/sobjects', sobject, records, all_or_none, retry_writes=True)
+
+def upsert_records(sf, sobject, external_id_field, records, all_or_none=False):
+    """Upsert records by an External ID field in collections of 200"""
+    path = f'composite/sobjects/{sobject}/{external_id_field}'
+    return _write(sf, 'PATCH', path, sobject, records, all_or_none, retry_writes=True)
+
+def delete_records(sf, ids, all_or_none=False):
+    """Delete records by Id in collections of 200"""
+    results = []
+    for offset in range(0, len(ids), COLLECTION_SIZE):
+        chunk = list(ids[offset:offset + COLLECTION_SIZE])
+        params = {'ids': ','.join(chunk), 'allOrNone': str(all_or_none).lower()}
+        try:
+            responses = get_transport(sf).call('DELETE', 'composite/sobjects', params=params)
+            results.extend(_map_results(offset, chunk, responses or []))
+        except Exception as e:
+            results.extend(_failed_chunk(offset, chunk, e))
+    return results
+
+def find_existing(sf, sobject, field, values, extra_fields=None):
+    """
+    Batched existence check: {field value: record} for values that exist
+    One query per QUERY_IN_CHUNK values (a single query for typical fix-up volumes)
+    """
+    unique_values = list(dict.fromkeys(v for v in values if v not in (None, '')))
+    select_fields = ['Id', field] + [f for f in (extra_fields or []) if f not in ('Id', field)]
+
+    existing = {}
+    for chunk in chunked(unique_values, QUERY_IN_CHUNK):
+        in_clause = ','.join(soql_quote(v) for v in chunk)
+        result = sf.query_all(
+            f"SELECT {', '.join(select_fields)} FROM {sobject} WHERE {field} IN ({in_clause})"
+        )
+        for record in result['records']:
+            existing[record[field]] = record
+    return existing
+
+def error_text(result):
+    """Readable error string for a failed result"""
+    return '; '.join(
+        f"{err.get('statusCode', '')}: {err.get('message', err)}".strip(': ')
+        for err in result['errors']
+    ) or 'Unknown error'
+
+def has_error_code(result, *codes):
+    """True if any error on the result has one of the given status codes"""
+    return any(err.get('statusCode') in codes for err in result['errors'])
+
+def summarize_results(results):
+    """(success_count, error_count) for a list of results"""
+    success = sum(1 for r in results if r['success'])
+    return success, len(results) - success
@@ -0,0 +1,269 @@
+"""
+Composite Graph planner and executor for parent + child loads
+Packs parent records (e.g. Return__c) and their children (e.g. ServiceReport__c)
+into Composite Graph calls instead of 25-operation /composite requests.
+
+Limits (Salesforce Composite Graph API):
+- 500 nodes (sub-requests) per graph
+- 500 nodes in total per call, spread over one or more graphs
+- each graph is transactional: one failed node rolls back the whole graph
+
+Planner rules:
+- a parent and its children are placed in the same graph when they fit
+- small units are first-fit packed into graphs of GRAPH_TARGET_NODES
+  (smaller graphs = smaller rollback when one record fails)
+- a parent with more children than fit in one graph is split: the first graph
+  holds the parent + as many children as fit, the remaining children go into
+  continuation graphs that reference the parent by External ID and are only
+  sent (in a later call) once the parent graph has succeeded
+- graphs are first-fit packed into calls; no parent is ever dropped
+"""
+
+import copy
+from sf_http import get_transport
+
+GRAPH_MAX_NODES = 500       # Salesforce limit per graph
+CALL_MAX_NODES = 500        # Salesforce limit per Composite Graph call
+CALL_MAX_GRAPHS = 75        # Salesforce limit on graphs per call
+GRAPH_TARGET_NODES = 100    # Preferred graph size for packing small units
+OPEN_GRAPH_WINDOW = 16      # Graphs kept open for first-fit packing
+
+# /composite backend limits (same planner, one non-transactional "graph" per call)
+COMPOSITE_MAX_NODES = 25
+
+SUCCESS_STATUSES = (200, 201, 204)
+
+def make_unit(key, parent_node, child_nodes, parent_field, relationship, parent_reference):
+    """
+    Describe one parent record and its children for the planner
+    child_nodes reference the parent through '@{<parent referenceId>.id}' in parent_field;
+    when a unit has to be split, overflow children are rewritten to use
+    relationship: parent_reference (e.g. Return__r: {'External_Id__c': '123'}) instead
+    """
+    return {
+        'key': key,
+        'parent': parent_node,
+        'children': child_nodes,
+        'detach': {
+            'field': parent_field,
+            'relationship': relationship,
+            'reference': parent_reference,
+        },
+    }
+
+def detach_child(node, detach):
+    """Rewrite a child node to reference its parent by External ID rather than @{ref.id}"""
+    detached = copy.deepcopy(node)
+    detached['body'].pop(detach['field'], None)
+    detached['body'][detach['relationship']] = detach['reference']
+    return detached
+
+def _new_graph(graphs, depends_on=None):
+    graph = {
+        'graphId': f"g{len(graphs) + 1}",
+        'nodes': [],
+        'keys': [],
+        'depends_on': depends_on,
+    }
+    graphs.append(graph)
+    return graph
+
+def plan_graphs(units, graph_target_nodes=GRAPH_TARGET_NODES, graph_max_nodes=GRAPH_MAX_NODES):
+    """
+    Pack units into graphs
+    Returns (graphs, continuation_graphs); continuation graphs depend on a graph in the first list
+    """
+    graphs = []
+    continuations = []
+    open_graphs = []
+
+    for unit in units:
+        size = 1 + len(unit['children'])
+
+        if size <= graph_max_nodes:
+            # First-fit into an open graph, otherwise start a new one
+            target = None
+            if size <= graph_target_nodes:
+                for graph in open_graphs:
+                    if len(graph['nodes']) + size <= graph_target_nodes:
+                        target = graph
+                        break
+            if target is None:
+                target = _new_graph(graphs)
+                if size < graph_target_nodes:
+                    open_graphs.append(target)
+                    if len(open_graphs) > OPEN_GRAPH_WINDOW:
+                        # Close the fullest graph to keep first-fit cheap
+                        open_graphs.remove(max(open_graphs, key=lambda g: len(g['nodes'])))
+
+            target['nodes'].append(unit['parent'])
+            target['nodes'].extend(unit['children'])
+            target['keys'].append(unit['key'])
+
+            if len(target['nodes']) >= graph_target_nodes and target in open_graphs:
+                open_graphs.remove(target)
+            continue
+
+        # Oversized unit: parent + first children, then dependent continuation graphs
+        head = _new_graph(graphs)
+        head_children = graph_max_nodes - 1
+        head['nodes'].append(unit['parent'])
+        head['nodes'].extend(unit['children'][:head_children])
+        head['keys'].append(unit['key'])
+
+        remaining = unit['children'][head_children:]
+        for i in range(0, len(remaining), graph_max_nodes):
+            graph = {
+                'graphId': f"{head['graphId']}_c{i // graph_max_nodes + 1}",
+                'nodes': [detach_child(node, unit['detach']) for node in remaining[i:i + graph_max_nodes]],
+                'keys': [unit['key']],
+                'depends_on': head['graphId'],
+            }
+            continuations.append(graph)
+
+    return graphs, continuations
+
+def pack_calls(graphs, call_max_nodes=CALL_MAX_NODES, call_max_graphs=CALL_MAX_GRAPHS):
+    """First-fit pack graphs into calls by node count and graph count"""
+    calls = []
+    for graph in sorted(graphs, key=lambda g: len(g['nodes']), reverse=True):
+        size = len(graph['nodes'])
+        target = None
+        for call in calls:
+            if call['nodes'] + size <= call_max_nodes and len(call['graphs']) < call_max_graphs:
+                target = call
+                break
+        if target is None:
+            target = {'nodes': 0, 'graphs': []}
+            calls.append(target)
+        target['graphs'].append(graph)
+        target['nodes'] += size
+    return [call['graphs'] for call in calls]
+
+def plan_graph_calls(units, graph_target_nodes=GRAPH_TARGET_NODES, graph_max_nodes=GRAPH_MAX_NODES,
+                     call_max_nodes=CALL_MAX_NODES, call_max_graphs=CALL_MAX_GRAPHS):
+    """
+    Full plan: list of calls, each a list of graphs
+    Continuation graphs are always placed in calls after every primary graph
+    """
+    graph_max_nodes = min(graph_max_nodes, call_max_nodes)
+    graph_target_nodes = min(graph_target_nodes, graph_max_nodes)
+
+    graphs, continuations = plan_graphs(units, graph_target_nodes, graph_max_nodes)
+    calls = pack_calls(graphs, call_max_nodes, call_max_graphs)
+    calls.extend(pack_calls(continuations, call_max_nodes, call_max_graphs))
+    return calls
+
+def summarize_plan(calls):
+    """Counts for logging: calls, graphs, nodes, parents"""
+    graphs = [graph for call in calls for graph in call]
+    return {
+        'calls': len(calls),
+        'graphs': len(graphs),
+        'nodes': sum(len(graph['nodes']) for graph in graphs),
+        'parents': len({key for graph in graphs if not graph['depends_on'] for key in graph['keys']}),
+        'continuations': sum(1 for graph in graphs if graph['depends_on']),
+    }
+
+def _node_errors(graph_id, sub_responses):
+    """Collect failed nodes from a compositeResponse list"""
+    success_count = 0
+    errors = []
+    for sub_response in sub_responses:
+        http_status = sub_response.get('httpStatusCode')
+        if http_status in SUCCESS_STATUSES:
+            success_count += 1
+        else:
+            errors.append({
+                'graphId': graph_id,
+                'referenceId': sub_response.get('referenceId'),
+                'httpStatus': http_status,
+                'error': sub_response.get('body')
+            })
+    return success_count, errors
+
+def execute_graph_call(sf, graphs, timeout=120):
+    """
+    POST one Composite Graph call
+    Returns {'success', 'graph_results': {graphId: bool}, 'success_count', 'error_count', 'errors'}
+    """
+    payload = {
+        "graphs": [
+            {"graphId": graph['graphId'], "compositeRequest": graph['nodes']}
+            for graph in graphs
+        ]
+    }
+
+    try:
+        response = get_transport(sf).request('POST', 'composite/graph', json=payload, timeout=timeout)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    if response.status_code != 200:
+        return {'success': False, 'error': f"HTTP {response.status_code}: {response.text}"}
+
+    graph_results = {}
+    success_count = 0
+    errors = []
+    for graph_response in response.json().get('graphs', []):
+        graph_id = graph_response.get('graphId')
+        is_successful = bool(graph_response.get('isSuccessful'))
+        graph_results[graph_id] = is_successful
+
+        sub_responses = graph_response.get('graphResponse', {}).get('compositeResponse', [])
+        if is_successful:
+            success_count += len(sub_responses)
+        else:
+            # Graph rolled back - every node counts as failed, keep the real causes
+            _, node_errors = _node_errors(graph_id, sub_responses)
+            errors.extend(node_errors)
+
+    error_count = sum(len(graph['nodes']) for graph in graphs) - success_count
+    return {
+        'success': True,
+        'graph_results': graph_results,
+        'success_count': success_count,
+        'error_count': error_count,
+        'errors': errors
+    }
+
+def execute_composite_call(sf, graphs, timeout=120):
+    """
+    POST one /composite call (allOrNone false) for the /composite backend
+    Same result shape as execute_graph_call. Nodes are not rolled back here, so a graph counts as
+    successful when its first node (the parent continuation graphs reference) succeeded
+    """
+    payload = {
+        "allOrNone": False,
+        "compositeRequest": [node for graph in graphs for node in graph['nodes']]
+    }
+
+    try:
+        response = get_transport(sf).request('POST', 'composite', json=payload, timeout=timeout)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+    if response.status_code != 200:
+        return {'success': False, 'error': f"HTTP {response.status_code}: {response.text}"}
+
+    sub_responses = response.json().get('compositeResponse', [])
+    graph_results = {}
+    success_count = 0
+    errors = []
+    offset = 0
+    for graph in graphs:
+        graph_sub_responses = sub_responses[offset:offset + len(graph['nodes'])]
+        offset += len(graph['nodes'])
+        graph_success, graph_errors = _node_errors(graph['graphId'], graph_sub_responses)
+        graph_results[graph['graphId']] = bool(graph_sub_responses) and \
+            graph_sub_responses[0].get('httpStatusCode') in SUCCESS_STATUSES
+        success_count += graph_success
+        errors.extend(graph_errors)
+
+    return {
+        'success': True,
+        'graph_results': graph_results,
+        'success_count': success_count,
+        'error_count': len(payload['compositeRequest']) - success_count,
+        'errors': errors
+    }
@@ -0,0 +1,229 @@
+"""
+Persistent External_Id__c -> Salesforce Id crosswalk
+SQLite store (test_output/crosswalk.sqlite) with one row per (object, External ID):
+    sf_id, parent_external_id (e.g. the Contact's Account External ID), created flag
+
+- populated from upsert results (they already carry id + created) as loads run
+- backfilled in full from one Bulk API 2.0 query per object
+- loaders resolve lookups from it in bulk instead of repeated SOQL
+- verify() is a cheap consistency check: org COUNT() vs local count, plus a random
+  sample re-queried by Id to catch rows deleted or merged in the org
+
+    python sf_crosswalk.py                      # verify Account, Contact, Return__c
+    python sf_crosswalk.py --backfill Contact   # rebuild from the org
+"""
+
+import os
+import csv
+import io
+import sqlite3
+from datetime import datetime
+
+CROSSWALK_PATH = 'test_output/crosswalk.sqlite'
+SQL_IN_CHUNK = 900          # Below SQLite's host parameter limit
+SOQL_ID_CHUNK = 200         # Ids per verification query
+VERIFY_SAMPLE = 200
+
+# Parent relationship stored for each object on backfill
+PARENT_PATHS = {
+    'Account': None,
+    'Contact': 'Account.External_Id__c',
+    'Return__c': 'Employer__r.External_Id__c',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crosswalk (
+    object_name TEXT NOT NULL,
+    external_id TEXT NOT NULL,
+    sf_id TEXT NOT NULL,
+    parent_external_id TEXT,
+    created INTEGER,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (object_name, external_id)
+);
+CREATE INDEX IF NOT EXISTS crosswalk_sf_id ON crosswalk (object_name, sf_id);
+CREATE TABLE IF NOT EXISTS backfills (
+    object_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    backfilled_at TEXT NOT NULL
+);
+"""
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _chunks(items, size):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _parent_value(record, parent_field):
+    """External ID held in a relationship payload like {'Account': {'External_Id__c': '123'}}"""
+    if not parent_field:
+        return None
+    reference = record.get(parent_field)
+    if isinstance(reference, dict):
+        return next(iter(reference.values()), None)
+    return reference
+
+class Crosswalk:
+    """SQLite-backed External ID -> Salesforce Id map, one table for all objects"""
+
+    def __init__(self, path=CROSSWALK_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # Writes ------------------------------------------------------------------
+
+    def record_results(self, object_name, records, results, external_id_field='External_Id__c',
+                       parent_field=None):
+        """
+        Store successful upsert results (Bulk API or sObject Collections, in input order)
+        parent_field: relationship key in the payload (e.g. 'Account'); a record sent without
+        it keeps the parent already stored
+        """
+        now = _now()
+        rows = [
+            (object_name, str(record[external_id_field]), result['id'],
+             _parent_value(record, parent_field), int(bool(result.get('created'))), now)
+            for record, result in zip(records, results)
+            if result.get('success') and result.get('id') and record.get(external_id_field) is not None
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO crosswalk VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (object_name, external_id) DO UPDATE SET "
+                "sf_id = excluded.sf_id, "
+                "parent_external_id = COALESCE(excluded.parent_external_id, crosswalk.parent_external_id), "
+                "updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def backfill(self, sf, object_name, external_id_field='External_Id__c', parent_path=None,
+                 where=None):
+        """
+        Replace an object's rows with one Bulk API 2.0 query of the org
+        parent_path: relationship field to store as parent (e.g. 'Account.External_Id__c')
+        """
+        fields = ['Id', external_id_field] + ([parent_path] if parent_path else [])
+        soql = (f"SELECT {', '.join(fields)} FROM {object_name} "
+                f"WHERE {where or f'{external_id_field} != null'}")
+        now = _now()
+        total = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM crosswalk WHERE object_name = ?", (object_name,))
+            for page in getattr(sf.bulk2, object_name).query(soql):
+                rows = [
+                    (object_name, row[external_id_field], row['Id'],
+                     (row.get(parent_path) or None) if parent_path else None, None, now)
+                    for row in csv.DictReader(io.StringIO(page))
+                ]
+                self.conn.executemany("INSERT OR REPLACE INTO crosswalk VALUES (?, ?, ?, ?, ?, ?)", rows)
+                total += len(rows)
+            self.conn.execute("INSERT OR REPLACE INTO backfills VALUES (?, ?, ?)", (object_name, total, now))
+        return total
+
+    def evict(self, object_name, sf_ids):
+        """Drop rows whose Salesforce record no longer exists"""
+        with self.conn:
+            for chunk in _chunks(sf_ids, SQL_IN_CHUNK):
+                self.conn.execute(
+                    f"DELETE FROM crosswalk WHERE object_name = ? AND sf_id IN ({','.join('?' * len(chunk))})",
+                    [object_name, *chunk]
+                )
+
+    # Reads -------------------------------------------------------------------
+
+    def is_backfilled(self, object_name):
+        return self.conn.execute(
+            "SELECT 1 FROM backfills WHERE object_name = ?", (object_name,)
+        ).fetchone() is not None
+
+    def count(self, object_name):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM crosswalk WHERE object_name = ?", (object_name,)
+        ).fetchone()[0]
+
+    def _lookup(self, column, object_name, external_ids):
+        found = {}
+        for chunk in _chunks({str(e) for e in external_ids if e is not None}, SQL_IN_CHUNK):
+            rows = self.conn.execute(
+                f"SELECT external_id, {column} FROM crosswalk "
+                f"WHERE object_name = ? AND external_id IN ({','.join('?' * len(chunk))})",
+                [object_name, *chunk]
+            )
+            found.update(rows)
+        return found
+
+    def lookup_ids(self, object_name, external_ids):
+        """{external_id: sf_id} for the External IDs present in the crosswalk"""
+        return self._lookup('sf_id', object_name, external_ids)
+
+    def lookup_parents(self, object_name, external_ids):
+        """{external_id: parent_external_id} for the External IDs present in the crosswalk"""
+        return self._lookup('parent_external_id', object_name, external_ids)
+
+    # Consistency -------------------------------------------------------------
+
+    def verify(self, sf, object_name, external_id_field='External_Id__c', sample_size=VERIFY_SAMPLE):
+        """
+        Cheap consistency check against the org
+        Compares COUNT() with the local row count and re-queries a random sample by Id;
+        sampled rows that no longer exist (deleted, merged) or now carry another External ID
+        are evicted. Returns {'ok', 'org_count', 'local_count', 'sampled', 'stale'}
+        """
+        org_count = sf.query(
+            f"SELECT COUNT() FROM {object_name} WHERE {external_id_field} != null"
+        )['totalSize']
+        local_count = self.count(object_name)
+
+        sample = dict(self.conn.execute(
+            "SELECT sf_id, external_id FROM crosswalk WHERE object_name = ? ORDER BY RANDOM() LIMIT ?",
+            (object_name, sample_size)
+        ).fetchall())
+        live = {}
+        for chunk in _chunks(sample, SOQL_ID_CHUNK):
+            id_list = "','".join(chunk)
+            result = sf.query(
+                f"SELECT Id, {external_id_field} FROM {object_name} WHERE Id IN ('{id_list}')"
+            )
+            live.update((r['Id'], r[external_id_field]) for r in result['records'])
+
+        stale = [sf_id for sf_id, external_id in sample.items() if live.get(sf_id) != external_id]
+        if stale:
+            self.evict(object_name, stale)
+
+        return {
+            'ok': org_count == local_count and not stale,
+            'org_count': org_count,
+            'local_count': local_count,
+            'sampled': len(sample),
+            'stale': len(stale),
+        }
+
+if __name__ == "__main__":
+    import sys
+    from dotenv import load_dotenv
+    from sf_session import get_salesforce
+
+    env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
+    load_dotenv(env_file)
+
+    objects = [a for a in sys.argv[1:] if not a.startswith('--')] or list(PARENT_PATHS)
+    sf = get_salesforce()
+    crosswalk = Crosswalk()
+    for object_name in objects:
+        if '--backfill' in sys.argv:
+            total = crosswalk.backfill(sf, object_name, parent_path=PARENT_PATHS.get(object_name))
+            print(f"{object_name}: backfilled {total:,} rows")
+        check = crosswalk.verify(sf, object_name)
+        print(f"{object_name}: {'[OK]' if check['ok'] else '[STALE]'} org {check['org_count']:,}, "
+              f"local {check['local_count']:,}, {check['stale']} stale of {check['sampled']} sampled")
+    crosswalk.close()
@@ -0,0 +1,93 @@
+"""
+Cached sObject describe results
+Loaders, validators and the field mapper each ran a live describe() of the same objects
+on every run. describe() keeps the full result on disk per org and API version, with the
+object's metadata revision marker (the Last-Modified of the describe response):
+
+- a result checked within CHECK_SECONDS is used as-is (no network call)
+- an older one is revalidated with a conditional GET (If-Modified-Since: the marker);
+  304 Not Modified keeps the cached result, anything else replaces it
+- describe_all() fetches several objects in parallel
+
+Usage:
+    fields = describe(sf, 'Contact')['fields']
+    field = describe_field(sf, 'Contact', 'External_Id__c')        # None if it does not exist
+    results = describe_all(sf, ['Account', 'Contact', 'Claim__c'])  # {sobject: describe}, missing skipped
+"""
+
+import os
+import re
+import json
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from sf_http import get_transport
+
+DESCRIBE_CACHE_DIR = 'test_output/describe_cache'
+CHECK_SECONDS = 15 * 60     # Trust a describe checked this recently without another call
+DESCRIBE_WORKERS = 6
+
+def _cache_path(transport, sobject):
+    org = re.sub(r'\W', '_', getattr(transport.sf, 'sf_instance', None) or 'org')
+    return os.path.join(DESCRIBE_CACHE_DIR, f"{org}_{transport.api_version}", f"{sobject}.json")
+
+def _read(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(path, entry):
+    """Atomically replace a cache file (safe with concurrent describe_all workers)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.describe_')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def describe(sf, sobject):
+    """Describe result of an object, from the cache while its metadata revision is unchanged"""
+    transport = get_transport(sf)
+    path = _cache_path(transport, sobject)
+    entry = _read(path)
+    if entry and time.time() - entry['checked_at'] < CHECK_SECONDS:
+        return entry['describe']
+
+    headers = {'If-Modified-Since': entry['revision']} if entry else None
+    response = transport.request('GET', f"sobjects/{sobject}/describe", headers=headers)
+    if response.status_code == 304:
+        entry['checked_at'] = time.time()
+    else:
+        if response.status_code >= 300:
+            raise LookupError(f"{sobject} describe failed: HTTP {response.status_code}: {response.text[:200]}")
+        entry = {
+            'revision': response.headers.get('Last-Modified') or formatdate(usegmt=True),
+            'checked_at': time.time(),
+            'describe': response.json(),
+        }
+    _write(path, entry)
+    return entry['describe']
+
+def describe_field(sf, sobject, name):
+    """Describe entry of one field, None when the object has no such field"""
+    return next((f for f in describe(sf, sobject)['fields'] if f['name'] == name), None)
+
+def describe_all(sf, sobjects, workers=DESCRIBE_WORKERS):
+    """{sobject: describe} for several objects, fetched in parallel; objects that fail are reported and skipped"""
+    def fetch(sobject):
+        try:
+            return sobject, describe(sf, sobject)
+        except Exception as e:
+            print(f"      [WARNING] Could not describe {sobject}: {e}")
+            return sobject, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sobjects)))) as executor:
+        results = list(executor.map(fetch, sobjects))
+    return {sobject: result for sobject, result in results if result is not None}
@@ -0,0 +1,195 @@
+"""
+Field-level Oracle <-> Salesforce diff by External ID
+Compares every record of the transformed Oracle snapshot (the mapped payload the
+loader sent) with a Salesforce export, joined on External_Id__c, and reports:
+
+- missing:    in Oracle, not in Salesforce
+- extra:      in Salesforce, not in Oracle
+- mismatched: in both, with one or more fields differing (counts per field)
+
+Memory stays bounded at full volume (834K Contacts, millions of Returns) with a
+partitioned hash join: both sides are streamed chunk by chunk into BUCKETS Parquet
+partitions by a hash of the External ID, then each bucket pair is joined in memory
+on its own. Only one chunk, or one bucket pair, is held at a time.
+
+Values are compared as normalised text: nulls/blanks are equal, booleans are
+lower-cased, integral floats lose their '.0', and Salesforce datetimes are compared
+to the second.
+
+The payload is not quite the intended end state: the loaders drop None values before
+upsert, so an Oracle-side null means "not sent" and is not checked, and the Contact
+loader leaves out Account when the employer is unchanged. expected_state() rebuilds
+such parent references from the snapshot's extract frame before diffing.
+
+Usage:
+    df = expected_state(load_snapshot(path), 'Contact')
+    summary = diff(frame_chunks(df), sf_chunks, fields, output_dir='test_output/diff_contact')
+    summary['per_field']    # {field: mismatch count}
+"""
+
+import os
+import shutil
+import tempfile
+import pandas as pd
+from sf_relationships import parent_reference
+
+KEY_FIELD = 'External_Id__c'
+BUCKETS = 64
+CHUNK_ROWS = 100000
+SAMPLE_MISMATCHES = 100000     # Mismatch rows written to mismatches.csv (counts are always exact)
+
+# Parent references the loaders omit when unchanged: {object: {payload column: extract column}}
+EXPECTED_REFERENCES = {
+    'Contact': {'Account': 'EMPLOYER_ID'},
+}
+
+def frame_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Yield an in-memory DataFrame in row chunks"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def parquet_chunks(paths):
+    """Yield Parquet part files (e.g. from sf_extract parquet_dir) one at a time"""
+    for path in paths:
+        yield pd.read_parquet(path)
+
+def expected_state(snapshot, object_name):
+    """
+    The snapshot's mapped payload with omitted parent references rebuilt from its
+    extract frame (rows of both frames are in the same order)
+    """
+    df = snapshot['mapped'].copy()
+    extract = snapshot.get('extract')
+    for column, source in EXPECTED_REFERENCES.get(object_name, {}).items():
+        if extract is None or source not in extract.columns or len(extract) != len(df):
+            print(f"      [WARNING] Cannot rebuild {object_name}.{column} from the extract - "
+                  f"omitted values are not checked")
+            continue
+        df[column] = [parent_reference(value) for value in extract[source]]
+    return df
+
+def differences(left, right):
+    """Mask of differing values, Oracle-side nulls excluded (the loaders never send nulls)"""
+    return left.notna() & ~(left == right)
+
+def flatten_references(df):
+    """Relationship payload columns ({'External_Id__c': x}) become 'Account.External_Id__c' columns"""
+    df = df.copy()
+    for column in list(df.columns):
+        values = df[column].dropna()
+        if len(values) and isinstance(values.iloc[0], dict):
+            key = next(iter(values.iloc[0]))
+            df[f"{column}.{key}"] = df[column].apply(lambda v: v.get(key) if isinstance(v, dict) else None)
+            df = df.drop(columns=[column])
+    return df
+
+def normalise(series):
+    """Comparable text for one column; None for null/blank"""
+    text = series.astype(object).where(series.notna(), None).map(
+        lambda v: None if v is None else str(v).strip()
+    )
+    text = text.where(text != '', None)
+    lowered = text.str.lower()
+    text = text.where(~lowered.isin(['true', 'false']), lowered)
+    text = text.str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+    # 2024-01-31T00:00:00.000Z / 2024-01-31 00:00:00 -> 2024-01-31T00:00:00
+    text = text.str.replace(r'^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(\.\d+)?(Z|\+0000)?$', r'\1T\2', regex=True)
+    return text
+
+def _partition(chunks, side, fields, key, buckets, work_dir):
+    """Spill one side into bucket Parquet parts; returns the row count"""
+    total = 0
+    for number, chunk in enumerate(chunks):
+        chunk = flatten_references(chunk) if side == 'oracle' else chunk
+        columns = [key] + [f for f in fields if f in chunk.columns and f != key]
+        chunk = chunk[columns].apply(normalise)
+        chunk = chunk[chunk[key].notna()]
+        bucket_of = pd.util.hash_pandas_object(chunk[key], index=False) % buckets
+        for bucket, part in chunk.groupby(bucket_of.values):
+            directory = os.path.join(work_dir, f"bucket_{bucket:03d}")
+            os.makedirs(directory, exist_ok=True)
+            part.to_parquet(os.path.join(directory, f"{side}_{number:05d}.parquet"), index=False)
+        total += len(chunk)
+    return total
+
+def _read_bucket(directory, side):
+    paths = sorted(p for p in os.listdir(directory) if p.startswith(side + '_'))
+    frames = [pd.read_parquet(os.path.join(directory, p)) for p in paths]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+def diff(oracle_chunks, sf_chunks, fields, key=KEY_FIELD, buckets=BUCKETS, output_dir=None,
+         sample_mismatches=SAMPLE_MISMATCHES):
+    """
+    Diff two chunked sources on `key`, comparing `fields` present on both sides
+    output_dir: write missing.csv, extra.csv, mismatches.csv (key, field, oracle, salesforce)
+    Returns {'oracle', 'salesforce', 'matched', 'missing', 'extra', 'mismatched_records',
+             'per_field', 'duplicate_keys', 'files'}
+    """
+    work_dir = tempfile.mkdtemp(prefix='sf_diff_')
+    summary = {'oracle': 0, 'salesforce': 0, 'matched': 0, 'missing': 0, 'extra': 0,
+               'mismatched_records': 0, 'per_field': {}, 'duplicate_keys': 0, 'files': {}}
+    writers = {}
+    try:
+        print("      Partitioning Oracle snapshot...")
+        summary['oracle'] = _partition(oracle_chunks, 'oracle', fields, key, buckets, work_dir)
+        print("      Partitioning Salesforce export...")
+        summary['salesforce'] = _partition(sf_chunks, 'sf', fields, key, buckets, work_dir)
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            for name, columns in (('missing', [key]), ('extra', [key]),
+                                  ('mismatches', [key, 'field', 'oracle', 'salesforce'])):
+                path = os.path.join(output_dir, f"{name}.csv")
+                pd.DataFrame(columns=columns).to_csv(path, index=False)
+                writers[name] = path
+            summary['files'] = dict(writers)
+
+        written = 0
+        directories = sorted(os.listdir(work_dir))
+        for done, name in enumerate(directories, 1):
+            directory = os.path.join(work_dir, name)
+            oracle = _read_bucket(directory, 'oracle')
+            sf = _read_bucket(directory, 'sf')
+            oracle = oracle if oracle is not None else pd.DataFrame(columns=[key])
+            sf = sf if sf is not None else pd.DataFrame(columns=[key])
+
+            summary['duplicate_keys'] += int(oracle[key].duplicated().sum() + sf[key].duplicated().sum())
+            oracle = oracle.drop_duplicates(key, keep='last')
+            sf = sf.drop_duplicates(key, keep='last')
+
+            joined = oracle.merge(sf, on=key, how='outer', suffixes=('__oracle', '__sf'), indicator=True)
+            missing = joined.loc[joined['_merge'] == 'left_only', [key]]
+            extra = joined.loc[joined['_merge'] == 'right_only', [key]]
+            both = joined[joined['_merge'] == 'both']
+            summary['missing'] += len(missing)
+            summary['extra'] += len(extra)
+
+            differs_any = pd.Series(False, index=both.index)
+            compared = [f for f in fields if f != key and f + '__oracle' in both.columns and f + '__sf' in both.columns]
+            for field in compared:
+                differs = differences(both[field + '__oracle'], both[field + '__sf'])
+                count = int(differs.sum())
+                if not count:
+                    continue
+                summary['per_field'][field] = summary['per_field'].get(field, 0) + count
+                differs_any |= differs
+                if writers and written < sample_mismatches:
+                    rows = both.loc[differs, [key, field + '__oracle', field + '__sf']].head(sample_mismatches - written)
+                    rows.columns = [key, 'oracle', 'salesforce']
+                    rows.insert(1, 'field', field)
+                    rows.to_csv(writers['mismatches'], mode='a', header=False, index=False)
+                    written += len(rows)
+
+            mismatched = int(differs_any.sum())
+            summary['mismatched_records'] += mismatched
+            summary['matched'] += len(both) - mismatched
+            if writers:
+                missing.to_csv(writers['missing'], mode='a', header=False, index=False)
+                extra.to_csv(writers['extra'], mode='a', header=False, index=False)
+            if done % 8 == 0 or done == len(directories):
+                print(f"      Compared {done}/{len(directories)} buckets "
+                      f"({summary['missing']:,} missing, {summary['extra']:,} extra, "
+                      f"{summary['mismatched_records']:,} mismatched)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return summary
@@ -0,0 +1,181 @@
+"""
+Incremental documentation builds
+The SIT doc generators rebuilt every artifact and re-ran every query on each run.
+DocBuild lets each section declare its inputs and rebuilds only the sections whose
+inputs changed since the last build:
+
+- object(sobject):  the org data version of an object - COUNT(Id) and MAX(SystemModstamp),
+                    one aggregate query per object per run; any insert, update or delete
+                    changes it
+- file(path):       content hash of a mapping file, snapshot, etc.
+- value(obj):       hash of an in-script value (e.g. the mapping list)
+- the generator script itself is an input of every section, so code changes rebuild
+
+Query results and bulk exports are cached on disk by a fingerprint of the SOQL plus the
+versions of the objects it reads, so an unchanged org is never queried twice.
+State lives in test_output/doc_cache/<build name>_manifest.json.
+
+Usage:
+    build = DocBuild('account_docs', sf, __file__)            # --force rebuilds everything
+    section = build.section('samples', build.object('Account'), build.value(mappings))
+    if section.stale:
+        count = build.query("SELECT COUNT() FROM Account WHERE ...")['totalSize']
+        ... write sample_file ...
+        section.done(sample_file, count=count)
+    sample_file, = section.outputs
+    count = section.values['count']
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from datetime import datetime
+from sf_reconcile import DEFAULT_WHERE, ObjectExport
+
+CACHE_DIR = 'test_output/doc_cache'
+
+def fingerprint(*parts):
+    """Short stable hash of JSON-serialisable parts"""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def file_fingerprint(path):
+    if not os.path.exists(path):
+        return 'missing'
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def _normalise_soql(soql):
+    return ' '.join(soql.split())
+
+def _from_object(soql):
+    match = re.search(r'\bFROM\s+(\w+)', soql, re.IGNORECASE)
+    return match.group(1) if match else None
+
+class Section:
+    """One documentation section: stale when its input fingerprint changed or an output is gone"""
+
+    def __init__(self, build, name, section_fingerprint, previous):
+        self.build = build
+        self.name = name
+        self.fingerprint = section_fingerprint
+        self.stale = (
+            build.force or previous is None
+            or previous['fingerprint'] != section_fingerprint
+            or not all(os.path.exists(path) for path in previous['outputs'])
+        )
+        self.outputs = [] if self.stale else previous['outputs']
+        self.values = {} if self.stale else previous.get('values', {})
+        print(f"   [{'BUILD' if self.stale else 'CACHED'}] {name}")
+
+    def done(self, *outputs, **values):
+        """Record the section's output files and any values later sections need"""
+        self.outputs = list(outputs)
+        self.values = values
+        self.build.manifest['sections'][self.name] = {
+            'fingerprint': self.fingerprint,
+            'outputs': self.outputs,
+            'values': values,
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.build.save()
+
+class DocBuild:
+    """Input fingerprints, section state and cached query results for one doc generator"""
+
+    def __init__(self, name, sf, script, force=None, cache_dir=CACHE_DIR):
+        self.sf = sf
+        self.script = file_fingerprint(script)
+        self.force = ('--force' in sys.argv) if force is None else force
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, f"{name}_manifest.json")
+        os.makedirs(os.path.join(cache_dir, 'queries'), exist_ok=True)
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.manifest.setdefault('sections', {})
+        self.manifest.setdefault('exports', {})
+        self._versions = {}
+        self._exports = {}
+        self.queries_sent = 0
+        self.queries_cached = 0
+
+    def save(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    # Inputs ------------------------------------------------------------------
+
+    def object(self, sobject):
+        """Data version of an object in the org (queried once per run)"""
+        if sobject not in self._versions:
+            record = self.sf.query(
+                f"SELECT COUNT(Id) n, MAX(SystemModstamp) m FROM {sobject}"
+            )['records'][0]
+            self._versions[sobject] = f"{sobject}:{record['n']}:{record['m']}"
+        return self._versions[sobject]
+
+    def file(self, path):
+        return f"file:{path}:{file_fingerprint(path)}"
+
+    def value(self, obj):
+        return f"value:{fingerprint(obj)}"
+
+    # Cached reads ------------------------------------------------------------
+
+    def query(self, soql, *objects):
+        """sf.query result, cached until the objects read (default: the FROM object) change"""
+        return self._cached_query('query', soql, objects)
+
+    def query_all(self, soql, *objects):
+        """sf.query_all result, cached like query()"""
+        return self._cached_query('query_all', soql, objects)
+
+    def _cached_query(self, method, soql, objects):
+        objects = objects or (_from_object(soql),)
+        key = fingerprint(method, _normalise_soql(soql), [self.object(o) for o in objects])
+        path = os.path.join(self.cache_dir, 'queries', f"{key}.json")
+        if not self.force and os.path.exists(path):
+            self.queries_cached += 1
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        result = getattr(self.sf, method)(soql)
+        self.queries_sent += 1
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, default=str)
+        return result
+
+    def export(self, sobject, fields, where=DEFAULT_WHERE):
+        """ObjectExport (loaded once per run), reusing the last Parquet export while the object is unchanged"""
+        key = fingerprint(sobject, sorted(fields), where, self.object(sobject))
+        if key in self._exports:
+            return self._exports[key]
+        path = self.manifest['exports'].get(key)
+        if not self.force and path and os.path.exists(path):
+            print(f"      [CACHED] {sobject} export {path}")
+            export = ObjectExport.from_file(path, sobject)
+        else:
+            export = ObjectExport.load(self.sf, sobject, fields, where)
+            self.manifest['exports'][key] = export.path
+            self.save()
+        self._exports[key] = export
+        return export
+
+    # Sections ----------------------------------------------------------------
+
+    def section(self, name, *inputs):
+        """Section state for these inputs (the generator script is always an input)"""
+        section_fingerprint = fingerprint(self.script, sorted(inputs))
+        return Section(self, name, section_fingerprint, self.manifest['sections'].get(name))
+
+    def summary(self):
+        return f"{self.queries_sent} queries sent, {self.queries_cached} served from cache"
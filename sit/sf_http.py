@@ -0,0 +1,177 @@
+"""
+Shared HTTP transport for direct Salesforce REST calls
+One pooled keep-alive requests.Session per Salesforce connection, so Composite,
+Composite Graph and sObject Collections calls reuse TLS connections instead of
+doing a fresh handshake per call.
+
+- request bodies above GZIP_MIN_BYTES are sent with Content-Encoding: gzip
+- responses are requested with Accept-Encoding: gzip (requests decompresses them)
+- connection failures and 502/503/504 responses are retried with backoff for idempotent
+  requests (GET, PUT, DELETE, or retry_writes=True for writes that are safe to repeat, such
+  as upserts by External ID); other writes are only retried when the connection could not
+  be opened, since the server may already have applied them
+- a 401 triggers one session refresh through the refresh callback, then a retry
+- every response is passed to the registered observers (e.g. the sf_limits governor)
+
+Usage:
+    transport = get_transport(sf)
+    response = transport.request('POST', 'composite', json=payload)
+    data = transport.call('PATCH', 'composite/sobjects', json=payload)
+"""
+
+import gzip
+import json as jsonlib
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from sf_session import get_salesforce
+
+API_VERSION = 'v59.0'
+
+POOL_SIZE = 10          # Keep-alive connections per host (one per concurrent worker)
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 2     # Doubles every retry (2, 4, 8)
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE')
+GZIP_MIN_BYTES = 1024   # Smaller bodies are not worth compressing
+DEFAULT_TIMEOUT = 120
+
+_transports = {}
+
+def login_from_env(sf=None):
+    """
+    Fresh login from the SF_* environment variables, cached by sf_session (default session refresh)
+    Given the expired connection, logs in as the same user and domain it was opened with.
+    """
+    if sf is None:
+        return get_salesforce(force_login=True)
+    return get_salesforce(username=getattr(sf, 'login_username', None), domain=getattr(sf, 'domain', None),
+                          force_login=True)
+
+def _not_sent(error):
+    """True when a connection error happened before the request reached the server"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+class SalesforceTransport:
+    """Pooled, gzip-enabled REST transport bound to a simple_salesforce connection"""
+
+    def __init__(self, sf, api_version=API_VERSION, pool_size=POOL_SIZE, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_SECONDS, timeout=DEFAULT_TIMEOUT, refresh=login_from_env):
+        """
+        refresh: callable taking the expired connection and returning a new one; used once
+        per request when the session has expired (HTTP 401). None disables refresh.
+        """
+        self.sf = sf
+        self.api_version = api_version
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.refresh = refresh
+        self.observers = []     # callables taking each requests.Response
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+        })
+
+    @property
+    def base_url(self):
+        return f"https://{self.sf.sf_instance}/services/data/{self.api_version}/"
+
+    def url(self, path):
+        """Absolute URL for a path relative to /services/data/vXX.X/"""
+        if path.startswith('https://'):
+            return path
+        if path.startswith('/services/'):
+            return f"https://{self.sf.sf_instance}{path}"
+        return self.base_url + path.lstrip('/')
+
+    def _encode(self, json):
+        """(body, extra headers) - gzip the JSON body when it is large enough"""
+        if json is None:
+            return None, {}
+        body = jsonlib.dumps(json, default=str).encode('utf-8')
+        if len(body) < GZIP_MIN_BYTES:
+            return body, {}
+        return gzip.compress(body), {'Content-Encoding': 'gzip'}
+
+    def _refresh_session(self):
+        """Log in again and point the wrapped connection at the new session"""
+        fresh = self.refresh(self.sf)
+        self.sf.session_id = fresh.session_id
+        self.sf.sf_instance = fresh.sf_instance
+        if hasattr(self.sf, 'headers'):
+            self.sf.headers['Authorization'] = f"Bearer {fresh.session_id}"
+
+    def request(self, method, path, json=None, params=None, timeout=None, headers=None, retry_writes=False):
+        """
+        Send one request and return the requests.Response
+        headers: extra request headers (e.g. If-Modified-Since)
+        retry_writes: the request is safe to repeat even though the method is not idempotent
+        (e.g. a POST /composite of queries); retried after 502/503/504 and dropped connections
+        Raises the last connection error if every attempt failed to connect
+        """
+        body, extra_headers = self._encode(json)
+        retryable = method.upper() in IDEMPOTENT_METHODS or retry_writes
+        refreshed = False
+        attempt = 0
+
+        while True:
+            request_headers = {'Authorization': f"Bearer {self.sf.session_id}", **extra_headers, **(headers or {})}
+            try:
+                response = self.session.request(
+                    method, self.url(path), data=body, params=params, headers=request_headers,
+                    timeout=timeout or self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A write that reached the server may already have been applied - only
+                # repeat it when it is safe to, or when the connection never opened
+                if not (retryable or _not_sent(e)) or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+
+            for observer in self.observers:
+                observer(response)
+
+            if response.status_code == 401 and self.refresh is not None and not refreshed:
+                refreshed = True
+                self._refresh_session()
+                continue
+
+            if response.status_code in RETRY_STATUSES and retryable and attempt < self.max_retries:
+                attempt += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+
+            return response
+
+    def call(self, method, path, json=None, params=None, timeout=None, retry_writes=False):
+        """Like request(), but returns the decoded JSON (None for 204) and raises on HTTP errors"""
+        response = self.request(method, path, json=json, params=params, timeout=timeout,
+                                retry_writes=retry_writes)
+        if response.status_code >= 300:
+            raise requests.HTTPError(f"HTTP {response.status_code}: {response.text}", response=response)
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+def get_transport(sf):
+    """Shared transport for a Salesforce connection (created on first use)"""
+    transport = _transports.get(id(sf))
+    if transport is None or transport.sf is not sf:
+        transport = SalesforceTransport(sf)
+        _transports[id(sf)] = transport
+    return transport
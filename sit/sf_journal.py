@@ -0,0 +1,217 @@
+"""
+Crash-safe load journal and resume support for long Bulk API loads
+SQLite journal under test_output/ records, per run:
+- the extract snapshot (ID + pickled DataFrames) so a resume skips extraction
+- each batch's key range, submission state (pending/submitted/completed/failed),
+  Bulk job/batch IDs and results
+A resumed run skips completed batches, re-polls batches that were in flight when
+the previous process died, and submits the rest.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+from datetime import datetime
+import pandas as pd
+
+JOURNAL_PATH = 'test_output/load_journal.sqlite'
+SNAPSHOT_DIR = 'test_output/snapshots'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    object_name TEXT NOT NULL,
+    snapshot_id TEXT NOT NULL,
+    snapshot_path TEXT NOT NULL,
+    total_batches INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batches (
+    run_id TEXT NOT NULL,
+    batch_num INTEGER NOT NULL,
+    first_key TEXT,
+    last_key TEXT,
+    record_count INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    job_id TEXT,
+    bulk_batch_id TEXT,
+    success_count INTEGER,
+    error_count INTEGER,
+    errors_json TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, batch_num)
+);
+"""
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+def snapshot_id_for(df, key_column):
+    """Fingerprint an extract: row count, columns and the ordered key values"""
+    digest = hashlib.sha1()
+    digest.update(str(len(df)).encode())
+    digest.update(','.join(map(str, df.columns)).encode())
+    for value in df[key_column].astype(str):
+        digest.update(value.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()[:16]
+
+def save_snapshot(frames, object_name, snapshot_id):
+    """Pickle the extracted/mapped DataFrames so a resumed run can skip extraction"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"{object_name.lower()}_{snapshot_id}.pkl")
+    pd.to_pickle(frames, path)
+    return path
+
+def load_snapshot(path):
+    """Load the DataFrames saved by save_snapshot"""
+    return pd.read_pickle(path)
+
+class LoadJournal:
+    """SQLite-backed journal; every state change is committed immediately"""
+
+    def __init__(self, path=JOURNAL_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # Runs ------------------------------------------------------------------
+
+    def start_run(self, object_name, snapshot_id, snapshot_path, batch_ranges):
+        """
+        Register a new run and its batch plan
+        batch_ranges: list of (first_key, last_key, record_count) in batch order
+        """
+        run_id = f"{object_name.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        now = _now()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, 'running', ?, ?)",
+                (run_id, object_name, snapshot_id, snapshot_path, len(batch_ranges), now, now)
+            )
+            self.conn.executemany(
+                "INSERT INTO batches (run_id, batch_num, first_key, last_key, record_count, state, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 'pending', ?)",
+                [(run_id, num, str(first), str(last), count, now)
+                 for num, (first, last, count) in enumerate(batch_ranges, 1)]
+            )
+        return run_id
+
+    def latest_unfinished_run(self, object_name):
+        """Most recent run for the object that did not finish, or None"""
+        return self.conn.execute(
+            "SELECT * FROM runs WHERE object_name = ? AND status != 'completed' "
+            "ORDER BY started_at DESC LIMIT 1",
+            (object_name,)
+        ).fetchone()
+
+    def get_run(self, run_id):
+        """Run row for a run_id, or None"""
+        return self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+
+    def latest_run(self, object_name):
+        """Most recent run for the object regardless of status, or None"""
+        return self.conn.execute(
+            "SELECT * FROM runs WHERE object_name = ? ORDER BY started_at DESC LIMIT 1",
+            (object_name,)
+        ).fetchone()
+
+    def finish_run(self, run_id, status='completed'):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, _now(), run_id)
+            )
+
+    # Batches ---------------------------------------------------------------
+
+    def batches(self, run_id):
+        """{batch_num: row} for a run"""
+        rows = self.conn.execute(
+            "SELECT * FROM batches WHERE run_id = ? ORDER BY batch_num", (run_id,)
+        ).fetchall()
+        return {row['batch_num']: row for row in rows}
+
+    def mark_submitted(self, run_id, batch_num, job_id, bulk_batch_id):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE batches SET state = 'submitted', job_id = ?, bulk_batch_id = ?, updated_at = ? "
+                "WHERE run_id = ? AND batch_num = ?",
+                (job_id, bulk_batch_id, _now(), run_id, batch_num)
+            )
+
+    def mark_completed(self, run_id, batch_num, success_count, errors):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE batches SET state = 'completed', success_count = ?, error_count = ?, "
+                "errors_json = ?, updated_at = ? WHERE run_id = ? AND batch_num = ?",
+                (success_count, len(errors), json.dumps(errors, default=str), _now(), run_id, batch_num)
+            )
+
+    def mark_failed(self, run_id, batch_num, error):
+        """Batch could not be submitted or polled; it will be retried on --resume"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE batches SET state = 'failed', errors_json = ?, updated_at = ? "
+                "WHERE run_id = ? AND batch_num = ?",
+                (json.dumps([{'error': str(error)}]), _now(), run_id, batch_num)
+            )
+
+    def completed_errors(self, batch_row):
+        """Errors recorded for a completed batch"""
+        return json.loads(batch_row['errors_json']) if batch_row['errors_json'] else []
+
+def batch_ranges(df, key_column, batch_size):
+    """(first_key, last_key, record_count) for each batch_size slice of df"""
+    ranges = []
+    for start in range(0, len(df), batch_size):
+        keys = df[key_column].iloc[start:start + batch_size]
+        ranges.append((keys.iloc[0], keys.iloc[-1], len(keys)))
+    return ranges
+
+def _wait_for_results(bulk, job_id, bulk_batch_id, wait=5):
+    """Poll a Bulk API batch until it finishes and return its per-record results"""
+    state = bulk._get_batch(job_id=job_id, batch_id=bulk_batch_id)
+    while state['state'] not in ('Completed', 'Failed', 'NotProcessed'):
+        time.sleep(wait)
+        state = bulk._get_batch(job_id=job_id, batch_id=bulk_batch_id)
+
+    if state['state'] != 'Completed':
+        raise RuntimeError(f"Bulk batch {bulk_batch_id} {state['state']}: {state.get('stateMessage', '')}")
+
+    return [
+        result
+        for page in bulk._get_batch_results(job_id=job_id, batch_id=bulk_batch_id, operation='upsert')
+        for result in page
+    ]
+
+def journaled_bulk_upsert(sf, sobject, records, external_id_field, journal, run_id, batch_num, batch_row=None):
+    """
+    Upsert one batch through the Bulk API, journaling the job before waiting on it
+    If batch_row shows the batch was already submitted (process died mid-wait), re-poll that job
+    instead of submitting the records again.
+    Returns the per-record results (same shape as sf.bulk.<Object>.upsert)
+    """
+    bulk = getattr(sf.bulk, sobject)
+
+    if batch_row is not None and batch_row['state'] == 'submitted' and batch_row['job_id']:
+        return _wait_for_results(bulk, batch_row['job_id'], batch_row['bulk_batch_id'])
+
+    # Serial job, one batch - same as sf.bulk.<Object>.upsert(..., use_serial=True)
+    job = bulk._create_job(operation='upsert', use_serial=True, external_id_field=external_id_field)
+    bulk_batch = bulk._add_batch(job_id=job['id'], data=records, operation='upsert')
+    journal.mark_submitted(run_id, batch_num, job['id'], bulk_batch['id'])
+    bulk._close_job(job_id=job['id'])
+
+    return _wait_for_results(bulk, job['id'], bulk_batch['id'])
@@ -0,0 +1,194 @@
+"""
+API limits governor for jobs sharing the SIT org
+Reads /services/data/vXX.X/limits at startup (and again every REFRESH_SECONDS), and
+tracks the Sforce-Limit-Info header (api-usage=used/max) on every REST response, so a
+job knows how much of the daily API and Bulk batch budget is left and can:
+- size its concurrency: full parallelism while the budget is healthy, fewer workers
+  as it drains (THROTTLE_STEPS)
+- pause before the next unit of work when the remaining budget drops below the
+  threshold for its priority (PAUSE_AT) - low-priority checks stop first so loads
+  keep the remaining budget (the query-heavy check/verify scripts take a 'low' checkpoint
+  before they start)
+
+Usage:
+    governor = get_governor(sf, priority='high')
+    workers = governor.max_workers(MAX_WORKERS)
+    governor.checkpoint()            # before each call/batch; sleeps or raises if exhausted
+    governor.checkpoint('api', 'bulk')  # before each Bulk API batch
+
+    python sf_limits.py              # print the current budget for the org
+"""
+
+import re
+import time
+import threading
+from datetime import datetime
+from sf_http import get_transport
+
+# Remaining fraction of the daily budget below which each priority pauses
+PAUSE_AT = {
+    'high': 0.02,     # data loads
+    'normal': 0.10,   # retries, reconciliation
+    'low': 0.25,      # check_* / verify_* scripts (analysis/, verify_new_columns_load.py)
+}
+
+# (remaining fraction, share of requested workers) - first matching step wins
+THROTTLE_STEPS = [
+    (0.50, 1.0),
+    (0.25, 0.5),
+    (0.10, 0.25),
+    (0.0, 0.0),       # at least one worker, see max_workers()
+]
+
+REFRESH_SECONDS = 300   # Re-read /limits this often (Bulk batches are not in the header)
+PAUSE_POLL_SECONDS = 300
+MAX_PAUSE_SECONDS = 3600
+
+# Budget name -> /limits key
+LIMIT_KEYS = {
+    'api': 'DailyApiRequests',
+    'bulk': 'DailyBulkApiBatches',
+}
+
+LIMIT_INFO_PATTERN = re.compile(r'api-usage=(?P<used>\d+)/(?P<max>\d+)')
+
+class LimitsExhausted(RuntimeError):
+    """Remaining budget stayed below the pause threshold for longer than MAX_PAUSE_SECONDS"""
+
+class LimitsGovernor:
+    """Tracks remaining daily API / Bulk batch budget for one Salesforce connection"""
+
+    def __init__(self, sf, priority='normal', refresh_seconds=REFRESH_SECONDS):
+        if priority not in PAUSE_AT:
+            raise ValueError(f"priority must be one of {', '.join(PAUSE_AT)}")
+        self.sf = sf
+        self.priority = priority
+        self.refresh_seconds = refresh_seconds
+        self.budgets = {}       # name -> {'max': int, 'remaining': int}
+        self.refreshed_at = 0
+        self._sf_usage = None   # last api_usage seen on the simple_salesforce connection
+        self._lock = threading.Lock()
+
+    # Tracking ----------------------------------------------------------------
+
+    def refresh(self):
+        """Read /limits; returns the raw response"""
+        limits = get_transport(self.sf).call('GET', 'limits')
+        with self._lock:
+            for name, key in LIMIT_KEYS.items():
+                if key in limits:
+                    self.budgets[name] = {
+                        'max': limits[key]['Max'],
+                        'remaining': limits[key]['Remaining'],
+                    }
+            self.refreshed_at = time.time()
+        return limits
+
+    def observe(self, response):
+        """Update the API budget from a response's Sforce-Limit-Info header"""
+        match = LIMIT_INFO_PATTERN.search(response.headers.get('Sforce-Limit-Info', ''))
+        if match:
+            used, maximum = int(match.group('used')), int(match.group('max'))
+            with self._lock:
+                self.budgets['api'] = {'max': maximum, 'remaining': maximum - used}
+
+    def _observe_sf(self):
+        """Pick up usage simple_salesforce parsed from its own responses (query, bulk, restful)"""
+        usage = (getattr(self.sf, 'api_usage', None) or {}).get('api-usage')
+        if usage is not None and usage != self._sf_usage:
+            # Only newer readings count - an old one must not overwrite a fresher header/limits value
+            self._sf_usage = usage
+            with self._lock:
+                self.budgets['api'] = {'max': usage.total, 'remaining': usage.total - usage.used}
+
+    def _maybe_refresh(self):
+        if time.time() - self.refreshed_at >= self.refresh_seconds:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"      [WARNING] Could not read /limits: {e}")
+                self.refreshed_at = time.time()
+
+    def remaining_fraction(self, budget='api'):
+        """Share of the daily budget left (1.0 when unknown)"""
+        self._maybe_refresh()
+        if budget == 'api':
+            self._observe_sf()
+        with self._lock:
+            state = self.budgets.get(budget)
+        if not state or not state['max']:
+            return 1.0
+        return state['remaining'] / state['max']
+
+    # Decisions ---------------------------------------------------------------
+
+    def max_workers(self, requested, budget='api'):
+        """Workers to use for `requested` parallelism at the current remaining budget"""
+        remaining = self.remaining_fraction(budget)
+        for floor, share in THROTTLE_STEPS:
+            if remaining >= floor:
+                return max(1, int(requested * share))
+        return 1
+
+    def checkpoint(self, *budgets):
+        """
+        Call before each unit of work (budgets default to 'api')
+        Returns immediately while every budget is above this priority's pause threshold,
+        otherwise waits for it to recover and raises LimitsExhausted after MAX_PAUSE_SECONDS
+        """
+        threshold = PAUSE_AT[self.priority]
+        for budget in budgets or ('api',):
+            paused = 0
+            while self.remaining_fraction(budget) < threshold:
+                if paused >= MAX_PAUSE_SECONDS:
+                    raise LimitsExhausted(
+                        f"{LIMIT_KEYS[budget]} below {threshold:.0%} for {paused}s ({self.summary()})"
+                    )
+                print(f"      [PAUSE] {LIMIT_KEYS[budget]} below {threshold:.0%} "
+                      f"for {self.priority}-priority jobs ({self.summary()}) - "
+                      f"waiting {PAUSE_POLL_SECONDS}s")
+                time.sleep(PAUSE_POLL_SECONDS)
+                paused += PAUSE_POLL_SECONDS
+                self.refreshed_at = 0   # force a /limits read on the next check
+
+    def summary(self):
+        """'api 14,200/15,000 (94.7%), bulk 14,990/15,000 (99.9%)' for logging"""
+        with self._lock:
+            budgets = dict(self.budgets)
+        return ', '.join(
+            f"{name} {state['remaining']:,}/{state['max']:,} ({state['remaining'] / state['max']:.1%})"
+            for name, state in budgets.items() if state['max']
+        ) or 'no limits data'
+
+_governors = {}
+
+def get_governor(sf, priority='normal'):
+    """
+    Shared governor for a Salesforce connection and priority (created and primed from /limits
+    on first use). The governor also watches every response sent through the shared sf_http
+    transport, so governors of different priorities on one connection see the same usage.
+    """
+    key = (id(sf), priority)
+    governor = _governors.get(key)
+    if governor is None or governor.sf is not sf:
+        governor = LimitsGovernor(sf, priority)
+        get_transport(sf).observers.append(governor.observe)
+        _governors[key] = governor
+        governor._maybe_refresh()
+    return governor
+
+if __name__ == "__main__":
+    import os
+    from dotenv import load_dotenv
+    from sf_http import login_from_env
+
+    env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
+    load_dotenv(env_file)
+
+    sf = login_from_env()
+    limits = get_governor(sf).refresh()
+    print(f"Org limits for {sf.sf_instance} at {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+    for key in sorted(limits):
+        maximum, remaining = limits[key].get('Max', 0), limits[key].get('Remaining', 0)
+        if maximum:
+            print(f"  {key:<45} {remaining:>12,} / {maximum:<12,} ({remaining / maximum:.1%} left)")
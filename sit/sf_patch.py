@@ -0,0 +1,104 @@
+"""
+Streaming bulk field-patch engine
+Updates every record matching a SOQL filter with fixed field assignments and/or a
+transform function, without holding the record set in memory:
+
+    Bulk API 2.0 query (page by page) -> build patches -> Bulk API 2.0 update jobs
+
+Only one query page (PAGE_SIZE rows) and one pending job (JOB_SIZE patches) are in
+memory at a time.
+
+Usage:
+    patch_records(sf, 'Contact', "External_Id__c != null AND MailingStreet != null",
+                  assignments={'MailingStreet': None, 'MailingCity': None})
+
+    def transform(row):                     # row: {field: string value} from the query
+        status = abr_status.get(row['ABN__c'])
+        return {'AccountStatus__c': status} if status else None   # None = leave unchanged
+    patch_records(sf, 'Account', "ABN__c != null", transform=transform, fields=['ABN__c'])
+"""
+
+import csv
+import io
+
+PAGE_SIZE = 50000       # Rows per Bulk API 2.0 query results page
+JOB_SIZE = 10000        # Patches per Bulk API 2.0 update job
+BULK_NULL = '#N/A'      # Bulk API 2.0 CSV value that sets a field to null (blank = unchanged)
+
+def _bulk_value(value):
+    return BULK_NULL if value is None else value
+
+def _submit(sf, sobject, patches, summary):
+    """Send one update job and fold its results into the summary"""
+    bulk = getattr(sf.bulk2, sobject)
+    # Every row in a CSV job needs the same columns; missing ones stay blank (unchanged)
+    columns = list(dict.fromkeys(field for patch in patches for field in patch))
+    rows = [{field: _bulk_value(patch[field]) if field in patch else '' for field in columns}
+            for patch in patches]
+    try:
+        results = bulk.update(records=rows)
+    except Exception as e:
+        summary['failed'] += len(patches)
+        summary['failures'].extend({'Id': patch['Id'], 'error': str(e)} for patch in patches)
+        return
+
+    for result in results:
+        summary['jobs'] += 1
+        processed = int(result.get('numberRecordsProcessed', 0))
+        failed = int(result.get('numberRecordsFailed', 0))
+        summary['patched'] += processed - failed
+        summary['failed'] += failed
+        if failed:
+            failed_csv = bulk.get_failed_records(result['job_id'])
+            for row in csv.DictReader(io.StringIO(failed_csv)):
+                summary['failures'].append({'Id': row.get('sf__Id') or row.get('Id'),
+                                            'error': row.get('sf__Error')})
+
+def patch_records(sf, sobject, where, assignments=None, transform=None, fields=None,
+                  job_size=JOB_SIZE, page_size=PAGE_SIZE, dry_run=False, governor=None):
+    """
+    Patch every sobject record matching `where`
+    assignments: {field: value} applied to every record (None clears the field)
+    transform:   function(row) -> {field: value} or None to skip; row holds Id + `fields`
+                 as strings from the query
+    dry_run:     build patches but submit nothing ('planned' still counts them)
+    Returns {'matched', 'planned', 'patched', 'skipped', 'failed', 'jobs', 'failures'}
+    """
+    if not assignments and transform is None:
+        raise ValueError("patch_records needs assignments, a transform, or both")
+
+    select_fields = ['Id'] + [f for f in (fields or []) if f != 'Id']
+    soql = f"SELECT {', '.join(select_fields)} FROM {sobject} WHERE {where}"
+    summary = {'matched': 0, 'planned': 0, 'patched': 0, 'skipped': 0, 'failed': 0, 'jobs': 0, 'failures': []}
+    pending = []
+
+    for page in getattr(sf.bulk2, sobject).query(soql, max_records=page_size):
+        for row in csv.DictReader(io.StringIO(page)):
+            summary['matched'] += 1
+            changes = dict(assignments or {})
+            if transform is not None:
+                transformed = transform(row)
+                if transformed is None:
+                    summary['skipped'] += 1
+                    continue
+                changes.update(transformed)
+            if not changes:
+                summary['skipped'] += 1
+                continue
+            pending.append({'Id': row['Id'], **changes})
+            summary['planned'] += 1
+
+            if len(pending) >= job_size:
+                if not dry_run:
+                    if governor is not None:
+                        governor.checkpoint('api', 'bulk')
+                    _submit(sf, sobject, pending, summary)
+                pending = []
+        print(f"      Streamed {summary['matched']:,} {sobject} rows "
+              f"({summary['patched']:,} patched, {summary['failed']:,} failed)")
+
+    if pending and not dry_run:
+        if governor is not None:
+            governor.checkpoint('api', 'bulk')
+        _submit(sf, sobject, pending, summary)
+    return summary
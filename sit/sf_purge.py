@@ -0,0 +1,129 @@
+"""
+Bulk purge engine for SIT resets
+Deletes migrated records child-first so no delete is blocked by (or cascades
+unexpectedly through) a dependent record:
+
+    ServiceReport__c -> Return__c -> AccountContactRelation -> Contact -> Account
+
+For each object:
+1. IDs are collected with one Bulk API 2.0 query job
+2. IDs are deleted in parallel, either as Bulk API 2.0 jobs of BULK_JOB_SIZE records
+   ('hard' = hardDelete, skips the recycle bin and needs the "Bulk API Hard Delete"
+   permission; 'soft' = delete) or as 200-record sObject Collections deletes ('collections')
+3. the remaining count is re-queried to verify the purge
+"""
+
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor
+from sf_collections import COLLECTION_SIZE, chunked, delete_records, error_text
+
+# Child-first purge plan: (object, SOQL filter selecting migrated records)
+PURGE_ORDER = [
+    ('ServiceReport__c', "External_Id__c != null"),
+    ('Return__c', "External_Id__c != null"),
+    # Direct relations go with their Contact; only indirect ones need deleting
+    ('AccountContactRelation', "IsDirect = false AND Contact.External_Id__c != null"),
+    ('Contact', "External_Id__c != null"),
+    ('Account', "External_Id__c != null"),
+]
+
+MODES = ('hard', 'soft', 'collections')
+BULK_JOB_SIZE = 10000   # IDs per Bulk API 2.0 delete job
+DEFAULT_WORKERS = 4
+
+def collect_ids(sf, sobject, where):
+    """Record IDs matching the filter, via one Bulk API 2.0 query job"""
+    ids = []
+    for page in getattr(sf.bulk2, sobject).query(f"SELECT Id FROM {sobject} WHERE {where}"):
+        ids.extend(row['Id'] for row in csv.DictReader(io.StringIO(page)))
+    return ids
+
+def count_remaining(sf, sobject, where):
+    return sf.query(f"SELECT COUNT() FROM {sobject} WHERE {where}")['totalSize']
+
+def _bulk_delete_chunk(sf, sobject, ids, mode):
+    """One Bulk API 2.0 delete/hardDelete job; returns (deleted, failures)"""
+    bulk = getattr(sf.bulk2, sobject)
+    operation = bulk.hard_delete if mode == 'hard' else bulk.delete
+    try:
+        results = operation(records=[{'Id': record_id} for record_id in ids])
+    except Exception as e:
+        return 0, [{'Id': record_id, 'error': str(e)} for record_id in ids]
+
+    deleted = 0
+    failures = []
+    for result in results:
+        processed = int(result.get('numberRecordsProcessed', 0))
+        failed = int(result.get('numberRecordsFailed', 0))
+        deleted += processed - failed
+        if failed:
+            failed_csv = bulk.get_failed_records(result['job_id'])
+            for row in csv.DictReader(io.StringIO(failed_csv)):
+                failures.append({'Id': row.get('sf__Id') or row.get('Id'), 'error': row.get('sf__Error')})
+    return deleted, failures
+
+def _collection_delete_chunk(sf, ids):
+    """One 200-record sObject Collections delete; returns (deleted, failures)"""
+    results = delete_records(sf, ids)
+    failures = [{'Id': r['record'], 'error': error_text(r)} for r in results if not r['success']]
+    return len(results) - len(failures), failures
+
+def delete_ids(sf, sobject, ids, mode='hard', workers=DEFAULT_WORKERS, governor=None):
+    """
+    Delete IDs in parallel chunks
+    Returns (deleted_count, failures) where failures are {'Id', 'error'}
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+    chunk_size = COLLECTION_SIZE if mode == 'collections' else BULK_JOB_SIZE
+    chunks = list(chunked(ids, chunk_size))
+    budgets = ('api',) if mode == 'collections' else ('api', 'bulk')
+
+    deleted = 0
+    failures = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # One round of `workers` chunks at a time so the governor is consulted between rounds
+        for start in range(0, len(chunks), workers):
+            if governor is not None:
+                governor.checkpoint(*budgets)
+            round_chunks = chunks[start:start + workers]
+            if mode == 'collections':
+                results = executor.map(lambda chunk: _collection_delete_chunk(sf, chunk), round_chunks)
+            else:
+                results = executor.map(lambda chunk: _bulk_delete_chunk(sf, sobject, chunk, mode), round_chunks)
+            for chunk_deleted, chunk_failures in results:
+                deleted += chunk_deleted
+                failures.extend(chunk_failures)
+            done = min(start + workers, len(chunks))
+            print(f"      Progress: {done}/{len(chunks)} chunks ({deleted:,} deleted, {len(failures):,} errors)")
+    return deleted, failures
+
+def purge(sf, plan=PURGE_ORDER, mode='hard', workers=DEFAULT_WORKERS, governor=None):
+    """
+    Run the purge plan in order
+    Returns one summary dict per object:
+        {'object', 'found', 'deleted', 'failed', 'remaining', 'failures'}
+    """
+    summary = []
+    for sobject, where in plan:
+        print(f"\n[{sobject}] WHERE {where}")
+        ids = collect_ids(sf, sobject, where)
+        print(f"      Found {len(ids):,} records")
+
+        deleted, failures = (0, [])
+        if ids:
+            deleted, failures = delete_ids(sf, sobject, ids, mode, workers, governor)
+
+        remaining = count_remaining(sf, sobject, where)
+        print(f"      [VERIFY] {remaining:,} remaining")
+        summary.append({
+            'object': sobject,
+            'found': len(ids),
+            'deleted': deleted,
+            'failed': len(failures),
+            'remaining': remaining,
+            'failures': failures,
+        })
+    return summary
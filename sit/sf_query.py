@@ -0,0 +1,113 @@
+"""
+Keyed lookups without long GET query URLs
+Looking up records by a list of values with `WHERE field IN (...)` on the GET /query
+endpoint puts the whole SOQL in the URL, so lists had to be cut to ~500 values per
+call to stay under the URI length limit. Two alternatives:
+
+- bulk_query_map(): one Bulk API 2.0 query job over the whole filtered set, its CSV
+  result pages streamed straight into a {key: value} dict - for large lookups
+- post_query_map() / post_query_records(): the IN-list queries sent as Composite API
+  query subrequests in a POST body (no URL length limit), POST_QUERY_IN_SIZE values per
+  query and COMPOSITE_QUERY_LIMIT queries per call - for small subsets
+
+lookup_map() picks one by the number of values requested.
+
+Usage:
+    accounts = lookup_map(sf, 'Contact', 'External_Id__c', 'Account.External_Id__c', external_ids,
+                          where="External_Id__c != null")
+"""
+
+import csv
+import io
+from urllib.parse import quote
+from sf_http import API_VERSION, get_transport
+
+POST_QUERY_IN_SIZE = 2000       # Values per IN list (a 2000-row result fits one query page)
+COMPOSITE_QUERY_LIMIT = 5       # Query subrequests allowed per Composite call
+BULK_THRESHOLD = 20000          # From this many values one bulk job beats the POSTed queries
+
+def _soql_literal(value):
+    return "'" + str(value).replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+def _record_value(record, path):
+    """Value of a (possibly dotted) field path in a REST query record"""
+    for part in path.split('.'):
+        if record is None:
+            return None
+        record = record.get(part)
+    return record
+
+def bulk_query_map(sf, sobject, key_field, value_field, where=None, keys=None):
+    """
+    {key: value} from one Bulk API 2.0 query job, streamed page by page
+    keys: optional collection to keep only the rows whose key is in it
+    Blank CSV values come back as None
+    """
+    soql = f"SELECT {key_field}, {value_field} FROM {sobject}" + (f" WHERE {where}" if where else "")
+    wanted = {str(k) for k in keys} if keys is not None else None
+    found = {}
+    for page in getattr(sf.bulk2, sobject).query(soql):
+        for row in csv.DictReader(io.StringIO(page)):
+            key = row[key_field]
+            if wanted is None or key in wanted:
+                found[key] = row[value_field] or None
+    return found
+
+def post_query_records(sf, sobject, key_field, fields, keys, where=None):
+    """
+    {key: {field: value}} for the given keys, queried with IN lists sent in Composite POST
+    bodies; relationship paths ('Account.External_Id__c') are flattened into the dicts
+    where: optional extra filter ANDed with the IN list
+    """
+    transport = get_transport(sf)
+    keys = sorted({str(k) for k in keys})
+    select = ', '.join(dict.fromkeys([key_field] + list(fields)))
+    queries = []
+    for i in range(0, len(keys), POST_QUERY_IN_SIZE):
+        in_list = ','.join(_soql_literal(k) for k in keys[i:i + POST_QUERY_IN_SIZE])
+        condition = f"{key_field} IN ({in_list})" + (f" AND ({where})" if where else "")
+        queries.append(f"SELECT {select} FROM {sobject} WHERE {condition}")
+
+    found = {}
+    for i in range(0, len(queries), COMPOSITE_QUERY_LIMIT):
+        payload = {
+            "allOrNone": False,
+            "compositeRequest": [
+                {
+                    "method": "GET",
+                    "url": f"/services/data/{API_VERSION}/query?q={quote(soql)}",
+                    "referenceId": f"query{i + n}",
+                }
+                for n, soql in enumerate(queries[i:i + COMPOSITE_QUERY_LIMIT])
+            ]
+        }
+        response = transport.call('POST', 'composite', json=payload, retry_writes=True)  # queries only
+        for sub in response['compositeResponse']:
+            if sub['httpStatusCode'] >= 300:
+                raise RuntimeError(f"Query {sub['referenceId']} failed: {sub['body']}")
+            result = sub['body']
+            while True:
+                for record in result['records']:
+                    found[str(record[key_field])] = {field: _record_value(record, field) for field in fields}
+                if result.get('done', True):
+                    break
+                result = transport.call('GET', result['nextRecordsUrl'])
+        print(f"        Queried {min(i + COMPOSITE_QUERY_LIMIT, len(queries))}/{len(queries)} IN lists")
+    return found
+
+def post_query_map(sf, sobject, key_field, value_field, keys, where=None):
+    """{key: value} for the given keys, queried with IN lists sent in Composite POST bodies"""
+    records = post_query_records(sf, sobject, key_field, [value_field], keys, where)
+    return {key: record[value_field] for key, record in records.items()}
+
+def lookup_map(sf, sobject, key_field, value_field, keys, where=None, bulk_threshold=BULK_THRESHOLD):
+    """
+    {key: value} for the given keys: POSTed queries for small subsets, otherwise one bulk
+    job over `where` (which should select a superset of the keys) filtered locally
+    """
+    keys = {str(k) for k in keys if k is not None}
+    if not keys:
+        return {}
+    if len(keys) < bulk_threshold:
+        return post_query_map(sf, sobject, key_field, value_field, keys, where)
+    return bulk_query_map(sf, sobject, key_field, value_field, where, keys=keys)
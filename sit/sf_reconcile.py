@@ -0,0 +1,124 @@
+"""
+Single-pass reconciliation from one bulk export
+Reconciliation reports and SIT checks used to run one SELECT COUNT() per field and per
+check - each a full scan of the object on the Salesforce side. ObjectExport pulls the
+loaded records' fields once (sf_extract: parallel Bulk API 2.0 Id ranges), keeps them in
+a columnar Parquet file, and answers every check locally with vectorized pandas:
+
+    counts, population rates, null checks, duplicate checks, distributions, samples
+
+Usage:
+    export = ObjectExport.load(sf, 'Account', ['External_Id__c', 'Name', 'ABN__c', 'CreatedDate'])
+    export.count()                                   # rows in the export
+    export.population_rates(['ABN__c', 'Name'])      # one pass over every column
+    export.missing_any(['Name', 'ABN__c'])           # rows with any of them null
+    export.duplicates('External_Id__c')              # values held by more than one row
+    export.sample(5, sort_by='CreatedDate')          # list of dicts, None for nulls
+"""
+
+import os
+from datetime import datetime
+import pandas as pd
+from sf_extract import extract
+from sf_describe import describe
+
+EXPORT_DIR = 'test_output/exports'
+DEFAULT_WHERE = "External_Id__c != null"
+
+def existing_fields(sf, sobject, fields):
+    """(fields present on the object, fields not found) - from the cached describe"""
+    available = {field['name'] for field in describe(sf, sobject)['fields']}
+    # Relationship paths (Account.Name) are kept; their root field is not checked
+    present = [f for f in fields if '.' in f or f in available]
+    return present, [f for f in fields if f not in present]
+
+class ObjectExport:
+    """One export of an object's fields, with the reconciliation checks run locally"""
+
+    def __init__(self, df, sobject, path=None, missing_fields=()):
+        # Bulk API CSV has no nulls, only blanks
+        self.df = df.mask(df == '')
+        self.sobject = sobject
+        self.path = path
+        self.missing_fields = list(missing_fields)
+
+    @classmethod
+    def load(cls, sf, sobject, fields, where=DEFAULT_WHERE, path=None, governor=None):
+        """
+        Export `fields` of the records matching `where` and save them as Parquet
+        Fields missing from the org are skipped and listed in missing_fields
+        """
+        fields, missing = existing_fields(sf, sobject, list(dict.fromkeys(['Id'] + list(fields))))
+        for field in missing:
+            print(f"      [WARNING] {sobject}.{field} not found - skipped")
+
+        print(f"      Exporting {len(fields)} {sobject} fields in one pass...")
+        df = extract(sf, sobject, fields, where, governor=governor)
+        if path is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            path = os.path.join(EXPORT_DIR, f"{sobject.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet")
+        df.to_parquet(path, index=False)
+        print(f"      [OK] {len(df):,} records exported to {path}")
+        return cls(df, sobject, path, missing)
+
+    @classmethod
+    def from_file(cls, path, sobject):
+        """Reuse an earlier export instead of querying the org again"""
+        return cls(pd.read_parquet(path), sobject, path)
+
+    def has(self, field):
+        return field in self.df.columns
+
+    def count(self, mask=None):
+        """Rows in the export, or rows where the boolean Series `mask` is true"""
+        return len(self.df) if mask is None else int(mask.sum())
+
+    def populated(self, fields):
+        """{field: non-null count} for every field in one vectorized pass"""
+        present = [f for f in fields if self.has(f)]
+        return self.df[present].notna().sum().astype(int).to_dict()
+
+    def population_rates(self, fields):
+        """DataFrame of Field, Populated, Total, Percentage (fields not exported are left out)"""
+        total = len(self.df)
+        counts = self.populated(fields)
+        return pd.DataFrame([
+            {'Field': field, 'Populated': count, 'Total': total,
+             'Percentage': round(count / total * 100, 1) if total else 0.0}
+            for field, count in counts.items()
+        ])
+
+    def missing_any(self, fields):
+        """Rows where any of the fields is null"""
+        return int(self.df[fields].isna().any(axis=1).sum())
+
+    def duplicates(self, field):
+        """Number of distinct non-null values held by more than one row"""
+        counts = self.df[field].value_counts()
+        return int((counts > 1).sum())
+
+    def distribution(self, field, dropna=False):
+        """Value counts for a field (a group-by with COUNT(Id))"""
+        return self.df[field].value_counts(dropna=dropna)
+
+    def values(self, field, limit=3):
+        """First few non-null values of a field"""
+        return self.df[field].dropna().head(limit).tolist()
+
+    def sample(self, n=5, populated=None, sort_by=None, ascending=False):
+        """
+        Up to n records as dicts (None for nulls)
+        populated: only rows where this field is non-null
+        sort_by:   field to order by before taking the first n
+        """
+        df = self.df
+        if populated:
+            df = df[df[populated].notna()]
+        if sort_by:
+            df = df.sort_values(sort_by, ascending=ascending)
+        df = df.head(n)
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    def where_in(self, field, values):
+        """Rows whose field value is in `values`"""
+        return self.df[self.df[field].isin([str(v) for v in values])]
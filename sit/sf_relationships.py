@@ -0,0 +1,98 @@
+"""
+Relationship-by-External-ID helpers for SIT loaders
+Lets Bulk and sObject Collections payloads reference parent records by their
+External_Id__c (e.g. Account.External_Id__c, Employer__r.External_Id__c)
+so Salesforce resolves the lookup server-side - no pre-query of parent Ids.
+Parents that could not be resolved come back as per-record errors; this module
+picks those out and writes a fallback report.
+"""
+
+import re
+from datetime import datetime
+import pandas as pd
+
+# Salesforce error when a relationship external ID has no matching parent, e.g.
+# "Foreign key external ID: 12345 not found for field External_Id__c in entity Account"
+UNRESOLVED_PARENT_PATTERN = re.compile(
+    r"Foreign key external ID:\s*(?P<value>.+?)\s+not found for field\s+"
+    r"(?P<field>\w+)\s+in entity\s+(?P<entity>\w+)"
+)
+
+def to_external_id(value):
+    """Normalise an Oracle numeric key to the External_Id__c string form (no .0)"""
+    if value is None or pd.isna(value) or value == '':
+        return None
+    try:
+        return str(int(value))
+    except (TypeError, ValueError):
+        return str(value).strip() or None
+
+def parent_reference(value, external_id_field='External_Id__c'):
+    """Build a relationship payload such as {'External_Id__c': '12345'} (None if no key)"""
+    external_id = to_external_id(value)
+    if external_id is None:
+        return None
+    return {external_id_field: external_id}
+
+def parse_unresolved_parent(error):
+    """
+    Return (entity, field, value) if an error says the parent external ID was not found
+    Accepts the bulk/collections 'errors' list, a single error dict or a plain string
+    """
+    if isinstance(error, (list, tuple)):
+        for item in error:
+            parsed = parse_unresolved_parent(item)
+            if parsed:
+                return parsed
+        return None
+
+    message = error.get('message', '') if isinstance(error, dict) else str(error)
+    match = UNRESOLVED_PARENT_PATTERN.search(message)
+    if not match:
+        return None
+    return match.group('entity'), match.group('field'), match.group('value').strip()
+
+def split_unresolved_parents(errors):
+    """Split collected load errors into (unresolved_parent_rows, other_errors)"""
+    unresolved = []
+    other = []
+    for err in errors:
+        parsed = parse_unresolved_parent(err.get('error'))
+        if parsed:
+            entity, field, value = parsed
+            unresolved.append({
+                'external_id': err.get('external_id'),
+                'parent_object': entity,
+                'parent_field': field,
+                'parent_external_id': value,
+                'batch': err.get('batch'),
+            })
+        else:
+            other.append(err)
+    return unresolved, other
+
+def save_unresolved_parents_report(errors, object_name):
+    """
+    Write the fallback report for records whose parent could not be resolved
+    One row per child record plus a per-parent summary printed to the console
+    Returns the report path (None when every parent resolved)
+    """
+    unresolved, _ = split_unresolved_parents(errors)
+
+    if not unresolved:
+        print(f"      [OK] All {object_name} parent lookups resolved")
+        return None
+
+    df_unresolved = pd.DataFrame(unresolved)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report_file = f'error/sit_{object_name.lower()}_unresolved_parents_{timestamp}.csv'
+    df_unresolved.to_csv(report_file, index=False)
+
+    by_parent = df_unresolved.groupby(['parent_object', 'parent_external_id']).size()
+    print(f"      [WARNING] {len(df_unresolved):,} {object_name} records reference "
+          f"{len(by_parent):,} parents not found in Salesforce")
+    for (entity, value), count in by_parent.sort_values(ascending=False).head(5).items():
+        print(f"        {entity} {value}: {count:,} records")
+    print(f"      Unresolved parents saved to: {report_file}")
+
+    return report_file
@@ -0,0 +1,171 @@
+"""
+Error classification and retry helpers for failed load records
+Loaders write failures to error/sit_<object>_errors_<ts>.csv as
+(batch, index, external_id, error, run_id); this module classifies each error as
+- transient: row locks, timeouts, server unavailable - safe to re-submit
+- permanent: bad data (picklist, length, required field, unresolved parent) - needs a fix
+- unknown:   anything else - reported, never retried automatically
+and re-submits transient failures in small, lock-isolated collections with backoff.
+"""
+
+import os
+import re
+import glob
+import time
+import pandas as pd
+from sf_collections import upsert_records, error_text
+
+ERROR_FILE_PATTERN = re.compile(r'sit_(?P<object>[a-z_]+?)_errors_\d{8}_\d{6}\.csv$')
+
+TRANSIENT_PATTERNS = [
+    r'UNABLE_TO_LOCK_ROW',
+    r'unable to obtain exclusive access',
+    r'SERVER_UNAVAILABLE',
+    r'REQUEST_RUNNING_TOO_LONG',
+    r'QUERY_TIMEOUT',
+    r'timed? ?out',
+    r'ConnectionError|Connection aborted|Connection reset',
+    r'REQUEST_LIMIT_EXCEEDED',
+    r'HTTP 50[234]',
+]
+
+PERMANENT_PATTERNS = [
+    r'INVALID_OR_NULL_FOR_RESTRICTED_PICKLIST',
+    r'bad value for restricted picklist',
+    r'STRING_TOO_LONG',
+    r'REQUIRED_FIELD_MISSING',
+    r'INVALID_EMAIL_ADDRESS',
+    r'INVALID_TYPE_ON_FIELD_IN_RECORD',
+    r'FIELD_CUSTOM_VALIDATION_EXCEPTION',
+    r'DUPLICATE_VALUE',
+    r'DUPLICATE_EXTERNAL_ID',
+    r'Foreign key external ID',
+    r'INVALID_FIELD',
+    r'MALFORMED_ID',
+]
+
+_TRANSIENT = re.compile('|'.join(TRANSIENT_PATTERNS), re.IGNORECASE)
+_PERMANENT = re.compile('|'.join(PERMANENT_PATTERNS), re.IGNORECASE)
+
+# Relationship column each object's records reference their parent through.
+# Records sharing a parent are kept in the same retry batch so concurrent batches
+# never contend for the same parent row lock.
+LOCK_PARENT_FIELD = {
+    'Account': None,
+    'Contact': 'Account',
+}
+
+def classify_error(error):
+    """'transient', 'permanent' or 'unknown' for an error (string, dict or list of dicts)"""
+    text = error if isinstance(error, str) else str(error)
+    # Permanent wins: a record that is both locked and invalid will fail again
+    if _PERMANENT.search(text):
+        return 'permanent'
+    if _TRANSIENT.search(text):
+        return 'transient'
+    return 'unknown'
+
+def object_from_error_file(path):
+    """'Contact' for error/sit_contact_errors_<ts>.csv, or None"""
+    match = ERROR_FILE_PATTERN.search(os.path.basename(path))
+    if not match:
+        return None
+    return match.group('object').capitalize()
+
+def latest_error_file(object_name, error_dir='error'):
+    """Newest error/sit_<object>_errors_<ts>.csv, or None"""
+    files = sorted(glob.glob(os.path.join(error_dir, f"sit_{object_name.lower()}_errors_*.csv")))
+    return files[-1] if files else None
+
+def load_errors(path):
+    """Read an error CSV and add an error_class column; one row per external_id"""
+    df = pd.read_csv(path, dtype={'external_id': str, 'run_id': str})
+    df = df.drop_duplicates(subset='external_id', keep='last')
+    df['error_class'] = df['error'].fillna('').map(classify_error)
+    return df
+
+def error_file_run_id(df_errors):
+    """Journal run_id the error file was written by, or None (files from before run_ids were recorded)"""
+    if 'run_id' not in df_errors:
+        return None
+    run_ids = df_errors['run_id'].dropna().unique()
+    return run_ids[0] if len(run_ids) else None
+
+def lock_isolated_batches(records, parent_field, batch_size):
+    """
+    Split records into batches of at most batch_size, ordered so that records with
+    the same parent land in the same batch (a group larger than batch_size gets
+    consecutive batches of its own)
+    """
+    if not parent_field:
+        return [records[i:i + batch_size] for i in range(0, len(records), batch_size)]
+
+    groups = {}
+    for record in records:
+        groups.setdefault(str(record.get(parent_field)), []).append(record)
+
+    batches = []
+    current = []
+    for group in sorted(groups.values(), key=len, reverse=True):
+        if len(group) > batch_size:
+            batches.extend(group[i:i + batch_size] for i in range(0, len(group), batch_size))
+            continue
+        if len(current) + len(group) > batch_size:
+            batches.append(current)
+            current = []
+        current.extend(group)
+    if current:
+        batches.append(current)
+    return batches
+
+def retry_transient(sf, sobject, external_id_field, records, parent_field=None,
+                    batch_size=50, max_attempts=4, base_delay=5, governor=None):
+    """
+    Re-submit records through sObject Collections upserts with exponential backoff
+    Only records that fail again with a transient error are retried on the next attempt.
+    governor: optional sf_limits.LimitsGovernor checked before every batch
+    Returns (succeeded, failed) where failed is a list of
+    {'external_id', 'error', 'error_class', 'attempts'}
+    """
+    pending = list(records)
+    succeeded = []
+    failed = {}
+
+    for attempt in range(1, max_attempts + 1):
+        if not pending:
+            break
+        if attempt > 1:
+            delay = base_delay * 2 ** (attempt - 2)
+            print(f"      Waiting {delay}s before attempt {attempt}/{max_attempts} "
+                  f"({len(pending)} records)...")
+            time.sleep(delay)
+
+        still_transient = []
+        attempt_success = 0
+        batches = lock_isolated_batches(pending, parent_field, batch_size)
+        for batch in batches:
+            if governor is not None:
+                governor.checkpoint()
+            for result in upsert_records(sf, sobject, external_id_field, batch):
+                external_id = result['record'].get(external_id_field)
+                if result['success']:
+                    succeeded.append(external_id)
+                    attempt_success += 1
+                    failed.pop(external_id, None)
+                    continue
+                message = error_text(result)
+                error_class = classify_error(message)
+                failed[external_id] = {
+                    'external_id': external_id,
+                    'error': message,
+                    'error_class': error_class,
+                    'attempts': attempt,
+                }
+                if error_class == 'transient':
+                    still_transient.append(result['record'])
+
+        print(f"      Attempt {attempt}: {attempt_success:,} succeeded, "
+              f"{len(still_transient):,} still transient")
+        pending = still_transient
+
+    return succeeded, list(failed.values())
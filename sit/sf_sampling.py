@@ -0,0 +1,145 @@
+"""
+Stratified sampling verification of a load
+A full diff (sf_diff) reads every record; after an incremental load a few seconds of
+checking is usually enough. sample_check():
+
+1. splits the Oracle snapshot into strata (employer size band x state x load batch)
+2. draws a random sample from every stratum (proportional, at least MIN_PER_STRATUM)
+3. fetches the sampled External IDs from Salesforce with a few POSTed Composite queries
+4. compares them field by field with the same normalisation as the full diff
+   (Oracle-side nulls are not checked; pass the snapshot through expected_state)
+5. estimates the mismatch rate of the whole load, overall and per field, with a
+   stratified estimator and a confidence interval
+
+Per-stratum rates use (x + 1) / (n + 2) in the variance so a stratum with no mismatches
+still widens the interval instead of claiming certainty.
+
+Usage:
+    df = add_strata(df_mapped, 'Contact', batch_sizes)
+    result = sample_check(sf, 'Contact', df, fields, sample_size=1000)
+    result['overall']      # {'rate', 'low', 'high', 'mismatched', 'sampled'}
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from sf_query import post_query_records
+from sf_diff import KEY_FIELD, differences, flatten_references, normalise
+
+DEFAULT_SAMPLE = 1000
+MIN_PER_STRATUM = 2
+Z_95 = 1.96
+
+SIZE_BINS = [0, 5, 20, 100, float('inf')]
+SIZE_LABELS = ['1-4', '5-19', '20-99', '100+']
+
+# Per object: (column giving employer size, column giving state)
+STRATA_SOURCES = {
+    'Account': ('NumberOfEmployees', 'BillingState'),
+    'Contact': ('Account.External_Id__c', 'MailingState'),
+}
+
+def add_strata(df, object_name, batch_sizes=None):
+    """
+    Copy of the (flattened) snapshot with _size_band, _state, _batch and _stratum columns
+    batch_sizes: record counts of the load batches in order (from the journal); rows
+    are numbered into batches by position, as the loaders split them
+    """
+    df = flatten_references(df).reset_index(drop=True)
+    size_source, state_source = STRATA_SOURCES.get(object_name, (None, None))
+
+    if size_source == 'Account.External_Id__c' and size_source in df.columns:
+        # Contacts: employer size = contacts per employer in the snapshot
+        sizes = df.groupby(size_source)[size_source].transform('size')
+    elif size_source in df.columns:
+        sizes = pd.to_numeric(df[size_source], errors='coerce')
+    else:
+        sizes = pd.Series(np.nan, index=df.index)
+    df['_size_band'] = pd.cut(sizes, SIZE_BINS, labels=SIZE_LABELS, right=False).astype(object).fillna('unknown')
+
+    state = df[state_source] if state_source in df.columns else pd.Series(None, index=df.index)
+    df['_state'] = state.fillna('unknown').astype(str).str.upper()
+
+    if batch_sizes and sum(batch_sizes) == len(df):
+        df['_batch'] = np.repeat(np.arange(1, len(batch_sizes) + 1), batch_sizes)
+    else:
+        df['_batch'] = 1
+    df['_stratum'] = df['_size_band'] + '|' + df['_state'] + '|' + df['_batch'].astype(str)
+    return df
+
+def draw_sample(df, sample_size=DEFAULT_SAMPLE, seed=None):
+    """Stratified random sample: proportional allocation, at least MIN_PER_STRATUM per stratum"""
+    population = df['_stratum'].value_counts()
+    allocation = (population / population.sum() * sample_size).round().astype(int)
+    allocation = allocation.clip(lower=MIN_PER_STRATUM).combine(population, min)
+    rng = np.random.default_rng(seed)
+    parts = [
+        group.iloc[rng.choice(len(group), size=allocation[stratum], replace=False)]
+        for stratum, group in df.groupby('_stratum')
+    ]
+    return pd.concat(parts)
+
+def _interval(strata):
+    """Stratified rate estimate and confidence interval from per-stratum (N, n, x) rows"""
+    total = strata['N'].sum()
+    weights = strata['N'] / total
+    rate = float((weights * strata['x'] / strata['n']).sum())
+    adjusted = (strata['x'] + 1) / (strata['n'] + 2)
+    fpc = (1 - strata['n'] / strata['N']).clip(lower=0)
+    variance = float((weights ** 2 * adjusted * (1 - adjusted) / strata['n'] * fpc).sum())
+    margin = Z_95 * math.sqrt(variance)
+    return {'rate': rate, 'low': max(0.0, rate - margin), 'high': min(1.0, rate + margin)}
+
+def sample_check(sf, object_name, df, fields, sample_size=DEFAULT_SAMPLE, seed=None):
+    """
+    Compare a stratified sample of the snapshot (from add_strata) with Salesforce
+    Returns {'overall': {...}, 'per_field': {field: {...}}, 'missing', 'sampled',
+             'strata', 'mismatches': DataFrame of key, field, oracle, salesforce}
+    """
+    fields = [f for f in fields if f != KEY_FIELD and f in df.columns]
+    df = df[df[KEY_FIELD].notna()].drop_duplicates(KEY_FIELD, keep='last')
+    sample = draw_sample(df, sample_size, seed)
+    keys = sample[KEY_FIELD].astype(str).tolist()
+    print(f"      Sampled {len(sample):,} records from {sample['_stratum'].nunique():,} strata")
+
+    found = post_query_records(sf, object_name, KEY_FIELD, fields, keys)
+    sf_side = pd.DataFrame.from_dict(found, orient='index', columns=fields)
+    sf_side = sf_side.reindex(keys)
+
+    oracle_side = sample.set_index(sample[KEY_FIELD].astype(str))[fields]
+    missing = ~pd.Index(keys).isin(list(found))
+    differs = pd.DataFrame(index=oracle_side.index)
+    for field in fields:
+        left, right = normalise(oracle_side[field]), normalise(sf_side[field])
+        differs[field] = differences(left, right) | missing
+
+    sample = sample.assign(_any=differs.any(axis=1).values)
+    population = df['_stratum'].value_counts()
+    strata = sample.groupby('_stratum').agg(n=('_any', 'size'), x=('_any', 'sum'))
+    strata['N'] = population.reindex(strata.index)
+
+    overall = _interval(strata)
+    overall.update({'mismatched': int(sample['_any'].sum()), 'sampled': len(sample)})
+    per_field = {}
+    for field in fields:
+        counts = sample.assign(_x=differs[field].values).groupby('_stratum')['_x'].sum()
+        field_strata = strata.assign(x=counts.reindex(strata.index))
+        per_field[field] = dict(_interval(field_strata), mismatched=int(differs[field].sum()))
+
+    rows = differs.stack()
+    rows = rows[rows]
+    mismatches = pd.DataFrame({
+        KEY_FIELD: rows.index.get_level_values(0),
+        'field': rows.index.get_level_values(1),
+    })
+    mismatches['oracle'] = [oracle_side.at[k, f] for k, f in zip(mismatches[KEY_FIELD], mismatches['field'])]
+    mismatches['salesforce'] = [sf_side.at[k, f] for k, f in zip(mismatches[KEY_FIELD], mismatches['field'])]
+
+    return {
+        'overall': overall,
+        'per_field': per_field,
+        'missing': int(missing.sum()),
+        'sampled': len(sample),
+        'strata': len(strata),
+        'mismatches': mismatches,
+    }
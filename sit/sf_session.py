@@ -0,0 +1,112 @@
+"""
+Cached Salesforce sessions shared between scripts
+Every script used to do its own SOAP login (Salesforce(username=..., password=...)),
+which costs a few seconds per process and counts against the org's login rate limit.
+get_salesforce() reuses the session ID and instance URL from the last login for the
+same user and domain, stored in a file only the current user can read:
+
+- a session checked within CHECK_SECONDS is used as-is (no network call)
+- an older one is checked with a single lightweight REST call
+- a missing, expired or rejected session triggers a normal login, which is cached
+- the shared sf_http transport logs in again through here on a 401, for the same user
+  and domain as the connection (recorded as sf.login_username and sf.domain)
+
+Usage:
+    from sf_session import get_salesforce
+    sf = get_salesforce()                       # SF_* from the loaded .env / .env.sit
+    sf = get_salesforce(force_login=True)       # ignore the cache
+"""
+
+import os
+import json
+import time
+import tempfile
+from simple_salesforce import Salesforce
+from simple_salesforce.exceptions import SalesforceError
+
+DEFAULT_SESSION_CACHE = os.path.join(os.path.expanduser('~'), '.sf_session_cache.json')
+CHECK_SECONDS = 60      # Trust a session checked this recently without another call
+
+def _cache_key(username, domain):
+    return f"{username}@{domain}"
+
+def _cache_path():
+    """SF_SESSION_CACHE, read at call time so a value loaded from .env / .env.sit applies"""
+    return os.getenv('SF_SESSION_CACHE') or DEFAULT_SESSION_CACHE
+
+def _read_cache():
+    try:
+        with open(_cache_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_cache(cache):
+    """Atomically replace the cache file, readable by the current user only"""
+    path = _cache_path()
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.sf_session_')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _store(key, sf, checked_at):
+    cache = _read_cache()
+    cache[key] = {
+        'session_id': sf.session_id,
+        'instance': sf.sf_instance,
+        'checked_at': checked_at,
+    }
+    try:
+        _write_cache(cache)
+    except OSError as e:
+        print(f"[WARNING] Could not write session cache {_cache_path()}: {e}")
+
+def invalidate(username=None, domain=None):
+    """Drop the cached session for a user/domain (defaults from the environment)"""
+    key = _cache_key(username or os.getenv('SF_USERNAME'), domain or os.getenv('SF_DOMAIN', 'test'))
+    cache = _read_cache()
+    if cache.pop(key, None) is not None:
+        _write_cache(cache)
+
+def login(username=None, password=None, security_token=None, domain=None):
+    """Log in with username/password (SOAP) and cache the new session"""
+    username = username or os.getenv('SF_USERNAME')
+    domain = domain or os.getenv('SF_DOMAIN', 'test')
+    sf = Salesforce(
+        username=username,
+        password=password or os.getenv('SF_PASSWORD'),
+        security_token=security_token or os.getenv('SF_SECURITY_TOKEN'),
+        domain=domain
+    )
+    sf.login_username = username
+    _store(_cache_key(username, domain), sf, time.time())
+    return sf
+
+def get_salesforce(username=None, password=None, security_token=None, domain=None, force_login=False):
+    """Salesforce connection reusing the cached session when it is still valid"""
+    username = username or os.getenv('SF_USERNAME')
+    domain = domain or os.getenv('SF_DOMAIN', 'test')
+    key = _cache_key(username, domain)
+
+    cached = None if force_login else _read_cache().get(key)
+    if cached:
+        sf = Salesforce(session_id=cached['session_id'], instance=cached['instance'], domain=domain)
+        sf.login_username = username
+        if time.time() - cached.get('checked_at', 0) < CHECK_SECONDS:
+            return sf
+        try:
+            # Lightest authenticated call: the resource list for the API version
+            sf.restful('')
+            _store(key, sf, time.time())
+            return sf
+        except SalesforceError:
+            pass
+
+    return login(username, password, security_token, domain)
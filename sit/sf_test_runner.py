@@ -0,0 +1,112 @@
+"""
+Concurrent SIT test runner with a shared query cache
+The SIT test scripts ran each test_* function one after the other, and several
+tests issue the same SOQL (e.g. the loaded record COUNT()). run_tests() runs
+independent tests on a bounded thread pool and QueryCache makes every identical
+query within a run hit Salesforce once:
+
+- QueryCache wraps a Salesforce connection; query()/query_all() are memoised on the
+  whitespace-normalised SOQL, and concurrent callers of the same query wait for the
+  single request in flight. Everything else is passed through to the connection.
+- each test's printed output is buffered and shown in one block when it finishes,
+  so concurrent tests do not interleave
+- every test is timed; the runner returns (name, result, seconds) per test in the
+  order given
+
+Usage:
+    sf = QueryCache(get_salesforce())
+    outcomes = run_tests([test_count, test_samples], sf, workers=4)
+"""
+
+import io
+import sys
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_WORKERS = 4
+
+class QueryCache:
+    """Memoising proxy for a Salesforce connection (query/query_all)"""
+
+    def __init__(self, sf):
+        self._sf = sf
+        self._results = {}      # (method, soql) -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        return getattr(self._sf, name)
+
+    def _cached(self, method, soql):
+        key = (method, ' '.join(soql.split()))
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(getattr(self._sf, method)(soql))
+            except Exception as e:
+                future.set_exception(e)
+                with self._lock:
+                    self._results.pop(key, None)    # Do not cache failures
+        return future.result()
+
+    def query(self, soql):
+        return self._cached('query', soql)
+
+    def query_all(self, soql):
+        return self._cached('query_all', soql)
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout replacement sending each thread's output to its own buffer when set"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def run_tests(tests, *args, workers=DEFAULT_WORKERS):
+    """
+    Run test functions concurrently, each called as test(*args)
+    Returns [(test name, return value, seconds)] in the order of `tests`;
+    a test that raises returns the exception as its value
+    """
+    output = _ThreadOutput(sys.stdout)
+    print_lock = threading.Lock()
+
+    def run(test):
+        output.local.buffer = io.StringIO()
+        start = time.perf_counter()
+        try:
+            result = test(*args)
+        except Exception as e:
+            print(f"[ERROR] {test.__name__} raised: {e}")
+            result = e
+        seconds = time.perf_counter() - start
+        captured = output.local.buffer.getvalue()
+        output.local.buffer = None
+        with print_lock:
+            output.stream.write(captured)
+            output.stream.write(f"({test.__name__}: {seconds:.2f}s)\n")
+        return test.__name__, result, seconds
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, test) for test in tests]
+            return [future.result() for future in futures]
+    finally:
+        sys.stdout = output.stream
@@ -0,0 +1,179 @@
+"""
+Pre-load validation from Salesforce describe metadata
+Validation used to live in separate scripts that re-extracted the data and looped per
+column, with text lengths hard-coded, so bad values were only found when a Bulk batch
+failed server-side. LoadValidator derives the rules from the object's describe result
+(cached on disk by sf_describe) and checks each batch with vectorized pandas masks before it is
+uploaded; rows that break a rule are quarantined instead of sent.
+
+Rules, per mapped column that is a field of the object:
+- required:  not nillable, createable and not defaulted on create - value must be present
+- length:    text fields - value longer than the field length
+- picklist:  restricted (multi-select) picklists - value not an active picklist value
+- precision: number/currency/percent - rounded to the field scale, more integer digits
+             than precision - scale allows; int fields - more than `digits` digits
+- type:      number/date value that cannot be parsed
+- date:      date/datetime outside Salesforce's supported range (DATE_MIN - DATE_MAX)
+
+Relationship columns (e.g. Account: {'External_Id__c': ...}) are not fields and are skipped.
+
+Usage:
+    validator = LoadValidator(sf, 'Contact')
+    good_df, violations = validator.validate(batch_df.reset_index(drop=True))   # per batch
+    errors += validator.quarantine_errors(violations, batch_num, offset=start_idx)
+    validator.save()                                        # error/sit_contact_quarantine_<ts>.csv
+"""
+
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sf_describe import describe
+
+DATE_MIN = pd.Timestamp('1700-01-01')
+DATE_MAX = pd.Timestamp('4000-12-31')
+
+TEXT_TYPES = ('string', 'textarea', 'email', 'phone', 'url', 'picklist', 'multipicklist', 'encryptedstring')
+DECIMAL_TYPES = ('double', 'currency', 'percent')
+DATE_TYPES = ('date', 'datetime')
+DESCRIBE_KEYS = ('name', 'type', 'length', 'precision', 'scale', 'digits', 'nillable', 'createable',
+                 'defaultedOnCreate', 'restrictedPicklist', 'picklistValues')
+
+def describe_fields(sf, sobject):
+    """{field name: describe entry} for an object, from the sf_describe cache"""
+    fields = {}
+    for field in describe(sf, sobject)['fields']:
+        entry = {key: field.get(key) for key in DESCRIBE_KEYS}
+        entry['picklistValues'] = [p['value'] for p in field.get('picklistValues') or [] if p.get('active')]
+        fields[field['name']] = entry
+    return fields
+
+def build_rules(fields, columns):
+    """[(column, rule, limit)] for the mapped columns, from describe_fields()"""
+    rules = []
+    for column in columns:
+        field = fields.get(column)
+        if field is None:
+            continue
+        if not field['nillable'] and field['createable'] and not field['defaultedOnCreate'] \
+                and field['type'] != 'boolean':
+            rules.append((column, 'required', None))
+        if field['type'] in TEXT_TYPES and field['length']:
+            rules.append((column, 'length', field['length']))
+        if field['type'] in ('picklist', 'multipicklist') and field['restrictedPicklist']:
+            rules.append((column, field['type'], frozenset(field['picklistValues'])))
+        if field['type'] in DECIMAL_TYPES and field['precision']:
+            rules.append((column, 'precision', (field['precision'], field['scale'] or 0)))
+        if field['type'] == 'int' and field['digits']:
+            rules.append((column, 'precision', (field['digits'], 0)))
+        if field['type'] in DATE_TYPES:
+            rules.append((column, 'date', (DATE_MIN, DATE_MAX)))
+    return rules
+
+def _present(values):
+    return values.notna() & (values.astype(str) != '')
+
+def _violations(values, rule, limit):
+    """(mask of bad rows, description) for one rule over one column"""
+    present = _present(values)
+    if rule == 'required':
+        return ~present, 'required value missing'
+    if rule == 'length':
+        return present & (values.astype(str).str.len() > limit), f'longer than {limit} characters'
+    if rule == 'picklist':
+        return present & ~values.isin(limit), 'not an active picklist value'
+    if rule == 'multipicklist':
+        parts = values[present].astype(str).str.split(';').explode().str.strip()
+        bad_rows = parts.index[~parts.isin(limit)]
+        return pd.Series(values.index.isin(bad_rows), index=values.index), 'not all active picklist values'
+    if rule == 'precision':
+        precision, scale = limit
+        numbers = pd.to_numeric(values.where(present), errors='coerce')
+        unparsed = present & numbers.isna()
+        too_big = numbers.round(scale).abs() >= 10.0 ** (precision - scale)
+        return unparsed | too_big, f'not a number or more than {precision - scale} integer digits'
+    if rule == 'date':
+        low, high = limit
+        dates = pd.to_datetime(values.where(present), errors='coerce', utc=True, format='ISO8601').dt.tz_localize(None)
+        unparsed = present & dates.isna()
+        return unparsed | (dates < low) | (dates > high), f'not a date between {low.date()} and {high.date()}'
+    raise ValueError(f"Unknown rule: {rule}")
+
+class LoadValidator:
+    """Describe-derived rules for one object, applied batch by batch with quarantine"""
+
+    def __init__(self, sf, sobject, key_field='External_Id__c'):
+        self.sobject = sobject
+        self.key_field = key_field
+        self.fields = describe_fields(sf, sobject)
+        self._rules = {}            # column tuple -> rules
+        self.quarantined = []       # violation rows across batches
+        self.checked = 0
+
+    def rules(self, columns):
+        columns = tuple(columns)
+        if columns not in self._rules:
+            self._rules[columns] = build_rules(self.fields, columns)
+        return self._rules[columns]
+
+    def validate(self, df):
+        """
+        (rows passing every rule, violations DataFrame) for one batch
+        violations: one row per broken rule - row (index label), key, field, rule, value, detail
+        """
+        self.checked += len(df)
+        bad = np.zeros(len(df), dtype=bool)
+        found = []
+        keys = df[self.key_field] if self.key_field in df.columns else pd.Series(df.index, index=df.index)
+        for column, rule, limit in self.rules(df.columns):
+            mask, detail = _violations(df[column], rule, limit)
+            mask = mask.to_numpy(dtype=bool)
+            if mask.any():
+                bad |= mask
+                found.append(pd.DataFrame({
+                    'row': df.index[mask],
+                    'key': keys.to_numpy()[mask],
+                    'field': column,
+                    'rule': rule,
+                    'value': df[column].to_numpy()[mask],
+                    'detail': detail,
+                }))
+        if not found:
+            return df, pd.DataFrame(columns=['row', 'key', 'field', 'rule', 'value', 'detail'])
+        violations = pd.concat(found, ignore_index=True)
+        self.quarantined.append(violations)
+        return df[~bad], violations
+
+    def quarantine_errors(self, violations, batch_num, offset=0):
+        """
+        One load error per quarantined row, shaped like the loaders' Bulk errors
+        ({'batch', 'index', 'external_id', 'error'}); offset is added to the row positions
+        """
+        errors = []
+        for row, group in violations.sort_values('row', kind='stable').groupby('row', sort=False):
+            errors.append({
+                'batch': batch_num,
+                'index': offset + int(row),
+                'external_id': group['key'].iloc[0],
+                'error': 'QUARANTINED: ' + '; '.join(group['field'] + ' ' + group['detail']),
+            })
+        return errors
+
+    def summary(self):
+        if not self.quarantined:
+            return f"{self.checked:,} records validated, none quarantined"
+        violations = pd.concat(self.quarantined, ignore_index=True)
+        counts = violations.groupby(['field', 'rule']).size().sort_values(ascending=False)
+        lines = [f"{self.checked:,} records validated, {violations['key'].nunique():,} quarantined"]
+        lines += [f"  {field:<35} {rule:<10} {count:>8,}" for (field, rule), count in counts.items()]
+        return '\n'.join(lines)
+
+    def save(self, path=None):
+        """Write every violation to a quarantine CSV; returns its path (None when clean)"""
+        if not self.quarantined:
+            return None
+        if path is None:
+            os.makedirs('error', exist_ok=True)
+            path = f"error/sit_{self.sobject.lower()}_quarantine_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        pd.concat(self.quarantined, ignore_index=True).to_csv(path, index=False)
+        return path
@@ -1,34 +1,46 @@
 """
 Quick reconciliation report for SIT accounts
 Runs data quality checks without reloading data
+All checks run locally on one bulk export of the Account fields (sf_reconcile)
 """
 
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_reconcile import ObjectExport
 from datetime import datetime
 
 # Load .env.sit
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\nUsing environment: .env.sit")
 print("=" * 70)
 print("SIT ACCOUNT RECONCILIATION REPORT")
 print("=" * 70)
 
+fields = [
+    'ABN__c',
+    'ACN__c', 
+    'RegisteredEntityName__c',
+    'TradingAs__c',
+    'Registration_Number__c',
+    'DateEmploymentCommenced__c',
+    'Type'
+]
+
+# Export every checked field once; all checks below run locally on the export
+print("\n[0/5] Exporting Accounts")
+print("-" * 70)
+export = ObjectExport.load(sf, 'Account', ['External_Id__c', 'Name', 'CreatedDate'] + fields)
+
 # 1. Count records
 print("\n[1/5] Record Counts")
 print("-" * 70)
 oracle_count = 53857  # From last load
-sf_count = sf.query(f"SELECT COUNT() FROM Account WHERE External_Id__c != null")['totalSize']
+sf_count = export.count()
 print(f"  Oracle extracted:  {oracle_count:,} records")
 print(f"  Salesforce total:  {sf_count:,} records with External_Id__c")
 print(f"  Match status:      {'✓ MATCH' if oracle_count == sf_count else '✗ MISMATCH'}")
@@ -36,66 +48,34 @@ print(f"  Match status:      {'✓ MATCH' if oracle_count == sf_count else '✗
 # 2. Data Quality - Missing required fields
 print("\n[2/5] Data Quality - Required Fields")
 print("-" * 70)
-dq_query = """
-SELECT COUNT() 
-FROM Account 
-WHERE External_Id__c != null 
-AND (Name = null OR ABN__c = null)
-"""
-missing = sf.query(dq_query)['totalSize']
+missing = export.missing_any(['Name', 'ABN__c'])
 print(f"  Records with missing Name/ABN: {missing:,}")
 print(f"  Status: {'✗ ISSUES FOUND' if missing > 0 else '✓ PASS'}")
 
 # 3. Duplicate check
 print("\n[3/5] Duplicate Check")
 print("-" * 70)
-dup_query = """
-SELECT External_Id__c, COUNT(Id) cnt
-FROM Account
-WHERE External_Id__c != null
-GROUP BY External_Id__c
-HAVING COUNT(Id) > 1
-"""
-duplicates = sf.query_all(dup_query)
-dup_count = duplicates['totalSize']
+dup_count = export.duplicates('External_Id__c')
 print(f"  Duplicate External_Id__c values: {dup_count:,}")
 print(f"  Status: {'✗ DUPLICATES FOUND' if dup_count > 0 else '✓ PASS'}")
 
 # 4. Field population rates
 print("\n[4/5] Field Population Rates")
 print("-" * 70)
-fields = [
-    'ABN__c',
-    'ACN__c', 
-    'RegisteredEntityName__c',
-    'TradingAs__c',
-    'Registration_Number__c',
-    'DateEmploymentCommenced__c',
-    'Type'
-]
-
+populated = export.populated(fields)
 for field in fields:
-    try:
-        query = f"SELECT COUNT() FROM Account WHERE External_Id__c != null AND {field} != null"
-        count = sf.query(query)['totalSize']
+    if field in populated:
+        count = populated[field]
         pct = (count / sf_count * 100) if sf_count > 0 else 0
         print(f"  {field:30} {count:6,} ({pct:5.1f}%)")
-    except Exception as e:
+    else:
         print(f"  {field:30} [Field not found]")
 
 # 5. Sample records
 print("\n[5/5] Sample Records")
 print("-" * 70)
-sample_query = """
-SELECT Id, Name, External_Id__c, ABN__c, Type, CreatedDate
-FROM Account
-WHERE External_Id__c != null
-ORDER BY CreatedDate DESC
-LIMIT 5
-"""
-samples = sf.query(sample_query)
-for i, rec in enumerate(samples['records'], 1):
-    print(f"  {i}. {rec['Name'][:40]:40} | ABN: {rec.get('ABN__c', 'N/A'):15} | Type: {rec.get('Type', 'N/A')}")
+for i, rec in enumerate(export.sample(5, sort_by='CreatedDate'), 1):
+    print(f"  {i}. {rec['Name'][:40]:40} | ABN: {rec.get('ABN__c') or 'N/A':15} | Type: {rec.get('Type') or 'N/A'}")
 
 print("\n" + "=" * 70)
 print("RECONCILIATION COMPLETE")
@@ -115,5 +95,6 @@ with open(report_file, 'w') as f:
     f.write(f"Match: {'Yes' if oracle_count == sf_count else 'No'}\n")
     f.write(f"Missing Data: {missing:,}\n")
     f.write(f"Duplicates: {dup_count:,}\n")
+    f.write(f"Export: {export.path}\n")
 
 print(f"\n📝 Report saved to: {report_file}")
@@ -1,47 +1,47 @@
 """
 Generate CSV reconciliation report for SIT accounts
+Counts come from one bulk export of the Account fields (sf_reconcile), not one COUNT() per field
 """
 
 import os
 import csv
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_reconcile import ObjectExport
 from datetime import datetime
 
 # Load .env.sit
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\nGenerating CSV reconciliation report...")
 
+# One export of the checked fields; every count below is computed locally
+export = ObjectExport.load(sf, 'Account', [
+    'External_Id__c', 'ABN__c', 'ACN__c', 'RegisteredEntityName__c', 'TradingAs__c',
+    'Registration_Number__c', 'DateEmploymentCommenced__c'
+])
+
 # Get counts
 oracle_count = 53857
-sf_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null")['totalSize']
+sf_count = export.count()
 
 # Get field population
-abn_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND ABN__c != null")['totalSize']
-acn_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND ACN__c != null")['totalSize']
-reg_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND RegisteredEntityName__c != null")['totalSize']
-trading_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND TradingAs__c != null")['totalSize']
-regnum_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND Registration_Number__c != null")['totalSize']
-date_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND DateEmploymentCommenced__c != null")['totalSize']
+populated = export.populated([
+    'ABN__c', 'ACN__c', 'RegisteredEntityName__c', 'TradingAs__c',
+    'Registration_Number__c', 'DateEmploymentCommenced__c'
+])
+abn_count = populated.get('ABN__c', 0)
+acn_count = populated.get('ACN__c', 0)
+reg_count = populated.get('RegisteredEntityName__c', 0)
+trading_count = populated.get('TradingAs__c', 0)
+regnum_count = populated.get('Registration_Number__c', 0)
+date_count = populated.get('DateEmploymentCommenced__c', 0)
 
 # Check duplicates
-dup_query = """
-SELECT External_Id__c, COUNT(Id) cnt
-FROM Account
-WHERE External_Id__c != null
-GROUP BY External_Id__c
-HAVING COUNT(Id) > 1
-"""
-duplicates = sf.query_all(dup_query)['totalSize']
+duplicates = export.duplicates('External_Id__c')
 
 # Build report data
 report_data = [
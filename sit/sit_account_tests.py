@@ -1,32 +1,31 @@
 """
 Basic Data Validation Tests for SIT Environment - ACCOUNT Load
 Validates loaded Account data quality and completeness
+Checks run on one bulk export of the Account fields instead of a query per check,
+concurrently through sf_test_runner with per-test timing in the results CSV
 """
 
 import os
 import csv
 from datetime import datetime
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_reconcile import ObjectExport
+from sf_test_runner import run_tests
 
 # Load SIT environment
 load_dotenv('.env.sit')
 
-# Results tracking
-test_results = []
-
-
-def test_account_count(sf):
+def test_account_count(export):
     """Test 1: Verify Account Records Loaded"""
     print("\n" + "="*70)
     print("TEST 1: Account Record Count")
     print("="*70)
     
+    rows = []
     try:
         # Count accounts with External_Id__c (our loaded records)
-        query = "SELECT COUNT() FROM Account WHERE External_Id__c != null"
-        result = sf.query(query)
-        count = result['totalSize']
+        count = export.count()
         
         print(f"✅ Found {count:,} accounts with External_Id__c")
         
@@ -37,43 +36,35 @@ def test_account_count(sf):
             print(f"⚠️  Expected 10,000 records, found {count:,}")
             status = "WARNING"
         
-        test_results.append({
+        rows.append({
             'test': 'Account Count',
             'status': status,
             'value': count,
             'detail': f'{count:,} accounts loaded'
         })
         
-        return count
+        return rows
         
     except Exception as e:
         print(f"❌ Account count query failed: {e}")
-        test_results.append({
+        rows.append({
             'test': 'Account Count',
             'status': 'FAIL',
             'value': 0,
             'detail': str(e)
         })
-        return 0
+        return rows
 
 
-def test_sample_records(sf):
+def test_sample_records(export):
     """Test 2: Query Sample Records"""
     print("\n" + "="*70)
     print("TEST 2: Sample Record Data Quality")
     print("="*70)
     
+    rows = []
     try:
-        query = """
-            SELECT External_Id__c, Name, ABN__c, ACN__c, Phone, 
-                   Registration_Number__c, DateEmploymentCommenced__c
-            FROM Account 
-            WHERE External_Id__c != null 
-            ORDER BY External_Id__c 
-            LIMIT 5
-        """
-        result = sf.query(query)
-        records = result['records']
+        records = export.sample(5, sort_by='External_Id__c', ascending=True)
         
         print(f"✅ Retrieved {len(records)} sample records:\n")
         
@@ -88,43 +79,43 @@ def test_sample_records(sf):
             print(f"    Start Date: {rec.get('DateEmploymentCommenced__c', 'NULL')}")
             print()
         
-        test_results.append({
+        rows.append({
             'test': 'Sample Records',
             'status': 'PASS',
             'value': len(records),
             'detail': f'Retrieved {len(records)} sample records'
         })
         
-        return True
+        return rows
         
     except Exception as e:
         print(f"❌ Sample record query failed: {e}")
-        test_results.append({
+        rows.append({
             'test': 'Sample Records',
             'status': 'FAIL',
             'value': 0,
             'detail': str(e)
         })
-        return False
+        return rows
 
 
-def test_data_quality(sf):
+def test_data_quality(export):
     """Test 3: Data Quality Checks"""
     print("\n" + "="*70)
     print("TEST 3: Data Quality Validation")
     print("="*70)
     
+    rows = []
     try:
         # Check for missing required fields
+        populated = export.populated(['ABN__c', 'ACN__c'])
         checks = [
-            ("Name", "SELECT COUNT() FROM Account WHERE External_Id__c != null AND (Name = null OR Name = '')"),
-            ("ABN populated", "SELECT COUNT() FROM Account WHERE External_Id__c != null AND ABN__c != null"),
-            ("ACN populated", "SELECT COUNT() FROM Account WHERE External_Id__c != null AND ACN__c != null"),
+            ("Name", export.missing_any(['Name'])),
+            ("ABN populated", populated['ABN__c']),
+            ("ACN populated", populated['ACN__c']),
         ]
         
-        for field_name, query in checks:
-            result = sf.query(query)
-            count = result['totalSize']
+        for field_name, count in checks:
             
             if "populated" in field_name:
                 print(f"✅ {field_name}: {count:,} records")
@@ -140,24 +131,24 @@ def test_data_quality(sf):
                     status = "WARNING"
                     detail = f"{count:,} records missing"
             
-            test_results.append({
+            rows.append({
                 'test': f'Data Quality - {field_name}',
                 'status': status,
                 'value': count,
                 'detail': detail
             })
         
-        return True
+        return rows
         
     except Exception as e:
         print(f"❌ Data quality check failed: {e}")
-        test_results.append({
+        rows.append({
             'test': 'Data Quality',
             'status': 'FAIL',
             'value': 0,
             'detail': str(e)
         })
-        return False
+        return rows
 
 
 def test_picklist_fields(sf):
@@ -166,6 +157,7 @@ def test_picklist_fields(sf):
     print("TEST 4: Picklist Fields (Should be empty)")
     print("="*70)
     
+    rows = []
     try:
         query = """
             SELECT AccountSubStatus__c, BusinessEntityType__c, 
@@ -202,24 +194,24 @@ def test_picklist_fields(sf):
                 status = "WARNING"
                 detail = f"Fields populated: {', '.join(populated)}"
             
-            test_results.append({
+            rows.append({
                 'test': 'Picklist Fields',
                 'status': status,
                 'value': 4 - sum(1 for v in picklist_fields.values() if v),
                 'detail': detail
             })
         
-        return True
+        return rows
         
     except Exception as e:
         print(f"❌ Picklist field check failed: {e}")
-        test_results.append({
+        rows.append({
             'test': 'Picklist Fields',
             'status': 'FAIL',
             'value': 0,
             'detail': str(e)
         })
-        return False
+        return rows
 
 
 def main():
@@ -232,21 +224,29 @@ def main():
     
     # Connect to Salesforce
     try:
-        sf = Salesforce(
-            username=os.getenv('SF_USERNAME'),
-            password=os.getenv('SF_PASSWORD'),
-            security_token=os.getenv('SF_SECURITY_TOKEN'),
-            domain=os.getenv('SF_DOMAIN')
-        )
+        sf = get_salesforce(domain=os.getenv('SF_DOMAIN', 'login'))
         print(f"Connected to: {sf.sf_instance}\n")
     except Exception as e:
         print(f"\n❌ Cannot connect to Salesforce: {e}")
         return
     
-    # Run data validation tests
-    test_account_count(sf)
-    test_sample_records(sf)
-    test_data_quality(sf)
+    # One bulk export of the checked fields; the tests run against it locally
+    try:
+        export = ObjectExport.load(sf, 'Account', [
+            'External_Id__c', 'Name', 'ABN__c', 'ACN__c', 'Phone',
+            'Registration_Number__c', 'DateEmploymentCommenced__c'
+        ])
+    except Exception as e:
+        print(f"\n❌ Account export failed: {e}")
+        return
+    
+    # Run data validation tests concurrently; each returns its result rows
+    outcomes = run_tests([test_account_count, test_sample_records, test_data_quality], export)
+    test_results = []
+    for name, rows, seconds in outcomes:
+        if not isinstance(rows, list):
+            rows = [{'test': name, 'status': 'FAIL', 'value': 0, 'detail': str(rows)}]
+        test_results.extend(dict(row, duration_s=round(seconds, 2)) for row in rows)
     
     # Summary
     print("\n" + "="*70)
@@ -272,7 +272,7 @@ def main():
     # Save CSV summary
     csv_file = f'test_output/sit_account_test_results_{timestamp}.csv'
     with open(csv_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['test', 'status', 'value', 'detail'])
+        writer = csv.DictWriter(f, fieldnames=['test', 'status', 'value', 'detail', 'duration_s'])
         writer.writeheader()
         writer.writerows(test_results)
     
@@ -1,22 +1,23 @@
 """
 Clear all Contact address fields in Salesforce SIT
 Use this to reset addresses before reloading with new mapping
+Streams matching Contacts through Bulk API 2.0 update jobs (sf_patch)
 """
 
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_patch import patch_records
 
 load_dotenv('.env.sit')
 
+ADDRESS_FIELDS = [
+    'MailingStreet', 'MailingCity', 'MailingState', 'MailingPostalCode', 'MailingCountry',
+    'OtherStreet', 'OtherCity', 'OtherState', 'OtherPostalCode', 'OtherCountry',
+]
+
 def connect_salesforce():
     """Establish Salesforce connection"""
-    return Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain=os.getenv('SF_DOMAIN', 'test')
-    )
+    return get_salesforce()
 
 print("="*80)
 print("CLEAR CONTACT ADDRESSES")
@@ -24,65 +25,22 @@ print("="*80)
 
 sf = connect_salesforce()
 
-# Query all Contacts with addresses
-query = """
-    SELECT Id 
-    FROM Contact 
-    WHERE External_Id__c != NULL
-    AND (MailingStreet != NULL OR OtherStreet != NULL)
-"""
+# Contacts with addresses
+where = "External_Id__c != NULL AND (MailingStreet != NULL OR OtherStreet != NULL)"
 
-print(f"\nQuerying Contacts with addresses...")
-result = sf.query_all(query)
-contacts = result['records']
-print(f"Found {len(contacts):,} Contacts with addresses")
+print(f"\nClearing addresses from Contacts WHERE {where}...")
+summary = patch_records(sf, 'Contact', where, assignments={field: None for field in ADDRESS_FIELDS})
 
-if len(contacts) == 0:
+if summary['matched'] == 0:
     print("No addresses to clear.")
     exit(0)
 
-# Prepare update payload to clear addresses
-updates = []
-for contact in contacts:
-    updates.append({
-        'Id': contact['Id'],
-        'MailingStreet': None,
-        'MailingCity': None,
-        'MailingState': None,
-        'MailingPostalCode': None,
-        'MailingCountry': None,
-        'OtherStreet': None,
-        'OtherCity': None,
-        'OtherState': None,
-        'OtherPostalCode': None,
-        'OtherCountry': None
-    })
-
-# Update in batches
-print(f"\nClearing addresses from {len(updates):,} Contacts...")
-batch_size = 200
-success_count = 0
-error_count = 0
-
-for i in range(0, len(updates), batch_size):
-    batch = updates[i:i+batch_size]
-    try:
-        result = sf.bulk.Contact.update(batch)
-        for item in result:
-            if item['success']:
-                success_count += 1
-            else:
-                error_count += 1
-        
-        if (i + batch_size) % 1000 == 0:
-            print(f"  Progress: {i + batch_size:,}/{len(updates):,} ({success_count:,} success, {error_count} errors)")
-    except Exception as e:
-        print(f"  [ERROR] Batch {i}-{i+batch_size}: {e}")
-        error_count += len(batch)
-
 print("\n" + "="*80)
 print("SUMMARY")
 print("="*80)
-print(f"Successfully cleared: {success_count:,} Contacts")
-print(f"Errors: {error_count}")
+print(f"Contacts with addresses: {summary['matched']:,}")
+print(f"Successfully cleared: {summary['patched']:,} Contacts")
+print(f"Errors: {summary['failed']}")
+for failure in summary['failures'][:5]:
+    print(f"  {failure['Id']}: {failure['error']}")
 print("="*80)
@@ -3,6 +3,7 @@ SIT - Salesforce Contact Object Load
 Loads Contact records from Oracle to Salesforce SIT environment
 Links to 53,857 active employer accounts
 Creates AccountContactRelation for active employments
+Every run is journaled; after a crash, rerun with --resume to skip completed batches
 """
 
 import os
@@ -12,7 +13,17 @@ from datetime import datetime
 from dotenv import load_dotenv
 import oracledb
 import pandas as pd
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_relationships import parent_reference, save_unresolved_parents_report
+from sf_journal import (
+    LoadJournal, snapshot_id_for, save_snapshot, load_snapshot, batch_ranges, journaled_bulk_upsert
+)
+from sf_limits import get_governor
+from sf_crosswalk import Crosswalk, PARENT_PATHS
+from sf_query import BULK_THRESHOLD, lookup_map
+from sf_reconcile import ObjectExport
+from sf_validate import LoadValidator
+from sf_describe import describe_field
 
 # Load SIT environment variables
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -23,6 +34,7 @@ print(f"Using environment: {env_file}\n")
 LIMIT_ROWS = 50000  # Load 50K contacts
 BATCH_SIZE = 500
 ACTIVE_PERIOD = 202301  # Filter for employers with service >= Jan 2023
+RESUME = '--resume' in sys.argv  # Continue the last unfinished run from test_output/load_journal.sqlite
 
 # Load Field Officer mapping (Oracle code → Salesforce User ID)
 # SF Admin confirmed: Can link records with inactive users
@@ -61,59 +73,15 @@ def connect_oracle():
 def connect_salesforce():
     """Establish Salesforce connection"""
     print("[2/7] Connecting to Salesforce...")
-    sf = Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain=os.getenv('SF_DOMAIN', 'test')
-    )
+    sf = get_salesforce()
     print("      [OK] Salesforce connected")
     return sf
 
-def fetch_account_ids(sf, employer_ids):
-    """Fetch Salesforce Account Ids for given External_Id__c values"""
-    print("[3/7] Fetching Account IDs from Salesforce...")
-    
-    # Remove None values and convert to set
-    valid_employer_ids = set(str(int(x)) for x in employer_ids if pd.notna(x))
-    
-    if not valid_employer_ids:
-        print("      [WARNING] No valid employer IDs to fetch")
-        return {}
-    
-    # Query Accounts in batches (SOQL IN clause limit is 4000)
-    account_map = {}  # employer_external_id -> salesforce_account_id
-    batch_size = 2000
-    employer_list = list(valid_employer_ids)
-    
-    for i in range(0, len(employer_list), batch_size):
-        batch = employer_list[i:i+batch_size]
-        ids_str = "','" .join(batch)
-        
-        query = f"""
-            SELECT Id, External_Id__c 
-            FROM Account 
-            WHERE External_Id__c IN ('{ids_str}')
-        """
-        
-        result = sf.query(query)
-        for record in result['records']:
-            account_map[record['External_Id__c']] = record['Id']
-    
-    print(f"      [OK] Fetched {len(account_map):,} Account IDs out of {len(valid_employer_ids):,} unique employers")
-    
-    if len(account_map) < len(valid_employer_ids):
-        missing = len(valid_employer_ids) - len(account_map)
-        print(f"      [WARNING] {missing:,} employer IDs not found in Salesforce Accounts")
-    
-    return account_map
-
 def verify_external_id(sf):
-    """Verify External_Id__c is marked as External ID field"""
+    """Verify External_Id__c is marked as External ID field (cached describe)"""
     print("[4/7] Verifying External_Id__c field...")
     try:
-        contact_metadata = sf.Contact.describe()
-        external_id_field = next((f for f in contact_metadata['fields'] if f['name'] == 'External_Id__c'), None)
+        external_id_field = describe_field(sf, 'Contact', 'External_Id__c')
         
         if not external_id_field:
             print("      [ERROR] External_Id__c field not found in Contact object")
@@ -310,45 +278,65 @@ def load_gender_mappings(conn):
     
     return gender_mapping
 
-def get_existing_contacts(sf, external_ids):
-    """Query existing Contacts and their AccountIds to avoid duplicate ACR creation"""
+def lookup_existing_contacts(sf, external_ids):
+    """{contact External ID: account External ID} from the org for the given External IDs"""
+    # Small subsets: IN-list queries POSTed through the Composite API (no URL length limit)
+    # Large sets: one Bulk API 2.0 query over all migrated Contacts, streamed into the map
+    mode = 'POSTed queries' if len(external_ids) < BULK_THRESHOLD else 'one Bulk API query'
+    print(f"        Looking up {len(external_ids):,} External IDs with {mode}...")
+    return lookup_map(
+        sf, 'Contact', 'External_Id__c', 'Account.External_Id__c', external_ids,
+        where="External_Id__c != null"
+    )
+
+def get_existing_contacts(sf, external_ids, crosswalk=None):
+    """Query existing Contacts and their Account External IDs to avoid duplicate ACR creation"""
     print("[5.5/7] Checking for existing Contacts...")
     
     if len(external_ids) == 0:
         print("        [OK] No external IDs to check")
         return {}
     
-    existing_contacts = {}
-    batch_size = 500  # Reduced from 2000 to avoid URI too long error
-    external_id_list = list(external_ids)
-    
-    total_batches = (len(external_id_list) + batch_size - 1) // batch_size
-    print(f"        Querying in {total_batches} batches...")
-    
-    for i in range(0, len(external_id_list), batch_size):
-        batch = external_id_list[i:i+batch_size]
-        ids_str = "','".join(batch)
-        
-        query = f"""
-            SELECT Id, External_Id__c, AccountId
-            FROM Contact
-            WHERE External_Id__c IN ('{ids_str}')
-        """
-        
-        result = sf.query(query)
-        for record in result['records']:
-            existing_contacts[record['External_Id__c']] = record.get('AccountId')
-    
-    print(f"        [OK] Found {len(existing_contacts):,} existing Contacts")
+    if crosswalk is None:
+        existing_contacts = lookup_existing_contacts(sf, external_ids)
+        print(f"        [OK] Found {len(existing_contacts):,} existing Contacts")
+        return existing_contacts
+    
+    # Resolve from the local crosswalk; rebuild it first if it no longer matches the org
+    check = crosswalk.verify(sf, 'Contact') if crosswalk.is_backfilled('Contact') else None
+    backfilled = check is None or not check['ok']
+    if backfilled:
+        if check is not None:
+            print(f"        Crosswalk out of date (org {check['org_count']:,}, "
+                  f"local {check['local_count']:,}, {check['stale']} stale of {check['sampled']} sampled)")
+        print("        Backfilling Contact crosswalk with one Bulk API query...")
+        crosswalk.backfill(sf, 'Contact', parent_path=PARENT_PATHS['Contact'])
+    existing_contacts = crosswalk.lookup_parents('Contact', external_ids)
+    print(f"        [OK] Found {len(existing_contacts):,} existing Contacts (crosswalk)")
+    
+    # A verified crosswalk is only checked by count and sample: confirm the IDs it does not
+    # know are new in the org (e.g. Contacts created outside the loader) while that stays a
+    # few POSTed queries. A crosswalk backfilled just now already reflects the org.
+    unresolved = [e for e in external_ids if str(e) not in existing_contacts]
+    if unresolved and not backfilled:
+        if len(unresolved) >= BULK_THRESHOLD:
+            print(f"        [OK] {len(unresolved):,} Contacts not in the verified crosswalk treated as new")
+            return existing_contacts
+        found = lookup_existing_contacts(sf, unresolved)
+        if found:
+            print(f"        [WARNING] {len(found):,} existing Contacts missing from the crosswalk")
+            existing_contacts.update(found)
+        else:
+            print(f"        [OK] {len(unresolved):,} Contacts not in the crosswalk are new")
     return existing_contacts
 
-def map_to_salesforce(df, account_map, existing_contacts, language_mapping, title_mapping, gender_mapping):
+def map_to_salesforce(df, existing_contacts, language_mapping, title_mapping, gender_mapping):
     """Map Oracle columns to Salesforce Contact fields"""
     print("[6/7] Mapping Oracle data to Salesforce Contact fields...")
     
     # Mapping based on sf_contact_mapping.csv:
     # 1. Contact.External_Id__c ← CO_WORKER.CUSTOMER_ID (unique per worker - 834K unique)
-    # 2. Contact.AccountId ← Lookup Salesforce Account.Id by Account.External_Id__c = EMPLOYER_ID
+    # 2. Contact.AccountId ← Account.External_Id__c = EMPLOYER_ID (resolved by Salesforce via Account relationship)
     # 3. Contact.Birthdate ← CO_PERSON.DATE_OF_BIRTH
     # 4. Contact.Email ← CO_CUSTOMER.EMAIL_ADDRESS
     # 5. Contact.OtherPhone ← CO_CUSTOMER.TELEPHONE1_NO
@@ -370,24 +358,29 @@ def map_to_salesforce(df, account_map, existing_contacts, language_mapping, titl
     # LastName: LAST_NAME (required for Contact)
     df_mapped['LastName'] = df['LAST_NAME'].replace('', None).fillna('Unknown')  # Default to 'Unknown' if missing
     
-    # AccountId: Lookup from account_map using EMPLOYER_ID
-    # BUT: Only set AccountId if Contact is new OR AccountId is different from existing
-    def get_account_id(row):
-        external_id = str(int(row['WORKER_ID'])) if pd.notna(row['WORKER_ID']) else None
-        new_account_id = account_map.get(str(int(row['EMPLOYER_ID']))) if pd.notna(row['EMPLOYER_ID']) else None
+    # Account: relationship by External ID - {'External_Id__c': EMPLOYER_ID}
+    # Salesforce resolves AccountId server-side, so no Account Id pre-query is needed
+    # BUT: Only set Account if Contact is new OR its employer is different from existing
+    def get_account_reference(worker_id, employer_id):
+        external_id = str(int(worker_id)) if pd.notna(worker_id) else None
+        new_account = parent_reference(employer_id)
         
-        # If Contact doesn't exist, use the new AccountId
+        # If Contact doesn't exist, use the new Account reference
         if external_id not in existing_contacts:
-            return new_account_id
+            return new_account
         
-        # Contact exists - only set AccountId if it's different or NULL
-        existing_account_id = existing_contacts.get(external_id)
-        if existing_account_id == new_account_id:
-            return None  # Same AccountId - don't set it to avoid duplicate ACR error
+        # Contact exists - only set Account if it's different or NULL
+        existing_employer_id = existing_contacts.get(external_id)
+        if new_account and existing_employer_id == new_account['External_Id__c']:
+            return None  # Same Account - don't set it to avoid duplicate ACR error
         else:
-            return new_account_id  # Different AccountId - update it
+            return new_account  # Different Account - update it
     
-    df_mapped['AccountId'] = df.apply(get_account_id, axis=1)
+    # List comprehension (not df.apply) so the relationship dicts stay as cell values
+    df_mapped['Account'] = [
+        get_account_reference(worker_id, employer_id)
+        for worker_id, employer_id in zip(df['WORKER_ID'], df['EMPLOYER_ID'])
+    ]
     
     # Birthdate: DATE_OF_BIRTH (convert to ISO date string)
     df_mapped['Birthdate'] = df['DATE_OF_BIRTH'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) else None)
@@ -450,22 +443,21 @@ def map_to_salesforce(df, account_map, existing_contacts, language_mapping, titl
     df_mapped['OtherPostalCode'] = df['OTHER_POSTALCODE']
     df_mapped['OtherCountry'] = df['OTHER_COUNTRY']
     
-    accounts_found = df_mapped['AccountId'].notna().sum()
-    accounts_missing = df_mapped['AccountId'].isna().sum()
-    accounts_skipped = len([ext_id for ext_id in df_mapped['External_Id__c'] 
-                           if ext_id in existing_contacts and df_mapped[df_mapped['External_Id__c']==ext_id]['AccountId'].isna().any()])
+    accounts_found = df_mapped['Account'].notna().sum()
+    accounts_missing = df['EMPLOYER_ID'].isna().sum()
+    accounts_skipped = len(df_mapped) - accounts_found - accounts_missing
     
     field_officers_assigned = df_mapped['FieldOfficerAllocated__c'].notna().sum()
     
     print(f"      [OK] Mapped {len(df_mapped)} records with 24 fields")
-    print(f"      Fields: External_Id__c (WORKER_ID), FirstName, LastName, AccountId (Account lookup),")
+    print(f"      Fields: External_Id__c (WORKER_ID), FirstName, LastName, Account (External ID lookup),")
     print(f"              Birthdate, Email, Phone, OtherPhone, MobilePhone, LanguagePreference__c, Title, GenderIdentity,")
     print(f"              UnionDelegate__c, FieldOfficerAllocated__c (User lookup), MailingStreet, MailingCity, MailingState,")
     print(f"              MailingPostalCode, MailingCountry, OtherStreet, OtherCity, OtherState, OtherPostalCode, OtherCountry")
     print(f"      Field Officer assignments: {field_officers_assigned:,} contacts ({field_officers_assigned/len(df_mapped)*100:.1f}%)")
-    print(f"      Account lookups: {accounts_found:,} will be set")
-    print(f"      Account lookups: {accounts_skipped:,} skipped (Contact already has this AccountId)")
-    print(f"      Account lookups: {accounts_missing - accounts_skipped:,} missing (no employer in SF)")
+    print(f"      Account lookups: {accounts_found:,} will be set by Account.External_Id__c")
+    print(f"      Account lookups: {accounts_skipped:,} skipped (Contact already has this Account)")
+    print(f"      Account lookups: {accounts_missing:,} missing (no active employer in Oracle)")
     print(f"      Note: Skipped 4 fields:")
     print(f"            - RegistrationNumber__c (read-only, cannot write via API)")
     print(f"            - EmailBouncedDate (mapped to FIRST_NAME in CSV - incorrect)")
@@ -474,8 +466,15 @@ def map_to_salesforce(df, account_map, existing_contacts, language_mapping, titl
     
     return df_mapped
 
-def upsert_to_salesforce(sf, df_mapped):
-    """Upsert Contact records to Salesforce in batches"""
+def upsert_to_salesforce(sf, df_mapped, journal=None, run_id=None, crosswalk=None):
+    """
+    Upsert Contact records to Salesforce in batches
+    With a journal, each batch's Bulk job is recorded before waiting on it; completed batches
+    of a resumed run are skipped and in-flight batches are re-polled instead of resubmitted
+    With a crosswalk, every successful upsert's Id is stored against its External ID
+    Rows breaking a Contact describe rule (sf_validate) are quarantined before upload and
+    reported as errors of their batch
+    """
     print(f"[7/7] Upserting {len(df_mapped):,} Contact records to Salesforce...")
     print(f"      Batch size: {BATCH_SIZE}")
     
@@ -483,65 +482,116 @@ def upsert_to_salesforce(sf, df_mapped):
     success_count = 0
     error_count = 0
     errors = []
+    failed_batches = 0
+    batch_rows = journal.batches(run_id) if journal else {}
+    governor = get_governor(sf, priority='high')
+    print(f"      API budget: {governor.summary()}")
+    validator = LoadValidator(sf, 'Contact')
     
     for batch_num in range(total_batches):
         start_idx = batch_num * BATCH_SIZE
         end_idx = min(start_idx + BATCH_SIZE, len(df_mapped))
         batch_df = df_mapped.iloc[start_idx:end_idx]
+        batch_row = batch_rows.get(batch_num + 1)
+        
+        # Resume: batch already loaded by the previous run - reuse its journaled results
+        if batch_row is not None and batch_row['state'] == 'completed':
+            success_count += batch_row['success_count']
+            error_count += batch_row['error_count']
+            errors.extend(journal.completed_errors(batch_row))
+            continue
+        
+        # Quarantine rows that would fail server-side (length, picklist, precision, date rules)
+        batch_df, violations = validator.validate(batch_df.reset_index(drop=True))
+        quarantined = validator.quarantine_errors(violations, batch_num + 1, offset=start_idx)
         
         # Convert to list of dicts (remove None values)
         records = batch_df.to_dict('records')
         records_clean = [{k: v for k, v in record.items() if v is not None} for record in records]
         
+        # Pause here (batch stays pending in the journal) if the daily API/Bulk budget runs low
+        governor.checkpoint('api', 'bulk')
+        
         try:
             # UPSERT using Bulk API (use serial processing to avoid threading timeouts)
-            result = sf.bulk.Contact.upsert(records_clean, 'External_Id__c', batch_size=BATCH_SIZE, use_serial=True)
+            if not records:
+                result = []
+            elif journal:
+                result = journaled_bulk_upsert(sf, 'Contact', records_clean, 'External_Id__c',
+                                               journal, run_id, batch_num + 1, batch_row)
+            else:
+                result = sf.bulk.Contact.upsert(records_clean, 'External_Id__c', batch_size=BATCH_SIZE, use_serial=True)
+            
+            if crosswalk is not None:
+                crosswalk.record_results('Contact', records_clean, result, parent_field='Account')
             
             # Count successes and errors
             batch_success = sum(1 for r in result if r.get('success'))
             batch_errors = len(result) - batch_success
             
             success_count += batch_success
-            error_count += batch_errors
+            error_count += batch_errors + len(quarantined)
             
             # Collect errors
+            batch_error_list = list(quarantined)
             for idx, res in enumerate(result):
                 if not res.get('success'):
-                    errors.append({
+                    batch_error_list.append({
                         'batch': batch_num + 1,
-                        'index': start_idx + idx,
+                        'index': start_idx + int(batch_df.index[idx]),
                         'external_id': records[idx].get('External_Id__c', 'UNKNOWN'),
                         'error': str(res.get('errors', 'Unknown error'))
                     })
+            errors.extend(batch_error_list)
+            
+            if journal:
+                journal.mark_completed(run_id, batch_num + 1, batch_success, batch_error_list)
         
         except Exception as e:
             # If entire batch fails, mark all as errors
-            error_count += len(records)
+            error_count += len(records) + len(quarantined)
+            failed_batches += 1
+            errors.extend(quarantined)
             for idx, record in enumerate(records):
                 errors.append({
                     'batch': batch_num + 1,
-                    'index': start_idx + idx,
+                    'index': start_idx + int(batch_df.index[idx]),
                     'external_id': record.get('External_Id__c', 'UNKNOWN'),
                     'error': str(e)
                 })
+            
+            if journal:
+                journal.mark_failed(run_id, batch_num + 1, e)
         
         # Progress indicator
         if (batch_num + 1) % 10 == 0 or (batch_num + 1) == total_batches:
             print(f"      Progress: {batch_num + 1}/{total_batches} batches " +
                   f"({success_count:,} success, {error_count:,} errors)")
     
+    if journal:
+        if failed_batches:
+            journal.finish_run(run_id, 'incomplete')
+            print(f"\n      [WARNING] {failed_batches} batches failed - rerun with --resume to retry them")
+        else:
+            journal.finish_run(run_id, 'completed')
+    
     print(f"\n      [OK] Upsert completed")
     print(f"      Success: {success_count:,} records")
     print(f"      Errors:  {error_count:,} records")
+    print(f"      Pre-load validation: {validator.summary()}")
+    quarantine_file = validator.save()
+    if quarantine_file:
+        print(f"      Quarantined rows saved to: {quarantine_file}")
     
     return success_count, error_count, errors
 
-def save_errors(errors):
-    """Save errors to CSV file"""
+def save_errors(errors, run_id=None):
+    """Save errors to CSV file (with the journal run_id, so sit_retry_errors.py uses this run's snapshot)"""
     if errors:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         error_file = f'error/sit_contact_errors_{timestamp}.csv'
         df_errors = pd.DataFrame(errors)
+        df_errors['run_id'] = run_id
         df_errors.to_csv(error_file, index=False)
         print(f"      Error details saved to: {error_file}")
         return error_file
@@ -556,11 +606,13 @@ def reconcile_data(sf, df_oracle, success_count, error_count, error_file):
     
     reconciliation = []
     
+    # One export of the loaded Contacts; the Contact checks below run locally on it
+    export = ObjectExport.load(sf, 'Contact', ['External_Id__c', 'FirstName', 'LastName', 'AccountId'])
+    
     # Step 1: Record Counts
     print(f"      Step 1/5: Comparing record counts...")
     oracle_count = len(df_oracle)
-    sf_result = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != NULL")
-    sf_count = sf_result['totalSize']
+    sf_count = export.count()
     
     reconciliation.append({
         'Check': 'Record Count',
@@ -572,12 +624,7 @@ def reconcile_data(sf, df_oracle, success_count, error_count, error_file):
     
     # Step 2: Data Quality Checks
     print(f"      Step 2/5: Checking data quality...")
-    sf_result = sf.query("""
-        SELECT COUNT() FROM Contact 
-        WHERE External_Id__c != NULL 
-        AND (FirstName = NULL OR LastName = NULL)
-    """)
-    missing_names = sf_result['totalSize']
+    missing_names = export.missing_any(['FirstName', 'LastName'])
     
     reconciliation.append({
         'Check': 'Name Completeness',
@@ -589,11 +636,7 @@ def reconcile_data(sf, df_oracle, success_count, error_count, error_file):
     
     # Step 3: Account Linkage
     print(f"      Step 3/5: Verifying Account linkage...")
-    sf_result = sf.query("""
-        SELECT COUNT() FROM Contact 
-        WHERE External_Id__c != NULL AND AccountId != NULL
-    """)
-    linked_contacts = sf_result['totalSize']
+    linked_contacts = export.populated(['AccountId'])['AccountId']
     
     reconciliation.append({
         'Check': 'Account Linkage',
@@ -622,19 +665,13 @@ def reconcile_data(sf, df_oracle, success_count, error_count, error_file):
     # Step 5: Sample Data Comparison
     print(f"      Step 5/5: Sampling data for comparison...")
     sample_ids = df_oracle['WORKER_ID'].head(5).astype(str).tolist()
-    id_list = "','".join(sample_ids)
-    
-    sf_result = sf.query(f"""
-        SELECT External_Id__c, FirstName, LastName, Email, Account.Name
-        FROM Contact 
-        WHERE External_Id__c IN ('{id_list}')
-    """)
+    found_samples = len(export.where_in('External_Id__c', sample_ids))
     
     reconciliation.append({
         'Check': 'Sample Records',
         'Oracle_Value': f'{len(sample_ids)} sample IDs',
-        'Salesforce_Value': f'{len(sf_result["records"])} found in SF',
-        'Match': 'Yes' if len(sf_result["records"]) == len(sample_ids) else 'No',
+        'Salesforce_Value': f'{found_samples} found in SF',
+        'Match': 'Yes' if found_samples == len(sample_ids) else 'No',
         'Notes': f'Sample External IDs: {", ".join(sample_ids[:3])}'
     })
     
@@ -661,48 +698,78 @@ def main():
     print("="*80 + "\n")
     
     try:
-        # Connect to systems
-        conn = connect_oracle()
-        sf = connect_salesforce()
-        
-        # Extract Oracle data
-        df = extract_oracle_data(conn)
-        
-        # Load language code mappings
-        language_mapping = load_language_code_mappings(conn)
-        
-        # Load title code mappings
-        title_mapping = load_title_mappings(conn)
+        journal = LoadJournal()
+        crosswalk = Crosswalk()
+        run = journal.latest_unfinished_run('Contact') if RESUME else None
         
-        # Load gender code mappings
-        gender_mapping = load_gender_mappings(conn)
+        if RESUME and run is None:
+            print("[WARNING] --resume: no unfinished Contact run in the journal, starting a new run\n")
         
-        # Fetch Account IDs from Salesforce
-        account_map = fetch_account_ids(sf, df['EMPLOYER_ID'])
-        
-        # Verify External ID field
-        if not verify_external_id(sf):
-            print("\n[WARNING] External_Id__c verification failed")
-            print("          Continuing anyway, but check field configuration\n")
-        
-        # Get existing Contacts to avoid duplicate ACR creation
-        external_ids = df['WORKER_ID'].apply(lambda x: str(int(x)) if pd.notna(x) else None).dropna().unique()
-        existing_contacts = get_existing_contacts(sf, external_ids)
-        
-        # Transform data
-        df_mapped = map_to_salesforce(df, account_map, existing_contacts, language_mapping, title_mapping, gender_mapping)
+        conn = None
+        if run is not None:
+            # Resume: reuse the journaled extract snapshot instead of re-extracting
+            print(f"[RESUME] Run {run['run_id']} (snapshot {run['snapshot_id']})")
+            sf = connect_salesforce()
+            snapshot = load_snapshot(run['snapshot_path'])
+            df, df_mapped = snapshot['extract'], snapshot['mapped']
+            run_id = run['run_id']
+            states = [row['state'] for row in journal.batches(run_id).values()]
+            print(f"      Batches: {states.count('completed')} completed, "
+                  f"{states.count('submitted')} in flight, "
+                  f"{len(states) - states.count('completed') - states.count('submitted')} to submit\n")
+        else:
+            # Connect to systems
+            conn = connect_oracle()
+            sf = connect_salesforce()
+            
+            # Extract Oracle data
+            df = extract_oracle_data(conn)
+            
+            # Load language code mappings
+            language_mapping = load_language_code_mappings(conn)
+            
+            # Load title code mappings
+            title_mapping = load_title_mappings(conn)
+            
+            # Load gender code mappings
+            gender_mapping = load_gender_mappings(conn)
+            
+            # Verify External ID field
+            if not verify_external_id(sf):
+                print("\n[WARNING] External_Id__c verification failed")
+                print("          Continuing anyway, but check field configuration\n")
+            
+            # Get existing Contacts to avoid duplicate ACR creation
+            external_ids = df['WORKER_ID'].apply(lambda x: str(int(x)) if pd.notna(x) else None).dropna().unique()
+            existing_contacts = get_existing_contacts(sf, external_ids, crosswalk)
+            
+            # Transform data
+            df_mapped = map_to_salesforce(df, existing_contacts, language_mapping, title_mapping, gender_mapping)
+            
+            # Journal the run: extract snapshot + batch key ranges
+            snapshot_id = snapshot_id_for(df_mapped, 'External_Id__c')
+            snapshot_path = save_snapshot({'extract': df, 'mapped': df_mapped}, 'Contact', snapshot_id)
+            run_id = journal.start_run('Contact', snapshot_id, snapshot_path,
+                                       batch_ranges(df_mapped, 'External_Id__c', BATCH_SIZE))
+            print(f"      [OK] Journal run {run_id} (snapshot {snapshot_id})")
         
         # Load to Salesforce
-        success_count, error_count, errors = upsert_to_salesforce(sf, df_mapped)
+        success_count, error_count, errors = upsert_to_salesforce(sf, df_mapped, journal, run_id, crosswalk)
+        journal.close()
+        crosswalk.close()
         
         # Save errors if any
-        error_file = save_errors(errors)
+        error_file = save_errors(errors, run_id)
+        
+        # Fallback report for employers that Salesforce could not resolve
+        save_unresolved_parents_report(errors, 'Contact')
         
         # Reconciliation
         recon_file = reconcile_data(sf, df, success_count, error_count, error_file)
         
         # Close Oracle connection
-        conn.close()
+        if conn is not None:
+            conn.close()
         
         # Summary
         print("\n" + "="*80)
@@ -2,6 +2,7 @@
 SIT - Salesforce Contact Object Tests
 Validates Contact data quality in SIT environment
 Tests: count, samples, data quality, account linkage, ACR relationships
+Tests run concurrently; identical queries are sent once per run (sf_test_runner)
 """
 
 import os
@@ -9,7 +10,8 @@ import sys
 import csv
 from datetime import datetime
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_test_runner import QueryCache, run_tests
 import pandas as pd
 
 # Load SIT environment
@@ -24,12 +26,7 @@ print("="*70)
 def connect_salesforce():
     """Connect to Salesforce SIT"""
     print("\nConnecting to Salesforce SIT...")
-    sf = Salesforce(
-        username=os.getenv('SF_USERNAME'),
-        password=os.getenv('SF_PASSWORD'),
-        security_token=os.getenv('SF_SECURITY_TOKEN'),
-        domain=os.getenv('SF_DOMAIN', 'test')
-    )
+    sf = get_salesforce()
     print("[OK] Connected")
     return sf
 
@@ -373,14 +370,22 @@ def save_results(results):
 def main():
     """Run all tests"""
     try:
-        sf = connect_salesforce()
-        
-        results = []
-        results.append(test_contact_count(sf))
-        results.append(test_sample_records(sf))
-        results.append(test_data_quality(sf))
-        results.append(test_account_linkage(sf))
-        results.append(test_acr_relationships(sf))
+        sf = QueryCache(connect_salesforce())
+        
+        outcomes = run_tests([
+            test_contact_count,
+            test_sample_records,
+            test_data_quality,
+            test_account_linkage,
+            test_acr_relationships,
+        ], sf)
+        results = [
+            dict(result, Duration_s=round(seconds, 2)) if isinstance(result, dict)
+            else {'Test': name, 'Status': 'ERROR', 'Expected': 'N/A', 'Actual': 0,
+                  'Message': str(result), 'Duration_s': round(seconds, 2)}
+            for name, result, seconds in outcomes
+        ]
+        print(f"\nQueries: {sf.misses} sent, {sf.hits} served from the run cache")
         
         # Save results
         output_file = save_results(results)
@@ -5,7 +5,8 @@ Removes the 10,000 test accounts loaded previously
 
 from dotenv import load_dotenv
 import os
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_extract import extract
 
 # Load SIT environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -18,12 +19,7 @@ print("="*70)
 
 # Connect to Salesforce
 print("\n[1/4] Connecting to Salesforce SIT...")
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 print("      [OK] Connected")
 
 # Count existing accounts
@@ -47,15 +43,7 @@ if response != 'DELETE':
 
 # Fetch all account IDs
 print("\n[3/4] Fetching Account IDs...")
-account_ids = []
-query = "SELECT Id FROM Account WHERE External_Id__c != null"
-result = sf.query(query)
-
-while True:
-    account_ids.extend([rec['Id'] for rec in result['records']])
-    if result['done']:
-        break
-    result = sf.query_more(result['nextRecordsUrl'], identifier_is_url=True)
+account_ids = extract(sf, 'Account', ['Id'], "External_Id__c != null")['Id'].tolist()
 
 print(f"      Retrieved {len(account_ids):,} Account IDs")
 
@@ -1,12 +1,15 @@
 """
 SIT - Delete existing test Account records (using standard API)
 Removes the 10,000 test accounts loaded previously
-Uses standard REST API instead of Bulk API for reliability
+Uses 200-record sObject Collections deletes (parallel) instead of Bulk API for reliability
+For a full child-first org reset use sit_purge_org.py
 """
 
 from dotenv import load_dotenv
 import os
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_extract import extract
+from sf_purge import delete_ids
 
 # Load SIT environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -18,25 +21,12 @@ print("="*70)
 
 # Connect to Salesforce
 print("\n[1/3] Connecting to Salesforce SIT...")
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 print("      [OK] Connected")
 
 # Fetch all account IDs
 print("\n[2/3] Fetching Account IDs...")
-account_ids = []
-query = "SELECT Id FROM Account WHERE External_Id__c != null"
-result = sf.query(query)
-
-while True:
-    account_ids.extend([rec['Id'] for rec in result['records']])
-    if result['done']:
-        break
-    result = sf.query_more(result['nextRecordsUrl'], identifier_is_url=True)
+account_ids = extract(sf, 'Account', ['Id'], "External_Id__c != null")['Id'].tolist()
 
 print(f"      Retrieved {len(account_ids):,} Account IDs")
 
@@ -44,37 +34,12 @@ if len(account_ids) == 0:
     print("\n[OK] No accounts to delete - already clean!")
     exit(0)
 
-# Delete using composite API (faster, more reliable)
+# Delete using sObject Collections (200 IDs per call, 4 calls in parallel)
 print(f"\n[3/3] Deleting {len(account_ids):,} accounts...")
-print("      Using Composite API in batches of 200...")
-
-BATCH_SIZE = 200
-deleted_count = 0
-error_count = 0
-errors = []
+print("      Using sObject Collections in batches of 200...")
 
-for i in range(0, len(account_ids), BATCH_SIZE):
-    batch = account_ids[i:i+BATCH_SIZE]
-    batch_num = (i // BATCH_SIZE) + 1
-    total_batches = (len(account_ids) + BATCH_SIZE - 1) // BATCH_SIZE
-    
-    try:
-        # Delete using REST API (one at a time in batch)
-        for account_id in batch:
-            try:
-                sf.Account.delete(account_id)
-                deleted_count += 1
-            except Exception as e:
-                error_count += 1
-                errors.append({'id': account_id, 'error': str(e)})
-        
-        # Progress every 10 batches or at end
-        if batch_num % 10 == 0 or batch_num == total_batches:
-            print(f"      Progress: {batch_num}/{total_batches} batches ({deleted_count:,} deleted, {error_count} errors)")
-            
-    except Exception as e:
-        print(f"      [ERROR] Batch {batch_num} failed: {e}")
-        error_count += len(batch)
+deleted_count, errors = delete_ids(sf, 'Account', account_ids, mode='collections')
+error_count = len(errors)
 
 # Verify deletion
 print("\n[VERIFY] Checking remaining accounts...")
@@ -92,7 +57,7 @@ print(f"Remaining:          {remaining:,}")
 if error_count > 0 and len(errors) <= 10:
     print(f"\nSample errors:")
     for err in errors[:10]:
-        print(f"  {err['id']}: {err['error']}")
+        print(f"  {err['Id']}: {err['error']}")
 
 if remaining == 0:
     print("\n✅ [SUCCESS] All accounts deleted successfully!")
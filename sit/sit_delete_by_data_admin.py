@@ -1,39 +1,29 @@
 """
 Delete SIT accounts created by 'Data admin' user
-Uses REST API for reliable deletion
+Uses 200-record sObject Collections deletes (parallel) for reliable deletion
 """
 
 import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_purge import delete_ids
+from sf_extract import extract
 from datetime import datetime
 
 # Load .env.sit
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\nUsing environment: .env.sit")
 print("SIT Account Deletion - Data Admin Creator")
 print("=" * 50)
 
 # Query for accounts created by 'Data admin'
-query = """
-SELECT Id, Name, External_Id__c, CreatedBy.Name, CreatedDate
-FROM Account
-WHERE CreatedBy.Name = 'Data admin'
-ORDER BY CreatedDate DESC
-"""
-
 print(f"\nQuerying accounts created by 'Data admin'...")
-result = sf.query_all(query)
-total = result['totalSize']
+accounts = extract(sf, 'Account', ['Id', 'Name'], "CreatedBy.Name = 'Data admin'")
+total = len(accounts)
 
 print(f"✅ Found {total:,} accounts")
 
@@ -48,29 +38,18 @@ if confirmation != 'DELETE':
     print("❌ Deletion cancelled")
     exit()
 
-# Delete accounts using REST API (one at a time)
+# Delete accounts using sObject Collections (200 per call, 4 calls in parallel)
 print(f"\n🔄 Deleting {total:,} accounts...")
-print("(This may take a while - REST API processes one at a time)")
-
-deleted = 0
-errors = 0
-error_log = []
 
-for record in result['records']:
-    try:
-        sf.Account.delete(record['Id'])
-        deleted += 1
-        if deleted % 100 == 0:
-            print(f"Progress: {deleted:,}/{total:,} deleted ({deleted*100//total}%)")
-    except Exception as e:
-        errors += 1
-        error_log.append({
-            'Id': record['Id'],
-            'Name': record.get('Name'),
-            'Error': str(e)
-        })
-        if errors <= 10:  # Print first 10 errors
-            print(f"❌ Error deleting {record.get('Name')}: {e}")
+names = dict(zip(accounts['Id'], accounts['Name']))
+deleted, failures = delete_ids(sf, 'Account', list(names), mode='collections')
+errors = len(failures)
+error_log = [
+    {'Id': failure['Id'], 'Name': names.get(failure['Id']), 'Error': failure['error']}
+    for failure in failures
+]
+for entry in error_log[:10]:  # Print first 10 errors
+    print(f"❌ Error deleting {entry['Name']}: {entry['Error']}")
 
 print(f"\n{'='*50}")
 print(f"✅ Deleted: {deleted:,}")
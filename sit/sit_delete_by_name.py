@@ -3,21 +3,15 @@ Delete SIT Accounts by Creator Name
 Filters accounts where CreatedBy.Name contains 'Anvesh'
 """
 
-import os
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
 from datetime import datetime
 
 # Load environment
 load_dotenv('.env.sit')
 
 # Connect
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("=" * 80)
 print("SIT Account Deletion - By Creator Name")
@@ -1,18 +1,13 @@
 """
 Delete LONG SERVICE LEAVE CREDITS (External_Id: 23000) from Salesforce SIT
 """
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
 from dotenv import load_dotenv
 import os
 
 load_dotenv('.env.sit')
 
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN')
-)
+sf = get_salesforce(domain=os.getenv('SF_DOMAIN', 'login'))
 
 print("="*80)
 print("DELETING LONG SERVICE LEAVE CREDITS (External_Id: 23000)")
@@ -0,0 +1,175 @@
+"""
+SIT - Full field-level verification of a load
+Diffs every record of the latest journaled load snapshot (the mapped payload sent to
+Salesforce, with parent references the loader omitted rebuilt - see sf_diff) against a fresh Salesforce export, joined on External_Id__c, and reports
+missing, extra and mismatched records with mismatch counts per field.
+
+The Salesforce side is extracted in parallel Id ranges to Parquet parts and both sides
+are compared bucket by bucket (sf_diff), so memory stays bounded at full volume.
+
+--sample is the fast post-load check: a stratified random sample (employer size x state
+x load batch) is fetched with a few POSTed queries and compared, and the mismatch rate of
+the whole load is estimated with a 95% confidence interval (sf_sampling). --escalate
+runs the full diff when the interval's upper bound exceeds ESCALATE_RATE.
+
+Usage:
+    python sit_diff_load.py Contact
+    python sit_diff_load.py Account --fields=Name,ABN__c,ACN__c      # subset of fields
+    python sit_diff_load.py Contact --sample                         # DEFAULT_SAMPLE records
+    python sit_diff_load.py Contact --sample=2000 --escalate
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from datetime import datetime
+from dotenv import load_dotenv
+import pandas as pd
+from sf_session import get_salesforce
+from sf_journal import LoadJournal, load_snapshot
+from sf_limits import get_governor
+from sf_extract import extract
+from sf_reconcile import existing_fields
+from sf_diff import KEY_FIELD, diff, expected_state, flatten_references, frame_chunks, parquet_chunks
+from sf_sampling import DEFAULT_SAMPLE, add_strata, sample_check
+
+# Load SIT environment variables
+env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
+load_dotenv(env_file)
+print(f"Using environment: {env_file}\n")
+
+ESCALATE_RATE = 0.02    # Full diff when the sampled mismatch rate could exceed 2%
+
+def get_option(name, default=None):
+    """Value of a --name=value command line option"""
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return arg.split('=', 1)[1]
+    return default
+
+def run_sample_check(sf, object_name, df_mapped, fields, batch_sizes, sample_size):
+    """Stratified sample comparison; returns True when escalation to a full diff is advised"""
+    print(f"[3/4] Sampling {sample_size:,} records...")
+    df = add_strata(df_mapped, object_name, batch_sizes)
+    start_time = datetime.now()
+    result = sample_check(sf, object_name, df, fields, sample_size)
+    duration = (datetime.now() - start_time).total_seconds()
+
+    overall = result['overall']
+    print("\n" + "=" * 80)
+    print("SAMPLE CHECK SUMMARY")
+    print("=" * 80)
+    print(f"Sampled:             {result['sampled']:,} records in {result['strata']:,} strata")
+    print(f"Missing in SF:       {result['missing']:,}")
+    print(f"Mismatched records:  {overall['mismatched']:,}")
+    print(f"Estimated mismatch rate: {overall['rate']:.3%} "
+          f"(95% CI {overall['low']:.3%} - {overall['high']:.3%})")
+    flagged = {f: r for f, r in result['per_field'].items() if r['mismatched']}
+    if flagged:
+        print("\nFields with mismatches in the sample:")
+        for field, r in sorted(flagged.items(), key=lambda item: -item[1]['rate']):
+            print(f"  {field:<35} {r['rate']:>8.3%}  (CI {r['low']:.3%} - {r['high']:.3%})")
+    print(f"\nDuration: {duration:.1f} seconds")
+
+    if not result['mismatches'].empty:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        mismatch_file = f'test_output/sit_{object_name.lower()}_sample_mismatches_{timestamp}.csv'
+        os.makedirs('test_output', exist_ok=True)
+        result['mismatches'].to_csv(mismatch_file, index=False)
+        print(f"Sample mismatches saved to: {mismatch_file}")
+
+    return overall['high'] > ESCALATE_RATE
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+    object_name = args[0]
+
+    print("=" * 80)
+    print(f"SIT: Field-level diff - Oracle snapshot vs Salesforce {object_name}")
+    print("=" * 80 + "\n")
+
+    # 1. Oracle side: the mapped payload of the latest journaled load
+    journal = LoadJournal()
+    run = journal.latest_run(object_name)
+    if run is None:
+        print(f"[ERROR] No journaled {object_name} run in the load journal")
+        sys.exit(1)
+    print(f"[1/4] Snapshot: {run['snapshot_path']} (run {run['run_id']})")
+    df_mapped = expected_state(load_snapshot(run['snapshot_path']), object_name)
+    batch_sizes = [row['record_count'] for row in journal.batches(run['run_id']).values()]
+    snapshot_fields = list(flatten_references(df_mapped.head(1000)).columns)
+    journal.close()
+    print(f"      {len(df_mapped):,} records, {len(snapshot_fields)} fields")
+
+    # 2. Fields to compare: mapped fields that exist on the object
+    sf = get_salesforce()
+    requested = get_option('fields')
+    fields = [KEY_FIELD] + [f for f in (requested.split(',') if requested else snapshot_fields) if f != KEY_FIELD]
+    fields, missing_fields = existing_fields(sf, object_name, fields)
+    for field in missing_fields:
+        print(f"      [WARNING] {object_name}.{field} not found - not compared")
+    print(f"[2/4] Comparing {len(fields) - 1} fields")
+
+    sample = get_option('sample') or ('--sample' in sys.argv and DEFAULT_SAMPLE)
+    if sample:
+        escalate = run_sample_check(sf, object_name, df_mapped, fields, batch_sizes, int(sample))
+        if not escalate:
+            print("\n[SUCCESS] Sample within tolerance")
+            return
+        if '--escalate' not in sys.argv:
+            print(f"\n[WARNING] Mismatch rate may exceed {ESCALATE_RATE:.1%} - rerun without --sample "
+                  f"(or add --escalate) for a full diff")
+            sys.exit(1)
+        print(f"\n[ESCALATE] Mismatch rate may exceed {ESCALATE_RATE:.1%} - running the full diff\n")
+
+    # 3. Salesforce side: parallel export straight to Parquet parts
+    print(f"[3/4] Exporting Salesforce {object_name}...")
+    export_dir = tempfile.mkdtemp(prefix=f'sf_export_{object_name.lower()}_')
+    try:
+        parts = extract(sf, object_name, fields, f"{KEY_FIELD} != null", parquet_dir=export_dir,
+                        governor=get_governor(sf))
+
+        # 4. Diff bucket by bucket
+        print("[4/4] Diffing...")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = f'test_output/sit_{object_name.lower()}_diff_{timestamp}'
+        start_time = datetime.now()
+        summary = diff(frame_chunks(df_mapped), parquet_chunks(parts), fields, output_dir=output_dir)
+        duration = (datetime.now() - start_time).total_seconds()
+    finally:
+        shutil.rmtree(export_dir, ignore_errors=True)
+
+    print("\n" + "=" * 80)
+    print("DIFF SUMMARY")
+    print("=" * 80)
+    print(f"Oracle records:      {summary['oracle']:,}")
+    print(f"Salesforce records:  {summary['salesforce']:,}")
+    print(f"Matched:             {summary['matched']:,}")
+    print(f"Missing in SF:       {summary['missing']:,}")
+    print(f"Extra in SF:         {summary['extra']:,}")
+    print(f"Mismatched records:  {summary['mismatched_records']:,}")
+    if summary['duplicate_keys']:
+        print(f"[WARNING] {summary['duplicate_keys']:,} duplicate External IDs (last one compared)")
+    if summary['per_field']:
+        print("\nMismatches per field:")
+        for field, count in sorted(summary['per_field'].items(), key=lambda item: -item[1]):
+            print(f"  {field:<35} {count:>10,}")
+
+    per_field_file = os.path.join(output_dir, 'per_field.csv')
+    pd.DataFrame(
+        [{'field': f, 'mismatches': summary['per_field'].get(f, 0)} for f in fields if f != KEY_FIELD]
+    ).to_csv(per_field_file, index=False)
+    print(f"\nDuration: {duration:.1f} seconds")
+    print(f"Reports saved to: {output_dir}")
+
+    if summary['missing'] or summary['extra'] or summary['mismatched_records']:
+        print("\n[WARNING] Differences found - see the report files")
+        sys.exit(1)
+    print("\n[SUCCESS] Salesforce matches the Oracle snapshot field for field")
+
+if __name__ == "__main__":
+    main()
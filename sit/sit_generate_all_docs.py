@@ -6,24 +6,24 @@ Generates all deliverables in one run:
 - Reconciliation report CSV
 - Test results CSV
 - Field type analysis (read-only vs new fields)
+
+Builds are incremental (sf_docbuild): a section is only regenerated when its inputs -
+the Account data version in the org, the mapping list or this script - changed since
+the last run; otherwise the previous file is reused. Use --force to rebuild everything.
 """
 
 import os
 import csv
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_docbuild import DocBuild
 from datetime import datetime
 
 # Load .env.sit
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\n" + "="*70)
 print("SIT ACCOUNT LOAD - COMPLETE DOCUMENTATION GENERATOR")
@@ -35,6 +35,7 @@ print("="*70 + "\n")
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 os.makedirs('test_output', exist_ok=True)
 os.makedirs('mappings', exist_ok=True)
+build = DocBuild('account_docs', sf, __file__)
 
 # ============================================================================
 # 1. GENERATE ACCOUNT MAPPING CSV
@@ -368,260 +369,277 @@ mappings = [
     }
 ]
 
-mapping_file = f'mappings/SIT_ACCOUNT_MAPPING_{timestamp}.csv'
-with open(mapping_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=[
-        'Oracle_Table', 'Oracle_Field', 'Oracle_Type',
-        'SF_Object', 'SF_Field', 'SF_Type',
-        'Transformation', 'Sample_Values', 'Notes', 'Field_Type'
-    ])
-    writer.writeheader()
-    writer.writerows(mappings)
-
-print(f"   ✅ Saved: {mapping_file}")
-print(f"      Total mappings: {len(mappings)}")
+mapping_section = build.section('mapping', build.value(mappings))
+if mapping_section.stale:
+    mapping_file = f'mappings/SIT_ACCOUNT_MAPPING_{timestamp}.csv'
+    with open(mapping_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            'Oracle_Table', 'Oracle_Field', 'Oracle_Type',
+            'SF_Object', 'SF_Field', 'SF_Type',
+            'Transformation', 'Sample_Values', 'Notes', 'Field_Type'
+        ])
+        writer.writeheader()
+        writer.writerows(mappings)
+
+    print(f"   ✅ Saved: {mapping_file}")
+    print(f"      Total mappings: {len(mappings)}")
+    mapping_section.done(mapping_file)
+mapping_file, = mapping_section.outputs
 
 # ============================================================================
 # 2. GENERATE SAMPLE RECORDS (10 accounts)
 # ============================================================================
 print("\n[2/5] Generating Sample Records (10 accounts)...")
 
-sample_query = """
-SELECT External_Id__c, Name, ABN__c, ACN__c, 
-       RegisteredEntityName__c, TradingAs__c, 
-       Registration_Number__c, DateEmploymentCommenced__c, Type,
-       RegisteredOfficeAddress__c,
-       ABNRegistrationDate__c, AccountStatus__c, OSCACode__c,
-       NumberOfEmployees, OwnersPerformCoveredWork__c, BusinessEmail__c
-FROM Account
-WHERE External_Id__c != null 
-  AND ABNRegistrationDate__c != null
-ORDER BY CreatedDate DESC
-LIMIT 10
-"""
-
-samples = sf.query(sample_query)
-sample_file = f'test_output/sit_account_samples_{timestamp}.txt'
-
-with open(sample_file, 'w', encoding='utf-8') as f:
-    f.write("SIT ACCOUNT LOAD - SAMPLE RECORDS (with SQL Server ABR enrichment)\n")
-    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write(f"Total Accounts in SIT: {sf.query('SELECT COUNT() FROM Account WHERE External_Id__c != null')['totalSize']:,}\n")
-    f.write(f"With SQL Server data: {sf.query('SELECT COUNT() FROM Account WHERE External_Id__c != null AND ABNRegistrationDate__c != null')['totalSize']:,}\n")
-    f.write("="*80 + "\n\n")
+# One export of every documented field; samples, population rates and checks below
+# are all computed locally from it, exported only when a section has to be rebuilt
+mapped_fields = [m['SF_Field'] for m in mappings if m['SF_Field'].replace('_', '').isalnum()]
+export_fields = mapped_fields + ['RegisteredOfficeAddress__c', 'CreatedDate']
+account_inputs = (build.object('Account'), build.value(mappings))
+
+samples_section = build.section('samples', *account_inputs)
+if samples_section.stale:
+    export = build.export('Account', export_fields)
+
+    samples = export.sample(10, populated='ABNRegistrationDate__c', sort_by='CreatedDate')
+    sample_file = f'test_output/sit_account_samples_{timestamp}.txt'
+
+    with open(sample_file, 'w', encoding='utf-8') as f:
+        f.write("SIT ACCOUNT LOAD - SAMPLE RECORDS (with SQL Server ABR enrichment)\n")
+        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Total Accounts in SIT: {export.count():,}\n")
+        f.write(f"With SQL Server data: {export.populated(['ABNRegistrationDate__c']).get('ABNRegistrationDate__c', 0):,}\n")
+        f.write("="*80 + "\n\n")
     
-    for i, rec in enumerate(samples['records'], 1):
-        f.write(f"SAMPLE RECORD {i}\n")
-        f.write("-"*80 + "\n")
-        f.write(f"External_Id__c:               {rec.get('External_Id__c', 'NULL')}\n")
-        f.write(f"Name:                         {rec.get('Name', 'NULL')}\n")
-        f.write(f"ABN__c:                       {rec.get('ABN__c', 'NULL')}\n")
-        f.write(f"ACN__c:                       {rec.get('ACN__c', 'NULL')}\n")
-        f.write(f"RegisteredEntityName__c:      {rec.get('RegisteredEntityName__c', 'NULL')}\n")
-        f.write(f"TradingAs__c:                 {rec.get('TradingAs__c', 'NULL')}\n")
-        f.write(f"Registration_Number__c:       {rec.get('Registration_Number__c', 'NULL')}\n")
-        f.write(f"RegisteredOfficeAddress__c:   {rec.get('RegisteredOfficeAddress__c', 'NULL')}\n")
-        f.write(f"DateEmploymentCommenced__c:   {rec.get('DateEmploymentCommenced__c', 'NULL')}\n")
-        f.write(f"Type:                         {rec.get('Type', 'NULL')}\n")
-        f.write(f"\n-- New Fields (Feb 6, 2026) --\n")
-        f.write(f"NumberOfEmployees:            {rec.get('NumberOfEmployees', 'NULL')}\n")
-        f.write(f"OwnersPerformCoveredWork__c:  {rec.get('OwnersPerformCoveredWork__c', 'NULL')}\n")
-        f.write(f"BusinessEmail__c:             {rec.get('BusinessEmail__c', 'NULL')}\n")
-        f.write(f"\n-- SQL Server ABR Fields --\n")
-        f.write(f"ABNRegistrationDate__c:       {rec.get('ABNRegistrationDate__c', 'NULL')}\n")
-        f.write(f"AccountStatus__c:             {rec.get('AccountStatus__c', 'NULL')}\n")
-        f.write(f"OSCACode__c:                  {rec.get('OSCACode__c', 'NULL')}\n")
-        f.write("\n")
-
-print(f"   ✅ Saved: {sample_file}")
-print(f"      Sample count: {len(samples['records'])}")
+        for i, rec in enumerate(samples, 1):
+            f.write(f"SAMPLE RECORD {i}\n")
+            f.write("-"*80 + "\n")
+            f.write(f"External_Id__c:               {rec.get('External_Id__c', 'NULL')}\n")
+            f.write(f"Name:                         {rec.get('Name', 'NULL')}\n")
+            f.write(f"ABN__c:                       {rec.get('ABN__c', 'NULL')}\n")
+            f.write(f"ACN__c:                       {rec.get('ACN__c', 'NULL')}\n")
+            f.write(f"RegisteredEntityName__c:      {rec.get('RegisteredEntityName__c', 'NULL')}\n")
+            f.write(f"TradingAs__c:                 {rec.get('TradingAs__c', 'NULL')}\n")
+            f.write(f"Registration_Number__c:       {rec.get('Registration_Number__c', 'NULL')}\n")
+            f.write(f"RegisteredOfficeAddress__c:   {rec.get('RegisteredOfficeAddress__c', 'NULL')}\n")
+            f.write(f"DateEmploymentCommenced__c:   {rec.get('DateEmploymentCommenced__c', 'NULL')}\n")
+            f.write(f"Type:                         {rec.get('Type', 'NULL')}\n")
+            f.write(f"\n-- New Fields (Feb 6, 2026) --\n")
+            f.write(f"NumberOfEmployees:            {rec.get('NumberOfEmployees', 'NULL')}\n")
+            f.write(f"OwnersPerformCoveredWork__c:  {rec.get('OwnersPerformCoveredWork__c', 'NULL')}\n")
+            f.write(f"BusinessEmail__c:             {rec.get('BusinessEmail__c', 'NULL')}\n")
+            f.write(f"\n-- SQL Server ABR Fields --\n")
+            f.write(f"ABNRegistrationDate__c:       {rec.get('ABNRegistrationDate__c', 'NULL')}\n")
+            f.write(f"AccountStatus__c:             {rec.get('AccountStatus__c', 'NULL')}\n")
+            f.write(f"OSCACode__c:                  {rec.get('OSCACode__c', 'NULL')}\n")
+            f.write("\n")
+
+    print(f"   ✅ Saved: {sample_file}")
+    print(f"      Sample count: {len(samples)}")
+    samples_section.done(sample_file)
+sample_file, = samples_section.outputs
 
 # ============================================================================
 # 3. GENERATE FIELD TYPE ANALYSIS (Read-Only vs Newly Added)
 # ============================================================================
 print("\n[3/5] Generating Field Type Analysis...")
 
-field_analysis_file = f'test_output/sit_account_field_analysis_{timestamp}.csv'
-
-# Categorize fields
-readonly_fields = [m for m in mappings if m['Field_Type'] == 'Standard (Read-Only)']
-new_fields = [m for m in mappings if m['Field_Type'] == 'Newly Added']
-filter_fields = [m for m in mappings if m['Field_Type'] == 'Filter Criteria']
-
-field_analysis = []
-
-# Read-only fields section
-field_analysis.append({'Category': 'READ-ONLY STANDARD FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-for field in readonly_fields:
-    # Get sample data from SF
-    try:
-        query = f"SELECT {field['SF_Field']} FROM Account WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
-        result = sf.query(query)
-        samples_str = ', '.join([str(r.get(field['SF_Field'], '')) for r in result['records']])
-    except:
-        samples_str = 'N/A'
+analysis_section = build.section('field_analysis', *account_inputs)
+if analysis_section.stale:
+    export = build.export('Account', export_fields)
+    field_analysis_file = f'test_output/sit_account_field_analysis_{timestamp}.csv'
+
+    # Categorize fields
+    readonly_fields = [m for m in mappings if m['Field_Type'] == 'Standard (Read-Only)']
+    new_fields = [m for m in mappings if m['Field_Type'] == 'Newly Added']
+    filter_fields = [m for m in mappings if m['Field_Type'] == 'Filter Criteria']
+
+    field_analysis = []
+
+    # Read-only fields section
+    field_analysis.append({'Category': 'READ-ONLY STANDARD FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+    for field in readonly_fields:
+        # Sample data from the export
+        if export.has(field['SF_Field']):
+            samples_str = ', '.join(str(v) for v in export.values(field['SF_Field']))
+        else:
+            samples_str = 'N/A'
     
-    field_analysis.append({
-        'Category': '',
-        'SF_Field': field['SF_Field'],
-        'Field_Type': field['Field_Type'],
-        'Sample_Data': samples_str if samples_str else 'NULL values',
-        'Population_Rate': 'System managed',
-        'Notes': field['Notes']
-    })
-
-field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-
-# Newly added fields section
-field_analysis.append({'Category': 'NEWLY ADDED CUSTOM FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-
-total_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null")['totalSize']
-
-for field in new_fields:
-    # Get population rate and samples
-    try:
-        count_query = f"SELECT COUNT() FROM Account WHERE External_Id__c != null AND {field['SF_Field']} != null"
-        populated = sf.query(count_query)['totalSize']
-        pop_rate = f"{populated/total_count*100:.1f}% ({populated:,}/{total_count:,})"
-        
-        sample_query = f"SELECT {field['SF_Field']} FROM Account WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
-        result = sf.query(sample_query)
-        samples_str = ', '.join([str(r.get(field['SF_Field'], ''))[:50] for r in result['records']])
-    except Exception as e:
-        pop_rate = 'Error'
-        samples_str = 'N/A'
+        field_analysis.append({
+            'Category': '',
+            'SF_Field': field['SF_Field'],
+            'Field_Type': field['Field_Type'],
+            'Sample_Data': samples_str if samples_str else 'NULL values',
+            'Population_Rate': 'System managed',
+            'Notes': field['Notes']
+        })
+
+    field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+
+    # Newly added fields section
+    field_analysis.append({'Category': 'NEWLY ADDED CUSTOM FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+
+    total_count = export.count()
+    populated_counts = export.populated([field['SF_Field'] for field in new_fields])
+
+    for field in new_fields:
+        # Population rate and samples from the export
+        if field['SF_Field'] in populated_counts and total_count:
+            populated = populated_counts[field['SF_Field']]
+            pop_rate = f"{populated/total_count*100:.1f}% ({populated:,}/{total_count:,})"
+            samples_str = ', '.join(str(v)[:50] for v in export.values(field['SF_Field']))
+        else:
+            pop_rate = 'Error'
+            samples_str = 'N/A'
     
-    field_analysis.append({
-        'Category': '',
-        'SF_Field': field['SF_Field'],
-        'Field_Type': field['Field_Type'],
-        'Sample_Data': samples_str if samples_str else 'NULL values',
-        'Population_Rate': pop_rate,
-        'Notes': field['Notes']
-    })
-
-with open(field_analysis_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Category', 'SF_Field', 'Field_Type', 'Sample_Data', 'Population_Rate', 'Notes'])
-    writer.writeheader()
-    writer.writerows(field_analysis)
-
-print(f"   ✅ Saved: {field_analysis_file}")
-print(f"      Read-only fields: {len(readonly_fields)}")
-print(f"      Newly added fields: {len(new_fields)}")
+        field_analysis.append({
+            'Category': '',
+            'SF_Field': field['SF_Field'],
+            'Field_Type': field['Field_Type'],
+            'Sample_Data': samples_str if samples_str else 'NULL values',
+            'Population_Rate': pop_rate,
+            'Notes': field['Notes']
+        })
+
+    with open(field_analysis_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Category', 'SF_Field', 'Field_Type', 'Sample_Data', 'Population_Rate', 'Notes'])
+        writer.writeheader()
+        writer.writerows(field_analysis)
+
+    print(f"   ✅ Saved: {field_analysis_file}")
+    print(f"      Read-only fields: {len(readonly_fields)}")
+    print(f"      Newly added fields: {len(new_fields)}")
+    analysis_section.done(field_analysis_file)
+field_analysis_file, = analysis_section.outputs
 
 # ============================================================================
 # 4. GENERATE RECONCILIATION CSV
 # ============================================================================
 print("\n[4/5] Generating Reconciliation Report CSV...")
 
-oracle_count = 53857
-sf_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null")['totalSize']
-
-# Get field population
-abn_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND ABN__c != null")['totalSize']
-acn_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND ACN__c != null")['totalSize']
-reg_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND RegisteredEntityName__c != null")['totalSize']
-trading_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND TradingAs__c != null")['totalSize']
-regnum_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND Registration_Number__c != null")['totalSize']
-date_count = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND DateEmploymentCommenced__c != null")['totalSize']
-
-# Check duplicates
-dup_query = """
-SELECT External_Id__c, COUNT(Id) cnt
-FROM Account
-WHERE External_Id__c != null
-GROUP BY External_Id__c
-HAVING COUNT(Id) > 1
-"""
-duplicates = sf.query_all(dup_query)['totalSize']
-
-# Build report data
-report_data = [
-    {'Metric': 'Oracle Records Extracted', 'Count': oracle_count, 'Percentage': '100.0%', 'Status': 'N/A'},
-    {'Metric': 'Salesforce Records Loaded', 'Count': sf_count, 'Percentage': '100.0%', 'Status': '✓ MATCH' if oracle_count == sf_count else '✗ MISMATCH'},
-    {'Metric': 'Duplicate External IDs', 'Count': duplicates, 'Percentage': '0.0%', 'Status': '✓ PASS' if duplicates == 0 else '✗ FAIL'},
-    {'Metric': '', 'Count': '', 'Percentage': '', 'Status': ''},
-    {'Metric': 'Field Population Rates:', 'Count': '', 'Percentage': '', 'Status': ''},
-    {'Metric': '  ABN__c', 'Count': abn_count, 'Percentage': f'{abn_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  ACN__c', 'Count': acn_count, 'Percentage': f'{acn_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  RegisteredEntityName__c', 'Count': reg_count, 'Percentage': f'{reg_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  TradingAs__c', 'Count': trading_count, 'Percentage': f'{trading_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  Registration_Number__c', 'Count': regnum_count, 'Percentage': f'{regnum_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  DateEmploymentCommenced__c', 'Count': date_count, 'Percentage': f'{date_count/sf_count*100:.1f}%', 'Status': ''},
-]
-
-reconciliation_file = f'test_output/sit_account_reconciliation_{timestamp}.csv'
-with open(reconciliation_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Metric', 'Count', 'Percentage', 'Status'])
-    writer.writeheader()
-    writer.writerows(report_data)
+recon_section = build.section('reconciliation', *account_inputs)
+if recon_section.stale:
+    export = build.export('Account', export_fields)
+    oracle_count = 53857
+    sf_count = export.count()
 
-print(f"   ✅ Saved: {reconciliation_file}")
-print(f"      Oracle: {oracle_count:,} | Salesforce: {sf_count:,} | Match: {oracle_count == sf_count}")
+    # Get field population
+    populated_counts = export.populated([
+        'ABN__c', 'ACN__c', 'RegisteredEntityName__c', 'TradingAs__c',
+        'Registration_Number__c', 'DateEmploymentCommenced__c'
+    ])
+    abn_count = populated_counts.get('ABN__c', 0)
+    acn_count = populated_counts.get('ACN__c', 0)
+    reg_count = populated_counts.get('RegisteredEntityName__c', 0)
+    trading_count = populated_counts.get('TradingAs__c', 0)
+    regnum_count = populated_counts.get('Registration_Number__c', 0)
+    date_count = populated_counts.get('DateEmploymentCommenced__c', 0)
+
+    # Check duplicates
+    duplicates = export.duplicates('External_Id__c')
+
+    # Build report data
+    report_data = [
+        {'Metric': 'Oracle Records Extracted', 'Count': oracle_count, 'Percentage': '100.0%', 'Status': 'N/A'},
+        {'Metric': 'Salesforce Records Loaded', 'Count': sf_count, 'Percentage': '100.0%', 'Status': '✓ MATCH' if oracle_count == sf_count else '✗ MISMATCH'},
+        {'Metric': 'Duplicate External IDs', 'Count': duplicates, 'Percentage': '0.0%', 'Status': '✓ PASS' if duplicates == 0 else '✗ FAIL'},
+        {'Metric': '', 'Count': '', 'Percentage': '', 'Status': ''},
+        {'Metric': 'Field Population Rates:', 'Count': '', 'Percentage': '', 'Status': ''},
+        {'Metric': '  ABN__c', 'Count': abn_count, 'Percentage': f'{abn_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  ACN__c', 'Count': acn_count, 'Percentage': f'{acn_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  RegisteredEntityName__c', 'Count': reg_count, 'Percentage': f'{reg_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  TradingAs__c', 'Count': trading_count, 'Percentage': f'{trading_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  Registration_Number__c', 'Count': regnum_count, 'Percentage': f'{regnum_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  DateEmploymentCommenced__c', 'Count': date_count, 'Percentage': f'{date_count/sf_count*100:.1f}%', 'Status': ''},
+    ]
+
+    reconciliation_file = f'test_output/sit_account_reconciliation_{timestamp}.csv'
+    with open(reconciliation_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Metric', 'Count', 'Percentage', 'Status'])
+        writer.writeheader()
+        writer.writerows(report_data)
+
+    print(f"   ✅ Saved: {reconciliation_file}")
+    print(f"      Oracle: {oracle_count:,} | Salesforce: {sf_count:,} | Match: {oracle_count == sf_count}")
+    recon_section.done(
+        reconciliation_file, oracle_count=oracle_count, sf_count=sf_count,
+        abn_count=abn_count, acn_count=acn_count, reg_count=reg_count, trading_count=trading_count,
+        regnum_count=regnum_count, date_count=date_count, duplicates=duplicates
+    )
+reconciliation_file, = recon_section.outputs
+recon = recon_section.values
+oracle_count, sf_count, duplicates = recon['oracle_count'], recon['sf_count'], recon['duplicates']
+abn_count, regnum_count = recon['abn_count'], recon['regnum_count']
 
 # ============================================================================
 # 5. GENERATE TEST RESULTS CSV
 # ============================================================================
 print("\n[5/5] Generating Test Results CSV...")
 
-test_results = []
-
-# Test 1: Count
-test_results.append({
-    'Test': 'Total account count',
-    'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
-    'Expected': f'{oracle_count:,}',
-    'Actual': f'{sf_count:,}',
-    'Notes': 'Active employers with service >= 2023'
-})
-
-# Test 2: Duplicates
-test_results.append({
-    'Test': 'No duplicate External_Id__c',
-    'Status': 'PASS' if duplicates == 0 else 'FAIL',
-    'Expected': '0',
-    'Actual': str(duplicates),
-    'Notes': ''
-})
-
-# Test 3: Required fields
-missing_name = sf.query("SELECT COUNT() FROM Account WHERE External_Id__c != null AND Name = null")['totalSize']
-test_results.append({
-    'Test': 'All accounts have Name',
-    'Status': 'PASS' if missing_name == 0 else 'FAIL',
-    'Expected': '0 missing',
-    'Actual': f'{missing_name:,} missing',
-    'Notes': ''
-})
-
-# Test 4: ABN population
-abn_pct = (abn_count / sf_count * 100) if sf_count > 0 else 0
-test_results.append({
-    'Test': 'ABN population rate',
-    'Status': 'PASS' if abn_pct > 50 else 'WARN',
-    'Expected': '>50%',
-    'Actual': f'{abn_pct:.1f}% ({abn_count:,}/{sf_count:,})',
-    'Notes': ''
-})
-
-# Test 5: Registration Number
-test_results.append({
-    'Test': 'All have Registration_Number__c',
-    'Status': 'PASS' if regnum_count == sf_count else 'FAIL',
-    'Expected': f'{sf_count:,}',
-    'Actual': f'{regnum_count:,}',
-    'Notes': ''
-})
-
-test_file = f'test_output/sit_account_test_results_{timestamp}.csv'
-with open(test_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Test', 'Status', 'Expected', 'Actual', 'Notes'])
-    writer.writeheader()
-    writer.writerows(test_results)
-
-print(f"   ✅ Saved: {test_file}")
-passed = sum(1 for r in test_results if r['Status'] == 'PASS')
-print(f"      Tests passed: {passed}/{len(test_results)}")
+tests_section = build.section('test_results', *account_inputs)
+if tests_section.stale:
+    export = build.export('Account', export_fields)
+    test_results = []
+
+    # Test 1: Count
+    test_results.append({
+        'Test': 'Total account count',
+        'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
+        'Expected': f'{oracle_count:,}',
+        'Actual': f'{sf_count:,}',
+        'Notes': 'Active employers with service >= 2023'
+    })
+
+    # Test 2: Duplicates
+    test_results.append({
+        'Test': 'No duplicate External_Id__c',
+        'Status': 'PASS' if duplicates == 0 else 'FAIL',
+        'Expected': '0',
+        'Actual': str(duplicates),
+        'Notes': ''
+    })
+
+    # Test 3: Required fields
+    missing_name = export.missing_any(['Name'])
+    test_results.append({
+        'Test': 'All accounts have Name',
+        'Status': 'PASS' if missing_name == 0 else 'FAIL',
+        'Expected': '0 missing',
+        'Actual': f'{missing_name:,} missing',
+        'Notes': ''
+    })
+
+    # Test 4: ABN population
+    abn_pct = (abn_count / sf_count * 100) if sf_count > 0 else 0
+    test_results.append({
+        'Test': 'ABN population rate',
+        'Status': 'PASS' if abn_pct > 50 else 'WARN',
+        'Expected': '>50%',
+        'Actual': f'{abn_pct:.1f}% ({abn_count:,}/{sf_count:,})',
+        'Notes': ''
+    })
+
+    # Test 5: Registration Number
+    test_results.append({
+        'Test': 'All have Registration_Number__c',
+        'Status': 'PASS' if regnum_count == sf_count else 'FAIL',
+        'Expected': f'{sf_count:,}',
+        'Actual': f'{regnum_count:,}',
+        'Notes': ''
+    })
+
+    test_file = f'test_output/sit_account_test_results_{timestamp}.csv'
+    with open(test_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Test', 'Status', 'Expected', 'Actual', 'Notes'])
+        writer.writeheader()
+        writer.writerows(test_results)
+
+    print(f"   ✅ Saved: {test_file}")
+    passed = sum(1 for r in test_results if r['Status'] == 'PASS')
+    print(f"      Tests passed: {passed}/{len(test_results)}")
+    tests_section.done(test_file, passed=passed, total=len(test_results))
+test_file, = tests_section.outputs
+passed, total_tests = tests_section.values['passed'], tests_section.values['total']
 
 # ============================================================================
 # COPY TO ONEDRIVE
@@ -655,7 +673,8 @@ print(f"\n📊 Summary:")
 print(f"   Total Accounts: {sf_count:,}")
 print(f"   Oracle Match: {'✓' if oracle_count == sf_count else '✗'}")
 print(f"   Duplicates: {duplicates}")
-print(f"   Tests Passed: {passed}/{len(test_results)}")
+print(f"   Tests Passed: {passed}/{total_tests}")
+print(f"   Salesforce queries: {build.summary()}")
 print(f"\n📁 Files generated:")
 print(f"   1. SIT_ACCOUNT_MAPPING.csv (field mappings)")
 print(f"   2. sit_account_samples.txt (10 sample records)")
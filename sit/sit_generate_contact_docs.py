@@ -7,24 +7,25 @@ Generates all deliverables in one run:
 - Test results CSV
 - Field type analysis (read-only vs new fields)
 - ACR (AccountContactRelation) analysis
+
+Builds are incremental (sf_docbuild): a section is only regenerated when its inputs -
+the Contact/ACR data versions in the org, the mapping list or this script - changed
+since the last run, and every count query is served from the cache until the objects
+it reads change. Use --force to rebuild everything.
 """
 
 import os
 import csv
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_docbuild import DocBuild
 from datetime import datetime
 
 # Load .env.sit
 load_dotenv('.env.sit')
 
 # Connect to Salesforce
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
+sf = get_salesforce(domain='test')
 
 print("\n" + "="*70)
 print("SIT CONTACT LOAD - COMPLETE DOCUMENTATION GENERATOR")
@@ -36,6 +37,7 @@ print("="*70 + "\n")
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 os.makedirs('test_output', exist_ok=True)
 os.makedirs('mappings', exist_ok=True)
+build = DocBuild('contact_docs', sf, __file__)
 
 # ============================================================================
 # 1. GENERATE CONTACT MAPPING CSV
@@ -357,368 +359,399 @@ mappings = [
     }
 ]
 
-mapping_file = f'mappings/SIT_CONTACT_MAPPING_{timestamp}.csv'
-with open(mapping_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=[
-        'Oracle_Table', 'Oracle_Field', 'Oracle_Type',
-        'SF_Object', 'SF_Field', 'SF_Type',
-        'Transformation', 'Sample_Values', 'Notes', 'Field_Type'
-    ])
-    writer.writeheader()
-    writer.writerows(mappings)
-
-print(f"   ✅ Saved: {mapping_file}")
-print(f"      Total mappings: {len(mappings)}")
+mapping_section = build.section('mapping', build.value(mappings))
+if mapping_section.stale:
+    mapping_file = f'mappings/SIT_CONTACT_MAPPING_{timestamp}.csv'
+    with open(mapping_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=[
+            'Oracle_Table', 'Oracle_Field', 'Oracle_Type',
+            'SF_Object', 'SF_Field', 'SF_Type',
+            'Transformation', 'Sample_Values', 'Notes', 'Field_Type'
+        ])
+        writer.writeheader()
+        writer.writerows(mappings)
+
+    print(f"   ✅ Saved: {mapping_file}")
+    print(f"      Total mappings: {len(mappings)}")
+    mapping_section.done(mapping_file)
+mapping_file, = mapping_section.outputs
 
 # ============================================================================
 # 2. GENERATE SAMPLE RECORDS (10 contacts)
 # ============================================================================
 print("\n[2/6] Generating Sample Records (10 contacts)...")
 
-sample_query = """
-SELECT External_Id__c, FirstName, LastName, Email, 
-       Phone, MobilePhone, OtherPhone, Birthdate, AccountId,
-       LanguagePreference__c, Title, GenderIdentity,
-       MailingStreet, MailingCity, MailingState, MailingPostalCode, MailingCountry,
-       OtherStreet, OtherCity, OtherState, OtherPostalCode, OtherCountry
-FROM Contact
-WHERE External_Id__c != null
-ORDER BY CreatedDate DESC
-LIMIT 10
-"""
-
-samples = sf.query(sample_query)
-total_contacts = sf.query('SELECT COUNT() FROM Contact WHERE External_Id__c != null')['totalSize']
-sample_file = f'test_output/sit_contact_samples_{timestamp}.txt'
-
-with open(sample_file, 'w', encoding='utf-8') as f:
-    f.write("SIT CONTACT LOAD - SAMPLE RECORDS\n")
-    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write(f"Total Contacts in SIT: {total_contacts:,}\n")
-    f.write("="*80 + "\n\n")
+# Counts shared by several sections (served from the query cache while unchanged)
+acr_objects = ('AccountContactRelation', 'Contact')
+total_contacts = build.query('SELECT COUNT() FROM Contact WHERE External_Id__c != null')['totalSize']
+acr_count = build.query("SELECT COUNT() FROM AccountContactRelation WHERE Contact.External_Id__c != null", *acr_objects)['totalSize']
+contact_inputs = (build.object('Contact'), build.value(mappings))
+
+samples_section = build.section('samples', *contact_inputs)
+if samples_section.stale:
+    sample_query = """
+    SELECT External_Id__c, FirstName, LastName, Email, 
+           Phone, MobilePhone, OtherPhone, Birthdate, AccountId,
+           LanguagePreference__c, Title, GenderIdentity,
+           MailingStreet, MailingCity, MailingState, MailingPostalCode, MailingCountry,
+           OtherStreet, OtherCity, OtherState, OtherPostalCode, OtherCountry
+    FROM Contact
+    WHERE External_Id__c != null
+    ORDER BY CreatedDate DESC
+    LIMIT 10
+    """
+
+    samples = build.query(sample_query)
+    sample_file = f'test_output/sit_contact_samples_{timestamp}.txt'
+
+    with open(sample_file, 'w', encoding='utf-8') as f:
+        f.write("SIT CONTACT LOAD - SAMPLE RECORDS\n")
+        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Total Contacts in SIT: {total_contacts:,}\n")
+        f.write("="*80 + "\n\n")
     
-    for i, rec in enumerate(samples['records'], 1):
-        f.write(f"SAMPLE RECORD {i}\n")
-        f.write("-"*80 + "\n")
-        f.write(f"External_Id__c:        {rec.get('External_Id__c', 'NULL')}\n")
-        f.write(f"FirstName:             {rec.get('FirstName', 'NULL')}\n")
-        f.write(f"LastName:              {rec.get('LastName', 'NULL')}\n")
-        f.write(f"Email:                 {rec.get('Email', 'NULL')}\n")
-        f.write(f"Phone:                 {rec.get('Phone', 'NULL')}\n")
-        f.write(f"MobilePhone:           {rec.get('MobilePhone', 'NULL')}\n")
-        f.write(f"OtherPhone:            {rec.get('OtherPhone', 'NULL')}\n")
-        f.write(f"Birthdate:             {rec.get('Birthdate', 'NULL')}\n")
-        f.write(f"LanguagePreference__c: {rec.get('LanguagePreference__c', 'NULL')}\n")
-        f.write(f"Title:                 {rec.get('Title', 'NULL')}\n")
-        f.write(f"GenderIdentity:        {rec.get('GenderIdentity', 'NULL')}\n")
-        f.write(f"MailingStreet:         {rec.get('MailingStreet', 'NULL')}\n")
-        f.write(f"MailingCity:           {rec.get('MailingCity', 'NULL')}\n")
-        f.write(f"MailingState:          {rec.get('MailingState', 'NULL')}\n")
-        f.write(f"MailingPostalCode:     {rec.get('MailingPostalCode', 'NULL')}\n")
-        f.write(f"MailingCountry:        {rec.get('MailingCountry', 'NULL')}\n")
-        f.write(f"OtherStreet:           {rec.get('OtherStreet', 'NULL')}\n")
-        f.write(f"OtherCity:             {rec.get('OtherCity', 'NULL')}\n")
-        f.write(f"OtherState:            {rec.get('OtherState', 'NULL')}\n")
-        f.write(f"OtherPostalCode:       {rec.get('OtherPostalCode', 'NULL')}\n")
-        f.write(f"OtherCountry:          {rec.get('OtherCountry', 'NULL')}\n")
-        f.write(f"AccountId:             {rec.get('AccountId', 'NULL')}\n")
-        f.write("\n")
-
-print(f"   ✅ Saved: {sample_file}")
-print(f"      Sample count: {len(samples['records'])}")
+        for i, rec in enumerate(samples['records'], 1):
+            f.write(f"SAMPLE RECORD {i}\n")
+            f.write("-"*80 + "\n")
+            f.write(f"External_Id__c:        {rec.get('External_Id__c', 'NULL')}\n")
+            f.write(f"FirstName:             {rec.get('FirstName', 'NULL')}\n")
+            f.write(f"LastName:              {rec.get('LastName', 'NULL')}\n")
+            f.write(f"Email:                 {rec.get('Email', 'NULL')}\n")
+            f.write(f"Phone:                 {rec.get('Phone', 'NULL')}\n")
+            f.write(f"MobilePhone:           {rec.get('MobilePhone', 'NULL')}\n")
+            f.write(f"OtherPhone:            {rec.get('OtherPhone', 'NULL')}\n")
+            f.write(f"Birthdate:             {rec.get('Birthdate', 'NULL')}\n")
+            f.write(f"LanguagePreference__c: {rec.get('LanguagePreference__c', 'NULL')}\n")
+            f.write(f"Title:                 {rec.get('Title', 'NULL')}\n")
+            f.write(f"GenderIdentity:        {rec.get('GenderIdentity', 'NULL')}\n")
+            f.write(f"MailingStreet:         {rec.get('MailingStreet', 'NULL')}\n")
+            f.write(f"MailingCity:           {rec.get('MailingCity', 'NULL')}\n")
+            f.write(f"MailingState:          {rec.get('MailingState', 'NULL')}\n")
+            f.write(f"MailingPostalCode:     {rec.get('MailingPostalCode', 'NULL')}\n")
+            f.write(f"MailingCountry:        {rec.get('MailingCountry', 'NULL')}\n")
+            f.write(f"OtherStreet:           {rec.get('OtherStreet', 'NULL')}\n")
+            f.write(f"OtherCity:             {rec.get('OtherCity', 'NULL')}\n")
+            f.write(f"OtherState:            {rec.get('OtherState', 'NULL')}\n")
+            f.write(f"OtherPostalCode:       {rec.get('OtherPostalCode', 'NULL')}\n")
+            f.write(f"OtherCountry:          {rec.get('OtherCountry', 'NULL')}\n")
+            f.write(f"AccountId:             {rec.get('AccountId', 'NULL')}\n")
+            f.write("\n")
+
+    print(f"   ✅ Saved: {sample_file}")
+    print(f"      Sample count: {len(samples['records'])}")
+    samples_section.done(sample_file)
+sample_file, = samples_section.outputs
 
 # ============================================================================
 # 3. GENERATE FIELD TYPE ANALYSIS (Read-Only vs Newly Added)
 # ============================================================================
 print("\n[3/6] Generating Field Type Analysis...")
 
-field_analysis_file = f'test_output/sit_contact_field_analysis_{timestamp}.csv'
+analysis_section = build.section('field_analysis', *contact_inputs, build.object('AccountContactRelation'))
+if analysis_section.stale:
+    field_analysis_file = f'test_output/sit_contact_field_analysis_{timestamp}.csv'
+
+    # Categorize fields
+    readonly_fields = [m for m in mappings if m['Field_Type'] == 'Standard (Read-Only)']
+    new_fields = [m for m in mappings if m['Field_Type'] == 'Newly Added']
+    relationship_fields = [m for m in mappings if m['Field_Type'] == 'Relationship Object']
+
+    field_analysis = []
+
+    # Read-only fields section
+    field_analysis.append({'Category': 'READ-ONLY STANDARD FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+    for field in readonly_fields:
+        if field['SF_Field'] == 'AccountId':
+            # Special handling for AccountId
+            try:
+                populated = build.query(f"SELECT COUNT() FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null")['totalSize']
+                pop_rate = f"{populated/total_contacts*100:.1f}% ({populated:,}/{total_contacts:,})"
+                samples_str = 'Account IDs (relationship)'
+            except:
+                pop_rate = 'System managed'
+                samples_str = 'N/A'
+        else:
+            # Get sample data from SF
+            try:
+                query = f"SELECT {field['SF_Field']} FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
+                result = build.query(query)
+                samples_str = ', '.join([str(r.get(field['SF_Field'], ''))[:30] for r in result['records']])
+            
+                count_query = f"SELECT COUNT() FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null"
+                populated = build.query(count_query)['totalSize']
+                pop_rate = f"{populated/total_contacts*100:.1f}% ({populated:,}/{total_contacts:,})"
+            except:
+                samples_str = 'N/A'
+                pop_rate = 'System managed'
+    
+        field_analysis.append({
+            'Category': '',
+            'SF_Field': field['SF_Field'],
+            'Field_Type': field['Field_Type'],
+            'Sample_Data': samples_str if samples_str else 'NULL values',
+            'Population_Rate': pop_rate,
+            'Notes': field['Notes']
+        })
 
-# Categorize fields
-readonly_fields = [m for m in mappings if m['Field_Type'] == 'Standard (Read-Only)']
-new_fields = [m for m in mappings if m['Field_Type'] == 'Newly Added']
-relationship_fields = [m for m in mappings if m['Field_Type'] == 'Relationship Object']
+    field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
 
-field_analysis = []
+    # Newly added fields section
+    field_analysis.append({'Category': 'NEWLY ADDED CUSTOM FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
 
-# Read-only fields section
-field_analysis.append({'Category': 'READ-ONLY STANDARD FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-for field in readonly_fields:
-    if field['SF_Field'] == 'AccountId':
-        # Special handling for AccountId
-        try:
-            populated = sf.query(f"SELECT COUNT() FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null")['totalSize']
-            pop_rate = f"{populated/total_contacts*100:.1f}% ({populated:,}/{total_contacts:,})"
-            samples_str = 'Account IDs (relationship)'
-        except:
-            pop_rate = 'System managed'
-            samples_str = 'N/A'
-    else:
-        # Get sample data from SF
+    for field in new_fields:
         try:
-            query = f"SELECT {field['SF_Field']} FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
-            result = sf.query(query)
-            samples_str = ', '.join([str(r.get(field['SF_Field'], ''))[:30] for r in result['records']])
-            
             count_query = f"SELECT COUNT() FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null"
-            populated = sf.query(count_query)['totalSize']
+            populated = build.query(count_query)['totalSize']
             pop_rate = f"{populated/total_contacts*100:.1f}% ({populated:,}/{total_contacts:,})"
-        except:
+        
+            sample_query = f"SELECT {field['SF_Field']} FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
+            result = build.query(sample_query)
+            samples_str = ', '.join([str(r.get(field['SF_Field'], ''))[:50] for r in result['records']])
+        except Exception as e:
+            pop_rate = 'Error'
             samples_str = 'N/A'
-            pop_rate = 'System managed'
     
+        field_analysis.append({
+            'Category': '',
+            'SF_Field': field['SF_Field'],
+            'Field_Type': field['Field_Type'],
+            'Sample_Data': samples_str if samples_str else 'NULL values',
+            'Population_Rate': pop_rate,
+            'Notes': field['Notes']
+        })
+
+    field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+
+    # Relationship fields section (ACR)
+    field_analysis.append({'Category': 'RELATIONSHIP OBJECTS (ACR)', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
     field_analysis.append({
         'Category': '',
-        'SF_Field': field['SF_Field'],
-        'Field_Type': field['Field_Type'],
-        'Sample_Data': samples_str if samples_str else 'NULL values',
-        'Population_Rate': pop_rate,
-        'Notes': field['Notes']
+        'SF_Field': 'AccountContactRelation',
+        'Field_Type': 'Relationship Object',
+        'Sample_Data': f'{acr_count:,} ACR records created',
+        'Population_Rate': f'{acr_count:,} relationships',
+        'Notes': 'Links contacts to employer accounts for active employment'
     })
 
-field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-
-# Newly added fields section
-field_analysis.append({'Category': 'NEWLY ADDED CUSTOM FIELDS', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
+    with open(field_analysis_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Category', 'SF_Field', 'Field_Type', 'Sample_Data', 'Population_Rate', 'Notes'])
+        writer.writeheader()
+        writer.writerows(field_analysis)
 
-for field in new_fields:
-    try:
-        count_query = f"SELECT COUNT() FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null"
-        populated = sf.query(count_query)['totalSize']
-        pop_rate = f"{populated/total_contacts*100:.1f}% ({populated:,}/{total_contacts:,})"
-        
-        sample_query = f"SELECT {field['SF_Field']} FROM Contact WHERE External_Id__c != null AND {field['SF_Field']} != null LIMIT 3"
-        result = sf.query(sample_query)
-        samples_str = ', '.join([str(r.get(field['SF_Field'], ''))[:50] for r in result['records']])
-    except Exception as e:
-        pop_rate = 'Error'
-        samples_str = 'N/A'
-    
-    field_analysis.append({
-        'Category': '',
-        'SF_Field': field['SF_Field'],
-        'Field_Type': field['Field_Type'],
-        'Sample_Data': samples_str if samples_str else 'NULL values',
-        'Population_Rate': pop_rate,
-        'Notes': field['Notes']
-    })
-
-field_analysis.append({'Category': '', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-
-# Relationship fields section (ACR)
-field_analysis.append({'Category': 'RELATIONSHIP OBJECTS (ACR)', 'SF_Field': '', 'Field_Type': '', 'Sample_Data': '', 'Population_Rate': '', 'Notes': ''})
-acr_count = sf.query("SELECT COUNT() FROM AccountContactRelation WHERE Contact.External_Id__c != null")['totalSize']
-field_analysis.append({
-    'Category': '',
-    'SF_Field': 'AccountContactRelation',
-    'Field_Type': 'Relationship Object',
-    'Sample_Data': f'{acr_count:,} ACR records created',
-    'Population_Rate': f'{acr_count:,} relationships',
-    'Notes': 'Links contacts to employer accounts for active employment'
-})
-
-with open(field_analysis_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Category', 'SF_Field', 'Field_Type', 'Sample_Data', 'Population_Rate', 'Notes'])
-    writer.writeheader()
-    writer.writerows(field_analysis)
-
-print(f"   ✅ Saved: {field_analysis_file}")
-print(f"      Read-only fields: {len(readonly_fields)}")
-print(f"      Newly added fields: {len(new_fields)}")
-print(f"      Relationship objects: {len(relationship_fields)}")
+    print(f"   ✅ Saved: {field_analysis_file}")
+    print(f"      Read-only fields: {len(readonly_fields)}")
+    print(f"      Newly added fields: {len(new_fields)}")
+    print(f"      Relationship objects: {len(relationship_fields)}")
+    analysis_section.done(field_analysis_file)
+field_analysis_file, = analysis_section.outputs
 
 # ============================================================================
 # 4. GENERATE RECONCILIATION CSV
 # ============================================================================
 print("\n[4/6] Generating Reconciliation Report CSV...")
 
-oracle_count = 50000  # Current load batch
-sf_count = total_contacts
-
-# Get field population
-email_count = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND Email != null")['totalSize']
-mobile_count = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND MobilePhone != null")['totalSize']
-birthdate_count = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND Birthdate != null")['totalSize']
-account_count = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND AccountId != null")['totalSize']
-
-# Check duplicates
-dup_query = """
-SELECT External_Id__c, COUNT(Id) cnt
-FROM Contact
-WHERE External_Id__c != null
-GROUP BY External_Id__c
-HAVING COUNT(Id) > 1
-"""
-duplicates = sf.query_all(dup_query)['totalSize']
-
-# Build report data
-report_data = [
-    {'Metric': 'Oracle Records Extracted', 'Count': oracle_count, 'Percentage': '100.0%', 'Status': 'N/A'},
-    {'Metric': 'Salesforce Records Loaded', 'Count': sf_count, 'Percentage': '100.0%', 'Status': '✓ MATCH' if oracle_count == sf_count else '✗ MISMATCH'},
-    {'Metric': 'Duplicate External IDs', 'Count': duplicates, 'Percentage': '0.0%', 'Status': '✓ PASS' if duplicates == 0 else '✗ FAIL'},
-    {'Metric': 'AccountContactRelations Created', 'Count': acr_count, 'Percentage': f'{acr_count/sf_count*100:.1f}%' if sf_count > 0 else '0%', 'Status': '✓ PASS' if acr_count > 0 else '✗ FAIL'},
-    {'Metric': '', 'Count': '', 'Percentage': '', 'Status': ''},
-    {'Metric': 'Field Population Rates:', 'Count': '', 'Percentage': '', 'Status': ''},
-    {'Metric': '  Email', 'Count': email_count, 'Percentage': f'{email_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  MobilePhone', 'Count': mobile_count, 'Percentage': f'{mobile_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  Birthdate', 'Count': birthdate_count, 'Percentage': f'{birthdate_count/sf_count*100:.1f}%', 'Status': ''},
-    {'Metric': '  AccountId (Employer Link)', 'Count': account_count, 'Percentage': f'{account_count/sf_count*100:.1f}%', 'Status': ''},
-]
-
-reconciliation_file = f'test_output/sit_contact_reconciliation_{timestamp}.csv'
-with open(reconciliation_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Metric', 'Count', 'Percentage', 'Status'])
-    writer.writeheader()
-    writer.writerows(report_data)
-
-print(f"   ✅ Saved: {reconciliation_file}")
-print(f"      Oracle: {oracle_count:,} | Salesforce: {sf_count:,} | Match: {oracle_count == sf_count}")
+recon_section = build.section('reconciliation', *contact_inputs, build.object('AccountContactRelation'))
+if recon_section.stale:
+    oracle_count = 50000  # Current load batch
+    sf_count = total_contacts
+
+    # Get field population
+    email_count = build.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND Email != null")['totalSize']
+    mobile_count = build.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND MobilePhone != null")['totalSize']
+    birthdate_count = build.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND Birthdate != null")['totalSize']
+    account_count = build.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND AccountId != null")['totalSize']
+
+    # Check duplicates
+    dup_query = """
+    SELECT External_Id__c, COUNT(Id) cnt
+    FROM Contact
+    WHERE External_Id__c != null
+    GROUP BY External_Id__c
+    HAVING COUNT(Id) > 1
+    """
+    duplicates = build.query_all(dup_query)['totalSize']
+
+    # Build report data
+    report_data = [
+        {'Metric': 'Oracle Records Extracted', 'Count': oracle_count, 'Percentage': '100.0%', 'Status': 'N/A'},
+        {'Metric': 'Salesforce Records Loaded', 'Count': sf_count, 'Percentage': '100.0%', 'Status': '✓ MATCH' if oracle_count == sf_count else '✗ MISMATCH'},
+        {'Metric': 'Duplicate External IDs', 'Count': duplicates, 'Percentage': '0.0%', 'Status': '✓ PASS' if duplicates == 0 else '✗ FAIL'},
+        {'Metric': 'AccountContactRelations Created', 'Count': acr_count, 'Percentage': f'{acr_count/sf_count*100:.1f}%' if sf_count > 0 else '0%', 'Status': '✓ PASS' if acr_count > 0 else '✗ FAIL'},
+        {'Metric': '', 'Count': '', 'Percentage': '', 'Status': ''},
+        {'Metric': 'Field Population Rates:', 'Count': '', 'Percentage': '', 'Status': ''},
+        {'Metric': '  Email', 'Count': email_count, 'Percentage': f'{email_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  MobilePhone', 'Count': mobile_count, 'Percentage': f'{mobile_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  Birthdate', 'Count': birthdate_count, 'Percentage': f'{birthdate_count/sf_count*100:.1f}%', 'Status': ''},
+        {'Metric': '  AccountId (Employer Link)', 'Count': account_count, 'Percentage': f'{account_count/sf_count*100:.1f}%', 'Status': ''},
+    ]
+
+    reconciliation_file = f'test_output/sit_contact_reconciliation_{timestamp}.csv'
+    with open(reconciliation_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Metric', 'Count', 'Percentage', 'Status'])
+        writer.writeheader()
+        writer.writerows(report_data)
+
+    print(f"   ✅ Saved: {reconciliation_file}")
+    print(f"      Oracle: {oracle_count:,} | Salesforce: {sf_count:,} | Match: {oracle_count == sf_count}")
+    recon_section.done(
+        reconciliation_file, oracle_count=oracle_count, sf_count=sf_count,
+        duplicates=duplicates, account_count=account_count
+    )
+reconciliation_file, = recon_section.outputs
+recon = recon_section.values
+oracle_count, sf_count = recon['oracle_count'], recon['sf_count']
+duplicates, account_count = recon['duplicates'], recon['account_count']
 
 # ============================================================================
 # 5. GENERATE TEST RESULTS CSV
 # ============================================================================
 print("\n[5/6] Generating Test Results CSV...")
 
-test_results = []
-
-# Test 1: Count
-test_results.append({
-    'Test': 'Total contact count',
-    'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
-    'Expected': f'{oracle_count:,}',
-    'Actual': f'{sf_count:,}',
-    'Notes': '50K contact batch load'
-})
-
-# Test 2: Duplicates
-test_results.append({
-    'Test': 'No duplicate External_Id__c',
-    'Status': 'PASS' if duplicates == 0 else 'FAIL',
-    'Expected': '0',
-    'Actual': str(duplicates),
-    'Notes': ''
-})
-
-# Test 3: Required fields
-missing_lastname = sf.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND LastName = null")['totalSize']
-test_results.append({
-    'Test': 'All contacts have LastName',
-    'Status': 'PASS' if missing_lastname == 0 else 'FAIL',
-    'Expected': '0 missing',
-    'Actual': f'{missing_lastname:,} missing',
-    'Notes': 'LastName is required'
-})
-
-# Test 4: AccountId population
-account_pct = (account_count / sf_count * 100) if sf_count > 0 else 0
-test_results.append({
-    'Test': 'AccountId linked to employers',
-    'Status': 'PASS' if account_pct > 90 else 'WARN',
-    'Expected': '>90%',
-    'Actual': f'{account_pct:.1f}% ({account_count:,}/{sf_count:,})',
-    'Notes': 'Contacts linked to active employer accounts'
-})
-
-# Test 5: ACR created
-test_results.append({
-    'Test': 'AccountContactRelations created',
-    'Status': 'PASS' if acr_count > 0 else 'FAIL',
-    'Expected': f'>0',
-    'Actual': f'{acr_count:,}',
-    'Notes': 'ACR records for active employment relationships'
-})
-
-# Test 6: External_Id format
-test_results.append({
-    'Test': 'External_Id__c populated',
-    'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
-    'Expected': '100%',
-    'Actual': '100%' if sf_count == oracle_count else f'{sf_count/oracle_count*100:.1f}%',
-    'Notes': ''
-})
-
-# Test 7: ACR AccountId links to valid Accounts
-try:
-    invalid_acr = sf.query("""
-        SELECT COUNT() 
-        FROM AccountContactRelation 
-        WHERE Contact.External_Id__c != null 
-        AND AccountId = null
-    """)['totalSize']
+tests_section = build.section('test_results', *contact_inputs, build.object('AccountContactRelation'))
+if tests_section.stale:
+    test_results = []
+
+    # Test 1: Count
+    test_results.append({
+        'Test': 'Total contact count',
+        'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
+        'Expected': f'{oracle_count:,}',
+        'Actual': f'{sf_count:,}',
+        'Notes': '50K contact batch load'
+    })
+
+    # Test 2: Duplicates
     test_results.append({
-        'Test': 'All ACRs have valid AccountId',
-        'Status': 'PASS' if invalid_acr == 0 else 'FAIL',
-        'Expected': '0 invalid',
-        'Actual': f'{invalid_acr:,} invalid',
-        'Notes': 'ACR must link to valid Account'
+        'Test': 'No duplicate External_Id__c',
+        'Status': 'PASS' if duplicates == 0 else 'FAIL',
+        'Expected': '0',
+        'Actual': str(duplicates),
+        'Notes': ''
     })
-except:
-    pass
-
-# Test 8: ACR ContactId links to valid Contacts
-try:
-    invalid_contact_acr = sf.query("""
-        SELECT COUNT() 
-        FROM AccountContactRelation 
-        WHERE Contact.External_Id__c != null 
-        AND ContactId = null
-    """)['totalSize']
+
+    # Test 3: Required fields
+    missing_lastname = build.query("SELECT COUNT() FROM Contact WHERE External_Id__c != null AND LastName = null")['totalSize']
     test_results.append({
-        'Test': 'All ACRs have valid ContactId',
-        'Status': 'PASS' if invalid_contact_acr == 0 else 'FAIL',
-        'Expected': '0 invalid',
-        'Actual': f'{invalid_contact_acr:,} invalid',
-        'Notes': 'ACR must link to valid Contact'
+        'Test': 'All contacts have LastName',
+        'Status': 'PASS' if missing_lastname == 0 else 'FAIL',
+        'Expected': '0 missing',
+        'Actual': f'{missing_lastname:,} missing',
+        'Notes': 'LastName is required'
     })
-except:
-    pass
-
-# Test 9: ACR coverage - how many contacts have ACR
-try:
-    contacts_with_acr = sf.query("""
-        SELECT COUNT(DISTINCT ContactId) 
-        FROM AccountContactRelation 
-        WHERE Contact.External_Id__c != null
-    """)['totalSize']
-    acr_coverage_pct = (contacts_with_acr / sf_count * 100) if sf_count > 0 else 0
+
+    # Test 4: AccountId population
+    account_pct = (account_count / sf_count * 100) if sf_count > 0 else 0
     test_results.append({
-        'Test': 'Contacts with ACR relationships',
-        'Status': 'PASS' if contacts_with_acr > 0 else 'FAIL',
-        'Expected': '>0 contacts',
-        'Actual': f'{contacts_with_acr:,} contacts ({acr_coverage_pct:.1f}%)',
-        'Notes': 'Number of contacts with active employment ACR'
+        'Test': 'AccountId linked to employers',
+        'Status': 'PASS' if account_pct > 90 else 'WARN',
+        'Expected': '>90%',
+        'Actual': f'{account_pct:.1f}% ({account_count:,}/{sf_count:,})',
+        'Notes': 'Contacts linked to active employer accounts'
     })
-except:
-    pass
-
-# Test 10: Check for duplicate ACRs (same Contact-Account pair)
-try:
-    duplicate_acr = sf.query("""
-        SELECT ContactId, AccountId, COUNT(Id) cnt
-        FROM AccountContactRelation
-        WHERE Contact.External_Id__c != null
-        GROUP BY ContactId, AccountId
-        HAVING COUNT(Id) > 1
-    """)['totalSize']
+
+    # Test 5: ACR created
     test_results.append({
-        'Test': 'No duplicate ACR relationships',
-        'Status': 'PASS' if duplicate_acr == 0 else 'FAIL',
-        'Expected': '0 duplicates',
-        'Actual': f'{duplicate_acr:,} duplicates',
-        'Notes': 'Each Contact-Account pair should be unique'
+        'Test': 'AccountContactRelations created',
+        'Status': 'PASS' if acr_count > 0 else 'FAIL',
+        'Expected': f'>0',
+        'Actual': f'{acr_count:,}',
+        'Notes': 'ACR records for active employment relationships'
     })
-except:
-    pass
 
-test_file = f'test_output/sit_contact_test_results_{timestamp}.csv'
-with open(test_file, 'w', newline='', encoding='utf-8') as f:
-    writer = csv.DictWriter(f, fieldnames=['Test', 'Status', 'Expected', 'Actual', 'Notes'])
-    writer.writeheader()
-    writer.writerows(test_results)
+    # Test 6: External_Id format
+    test_results.append({
+        'Test': 'External_Id__c populated',
+        'Status': 'PASS' if sf_count == oracle_count else 'FAIL',
+        'Expected': '100%',
+        'Actual': '100%' if sf_count == oracle_count else f'{sf_count/oracle_count*100:.1f}%',
+        'Notes': ''
+    })
 
-print(f"   ✅ Saved: {test_file}")
-passed = sum(1 for r in test_results if r['Status'] == 'PASS')
-print(f"      Tests passed: {passed}/{len(test_results)}")
+    # Test 7: ACR AccountId links to valid Accounts
+    try:
+        invalid_acr = build.query("""
+            SELECT COUNT() 
+            FROM AccountContactRelation 
+            WHERE Contact.External_Id__c != null 
+            AND AccountId = null
+        """, *acr_objects)['totalSize']
+        test_results.append({
+            'Test': 'All ACRs have valid AccountId',
+            'Status': 'PASS' if invalid_acr == 0 else 'FAIL',
+            'Expected': '0 invalid',
+            'Actual': f'{invalid_acr:,} invalid',
+            'Notes': 'ACR must link to valid Account'
+        })
+    except:
+        pass
+
+    # Test 8: ACR ContactId links to valid Contacts
+    try:
+        invalid_contact_acr = build.query("""
+            SELECT COUNT() 
+            FROM AccountContactRelation 
+            WHERE Contact.External_Id__c != null 
+            AND ContactId = null
+        """, *acr_objects)['totalSize']
+        test_results.append({
+            'Test': 'All ACRs have valid ContactId',
+            'Status': 'PASS' if invalid_contact_acr == 0 else 'FAIL',
+            'Expected': '0 invalid',
+            'Actual': f'{invalid_contact_acr:,} invalid',
+            'Notes': 'ACR must link to valid Contact'
+        })
+    except:
+        pass
+
+    # Test 9: ACR coverage - how many contacts have ACR
+    try:
+        contacts_with_acr = build.query("""
+            SELECT COUNT(DISTINCT ContactId) 
+            FROM AccountContactRelation 
+            WHERE Contact.External_Id__c != null
+        """, *acr_objects)['totalSize']
+        acr_coverage_pct = (contacts_with_acr / sf_count * 100) if sf_count > 0 else 0
+        test_results.append({
+            'Test': 'Contacts with ACR relationships',
+            'Status': 'PASS' if contacts_with_acr > 0 else 'FAIL',
+            'Expected': '>0 contacts',
+            'Actual': f'{contacts_with_acr:,} contacts ({acr_coverage_pct:.1f}%)',
+            'Notes': 'Number of contacts with active employment ACR'
+        })
+    except:
+        pass
+
+    # Test 10: Check for duplicate ACRs (same Contact-Account pair)
+    try:
+        duplicate_acr = build.query("""
+            SELECT ContactId, AccountId, COUNT(Id) cnt
+            FROM AccountContactRelation
+            WHERE Contact.External_Id__c != null
+            GROUP BY ContactId, AccountId
+            HAVING COUNT(Id) > 1
+        """, *acr_objects)['totalSize']
+        test_results.append({
+            'Test': 'No duplicate ACR relationships',
+            'Status': 'PASS' if duplicate_acr == 0 else 'FAIL',
+            'Expected': '0 duplicates',
+            'Actual': f'{duplicate_acr:,} duplicates',
+            'Notes': 'Each Contact-Account pair should be unique'
+        })
+    except:
+        pass
+
+    test_file = f'test_output/sit_contact_test_results_{timestamp}.csv'
+    with open(test_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['Test', 'Status', 'Expected', 'Actual', 'Notes'])
+        writer.writeheader()
+        writer.writerows(test_results)
+
+    print(f"   ✅ Saved: {test_file}")
+    passed = sum(1 for r in test_results if r['Status'] == 'PASS')
+    print(f"      Tests passed: {passed}/{len(test_results)}")
+    tests_section.done(test_file, passed=passed, total=len(test_results))
+test_file, = tests_section.outputs
+passed, total_tests = tests_section.values['passed'], tests_section.values['total']
 
 # ============================================================================
 # 6. COPY TO ONEDRIVE
@@ -756,7 +789,8 @@ print(f"   Total Contacts: {sf_count:,}")
 print(f"   Oracle Match: {'✓' if oracle_count == sf_count else '✗'}")
 print(f"   Duplicates: {duplicates}")
 print(f"   ACR Records: {acr_count:,}")
-print(f"   Tests Passed: {passed}/{len(test_results)}")
+print(f"   Tests Passed: {passed}/{total_tests}")
+print(f"   Salesforce queries: {build.summary()}")
 print(f"\n📁 Files generated:")
 print(f"   1. SIT_CONTACT_MAPPING.csv (field mappings)")
 print(f"   2. sit_contact_samples.txt (10 sample records)")
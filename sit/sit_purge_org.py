@@ -0,0 +1,99 @@
+"""
+SIT - Purge migrated data (org reset)
+Deletes every migrated record child-first:
+    ServiceReport__c -> Return__c -> AccountContactRelation -> Contact -> Account
+IDs are collected with Bulk API 2.0 query jobs and deleted with parallel Bulk API 2.0
+hardDelete jobs (or delete / 200-record collection deletes), then each object's
+remaining count is verified.
+
+Usage:
+    python sit_purge_org.py                             # hardDelete everything in PURGE_ORDER
+    python sit_purge_org.py --mode=soft                 # delete (to recycle bin)
+    python sit_purge_org.py --mode=collections          # sObject Collections deletes, no Bulk API
+    python sit_purge_org.py --objects=Contact,Account   # subset, still run child-first
+"""
+
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+import pandas as pd
+from sf_session import get_salesforce
+from sf_limits import get_governor
+from sf_purge import PURGE_ORDER, MODES, DEFAULT_WORKERS, purge
+
+# Load SIT environment
+env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
+load_dotenv(env_file)
+print(f"Using environment: {env_file}\n")
+
+def get_option(name, default=None):
+    """Value of a --name=value command line option"""
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return arg.split('=', 1)[1]
+    return default
+
+def main():
+    mode = get_option('mode', 'hard')
+    workers = int(get_option('workers', DEFAULT_WORKERS))
+    objects = get_option('objects')
+
+    if mode not in MODES:
+        print(f"[ERROR] --mode must be one of {', '.join(MODES)}")
+        sys.exit(1)
+
+    plan = PURGE_ORDER
+    if objects:
+        selected = {name.strip() for name in objects.split(',')}
+        plan = [(sobject, where) for sobject, where in PURGE_ORDER if sobject in selected]
+        unknown = selected - {sobject for sobject, _ in plan}
+        if unknown:
+            print(f"[ERROR] Not in the purge plan: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+
+    print("=" * 70)
+    print("SIT - Purge Migrated Data")
+    print("=" * 70)
+    print(f"Mode:    {mode}{' (skips recycle bin)' if mode == 'hard' else ''}")
+    print(f"Workers: {workers}")
+    print("Order:")
+    for sobject, where in plan:
+        print(f"  {sobject:<25} WHERE {where}")
+
+    sf = get_salesforce()
+    print(f"\nTarget org: {sf.sf_instance}")
+    confirmation = input("Type 'PURGE' to confirm: ")
+    if confirmation != 'PURGE':
+        print("[CANCELLED]")
+        sys.exit(0)
+
+    start_time = datetime.now()
+    summary = purge(sf, plan, mode, workers, governor=get_governor(sf, priority='high'))
+    duration = (datetime.now() - start_time).total_seconds()
+
+    print("\n" + "=" * 70)
+    print("PURGE SUMMARY")
+    print("=" * 70)
+    print(f"{'Object':<25} {'Found':>10} {'Deleted':>10} {'Failed':>10} {'Remaining':>10}")
+    for row in summary:
+        print(f"{row['object']:<25} {row['found']:>10,} {row['deleted']:>10,} "
+              f"{row['failed']:>10,} {row['remaining']:>10,}")
+    print(f"\nDuration: {duration:.1f} seconds ({duration/60:.1f} minutes)")
+
+    failures = [dict(failure, object=row['object']) for row in summary for failure in row['failures']]
+    if failures:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        error_file = f'error/sit_purge_errors_{timestamp}.csv'
+        os.makedirs('error', exist_ok=True)
+        pd.DataFrame(failures, columns=['object', 'Id', 'error']).to_csv(error_file, index=False)
+        print(f"Errors saved to: {error_file}")
+
+    if all(row['remaining'] == 0 for row in summary):
+        print("\n[SUCCESS] Purge verified - no migrated records remain")
+    else:
+        print("\n[WARNING] Records remain - rerun to retry, or check the error file")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+SIT - Retry Stage for Failed Load Records
+Reads a loader error file (error/sit_<object>_errors_<ts>.csv), classifies each
+failure, re-submits only the transient ones (row locks, timeouts, SERVER_UNAVAILABLE)
+with backoff in small lock-isolated batches, and reports what is left to fix by hand.
+
+Record payloads come from the journaled extract snapshot of the load that wrote the
+error file (its run_id column, looked up in test_output/load_journal.sqlite), so nothing
+is re-extracted from Oracle. Older error files without a run_id fall back to the latest run.
+
+Usage:
+    python sit_retry_errors.py Contact                                   # newest Contact error file
+    python sit_retry_errors.py error/sit_contact_errors_20260211_125535.csv
+    python sit_retry_errors.py Contact --dry-run                         # classify only
+"""
+
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+import pandas as pd
+from sf_session import get_salesforce
+from sf_journal import LoadJournal, load_snapshot
+from sf_limits import get_governor
+from sf_retry import (
+    LOCK_PARENT_FIELD, load_errors, latest_error_file, object_from_error_file, error_file_run_id,
+    retry_transient
+)
+
+# Load SIT environment variables
+env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
+load_dotenv(env_file)
+print(f"Using environment: {env_file}\n")
+
+# Configuration
+RETRY_BATCH_SIZE = 50   # Small collections keep lock contention per call low
+MAX_ATTEMPTS = 4
+BASE_DELAY = 5          # Seconds; doubles every attempt (5, 10, 20)
+EXTERNAL_ID_FIELD = 'External_Id__c'
+DRY_RUN = '--dry-run' in sys.argv
+
+def resolve_error_file(arg):
+    """(object_name, error_file) from an object name or an error file path"""
+    if arg.lower().endswith('.csv'):
+        object_name = object_from_error_file(arg)
+        if object_name is None:
+            raise ValueError(f"Not a loader error file: {arg}")
+        return object_name, arg
+    object_name = arg.capitalize()
+    error_file = latest_error_file(object_name)
+    if error_file is None:
+        raise FileNotFoundError(f"No error/sit_{object_name.lower()}_errors_*.csv found")
+    return object_name, error_file
+
+def load_failed_records(object_name, external_ids, run_id=None):
+    """Mapped payloads for the failed external IDs from the snapshot of the run that wrote the error file"""
+    journal = LoadJournal()
+    if run_id:
+        run = journal.get_run(run_id)
+    else:
+        print(f"      [WARNING] Error file has no run_id - using the latest journaled {object_name} run")
+        run = journal.latest_run(object_name)
+    journal.close()
+    if run is None:
+        raise RuntimeError(f"No journaled {object_name} run {run_id or '(latest)'} - cannot rebuild record payloads")
+
+    print(f"      Snapshot: {run['snapshot_path']} (run {run['run_id']})")
+    df_mapped = load_snapshot(run['snapshot_path'])['mapped']
+    df_failed = df_mapped[df_mapped[EXTERNAL_ID_FIELD].astype(str).isin(set(external_ids))]
+
+    # NaN/NaT would serialize as invalid JSON tokens; drop them like None (the loaders do the same)
+    records = df_failed.astype(object).where(df_failed.notna(), None).to_dict('records')
+    return [{k: v for k, v in record.items() if v is not None} for record in records]
+
+def connect_salesforce():
+    """Connect to Salesforce SIT"""
+    print("Connecting to Salesforce SIT...")
+    sf = get_salesforce()
+    print("      [OK] Salesforce connected")
+    return sf
+
+def save_remaining(object_name, df_remaining):
+    """Write failures that still need a manual fix"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    output_file = f'error/sit_{object_name.lower()}_retry_remaining_{timestamp}.csv'
+    os.makedirs('error', exist_ok=True)
+    df_remaining.to_csv(output_file, index=False)
+    return output_file
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    object_name, error_file = resolve_error_file(args[0])
+
+    print("=" * 80)
+    print(f"SIT: Retry failed {object_name} records")
+    print(f"Error file: {error_file}")
+    print("=" * 80 + "\n")
+
+    # 1. Classify
+    df_errors = load_errors(error_file)
+    counts = df_errors['error_class'].value_counts()
+    print(f"Failed records: {len(df_errors):,}")
+    for error_class in ('transient', 'permanent', 'unknown'):
+        print(f"  {error_class:<10} {counts.get(error_class, 0):,}")
+
+    transient_ids = df_errors.loc[df_errors['error_class'] == 'transient', 'external_id'].tolist()
+    df_remaining = df_errors[df_errors['error_class'] != 'transient'][['external_id', 'error', 'error_class']]
+
+    # 2. Retry transient failures
+    if transient_ids and not DRY_RUN:
+        print(f"\nRetrying {len(transient_ids):,} transient failures "
+              f"(batches of {RETRY_BATCH_SIZE}, up to {MAX_ATTEMPTS} attempts)...")
+        records = load_failed_records(object_name, transient_ids, error_file_run_id(df_errors))
+        missing = set(transient_ids) - {str(r[EXTERNAL_ID_FIELD]) for r in records}
+        if missing:
+            print(f"      [WARNING] {len(missing):,} external IDs not in the snapshot - not retried")
+
+        sf = connect_salesforce()
+        succeeded, failed = retry_transient(
+            sf, object_name, EXTERNAL_ID_FIELD, records,
+            parent_field=LOCK_PARENT_FIELD.get(object_name),
+            batch_size=RETRY_BATCH_SIZE, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY,
+            governor=get_governor(sf, priority='normal')
+        )
+        print(f"      [OK] Recovered {len(succeeded):,} of {len(records):,}")
+
+        df_remaining = pd.concat([
+            df_remaining,
+            pd.DataFrame(failed, columns=['external_id', 'error', 'error_class']),
+            pd.DataFrame({'external_id': sorted(missing), 'error': 'Not in journaled snapshot',
+                          'error_class': 'unknown'}),
+        ], ignore_index=True)
+    elif DRY_RUN:
+        print("\n[DRY RUN] No records re-submitted")
+
+    # 3. Report what is left
+    print("\n" + "=" * 80)
+    print("REMAINING FAILURES")
+    print("=" * 80)
+    if df_remaining.empty:
+        print("None - all failures recovered")
+        return
+
+    for error_class, group in df_remaining.groupby('error_class'):
+        print(f"\n{error_class.upper()} ({len(group):,})")
+        top_errors = group['error'].astype(str).str.slice(0, 120).value_counts().head(5)
+        for message, count in top_errors.items():
+            print(f"  {count:>6,}  {message}")
+
+    output_file = save_remaining(object_name, df_remaining)
+    print(f"\nRemaining failures saved to: {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,8 @@ import os
 import json
 from datetime import datetime
 from dotenv import load_dotenv
-from simple_salesforce import Salesforce
-import requests
+from sf_session import get_salesforce
+from sf_http import get_transport
 
 # Load SIT environment variables
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -25,12 +25,7 @@ def connect_salesforce():
     """Establish Salesforce connection"""
     print("Connecting to Salesforce...")
     try:
-        sf = Salesforce(
-            username=os.getenv('SF_USERNAME'),
-            password=os.getenv('SF_PASSWORD'),
-            security_token=os.getenv('SF_SECURITY_TOKEN'),
-            domain=os.getenv('SF_DOMAIN', 'test')
-        )
+        sf = get_salesforce()
         print(f"  [OK] Connected to: {sf.sf_instance}")
         print(f"  API Version: {sf.sf_version}\n")
         return sf
@@ -345,14 +340,9 @@ def execute_composite_request(sf, composite_request, description=""):
     print(f"Executing: {description}")
     print(f"{'='*70}")
     
-    # Build the Composite API endpoint URL
-    composite_url = f"https://{sf.sf_instance}/services/data/v59.0/composite"
-    
-    # Set headers
-    headers = {
-        "Authorization": f"Bearer {sf.session_id}",
-        "Content-Type": "application/json"
-    }
+    # Shared keep-alive transport (gzip, retries, session refresh)
+    transport = get_transport(sf)
+    composite_url = transport.url('composite')
     
     # Print request summary
     print(f"\nComposite Request Summary:")
@@ -365,12 +355,7 @@ def execute_composite_request(sf, composite_request, description=""):
     # Execute request
     try:
         print(f"\nSending request to: {composite_url}")
-        response = requests.post(
-            composite_url,
-            headers=headers,
-            json=composite_request,
-            timeout=60
-        )
+        response = transport.request('POST', 'composite', json=composite_request, timeout=60)
         
         # Check response status
         if response.status_code == 200:
@@ -2,7 +2,8 @@
 SIT - Return__c Load with ServiceReport__c Children using Composite API
 Production version: Loads Return__c with child ServiceReport__c records
 Filters for active returns (PERIOD_END >= 202301)
-Uses Composite API for optimal performance (25 sub-requests per composite call)
+Uses Composite Graph API (bin-packed graphs, up to 500 operations per call)
+with the 25 sub-request /composite API kept as a fallback backend
 Relationships via External IDs
 """
 
@@ -10,11 +11,17 @@ import os
 import sys
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import oracledb
 import pandas as pd
-from simple_salesforce import Salesforce
-import requests
+from sf_session import get_salesforce
+from sf_http import API_VERSION
+from sf_composite_graph import (
+    COMPOSITE_MAX_NODES, make_unit, plan_graph_calls, summarize_plan,
+    execute_graph_call, execute_composite_call
+)
+from sf_limits import get_governor
 
 # Load environment
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -22,15 +29,16 @@ load_dotenv(env_file)
 
 # Configuration
 LIMIT_RETURNS = 100  # Number of Returns to process
-COMPOSITE_BATCH_SIZE = 5  # Returns per composite request (1 return + ~4 service reports = 5 operations)
+BACKEND = 'graph'  # 'graph' = Composite Graph (500 ops/call), 'composite' = /composite (25 ops/call)
 ACTIVE_PERIOD = 202301
+MAX_WORKERS = 4  # Concurrent calls while the API budget is healthy (sf_limits scales this down)
 
 print("="*70)
 print("SIT - Return__c + ServiceReport__c Composite API Load")
 print("Filter: Returns with PERIOD_END >= 202301 (Jan 2023)")
 print("="*70)
 print(f"Loading: {LIMIT_RETURNS} Returns with child Service Reports")
-print(f"Composite batch size: {COMPOSITE_BATCH_SIZE} Returns per request")
+print(f"Backend: {'Composite Graph' if BACKEND == 'graph' else 'Composite'} API")
 print(f"Active period filter: >= {ACTIVE_PERIOD}")
 print()
 
@@ -55,12 +63,7 @@ def connect_salesforce():
     """Connect to Salesforce"""
     print("[2/6] Connecting to Salesforce...")
     try:
-        sf = Salesforce(
-            username=os.getenv('SF_USERNAME'),
-            password=os.getenv('SF_PASSWORD'),
-            security_token=os.getenv('SF_SECURITY_TOKEN'),
-            domain=os.getenv('SF_DOMAIN', 'test')
-        )
+        sf = get_salesforce()
         print(f"      [OK] Connected to {sf.sf_instance}")
         return sf
     except Exception as e:
@@ -132,212 +135,207 @@ def extract_returns_with_service_data(conn, limit=100):
     
     return df_returns, services_by_return
 
-def build_composite_request(returns_batch, services_by_return):
+def build_return_unit(return_row, services):
     """
-    Build Composite API request for a batch of Returns and their Service Reports
-    Max 25 sub-requests per Composite request
+    Build the planner unit for one Return and its Service Reports
+    Return__c is upserted by External_Id__c; children reference it via @{return_<WSR_ID>.id}
     """
+    wsr_id = int(return_row['WSR_ID'])
+    employer_id = str(int(return_row['EMPLOYER_ID'])) if pd.notna(return_row['EMPLOYER_ID']) else None
+    
+    if not employer_id:
+        return None
+    
+    reference_id = f"return_{wsr_id}"
     
-    composite_request = {
-        "allOrNone": False,
-        "compositeRequest": []
+    # 1. UPSERT Return__c
+    return_body = {
+        "External_Id__c": str(wsr_id),
+        "Employer__r": {"External_Id__c": employer_id}
     }
     
-    operation_count = 0
-    max_operations = 25  # Salesforce limit
+    # Add optional fields
+    if pd.notna(return_row['DATE_RECEIVED']):
+        return_body["ReturnSubmittedDate__c"] = return_row['DATE_RECEIVED'].strftime('%Y-%m-%d')
+    if pd.notna(return_row['TOTAL_DAYS']):
+        return_body["TotalDaysWorked__c"] = int(return_row['TOTAL_DAYS'])
+        return_body["TotalDaysReported__c"] = int(return_row['TOTAL_DAYS'])
+    if pd.notna(return_row['EMPLOYER_TOTAL_WAGES']):
+        return_body["TotalWagesReported__c"] = float(return_row['EMPLOYER_TOTAL_WAGES'])
+    if pd.notna(return_row['CONTRIBUTION_AMOUNT']):
+        return_body["Charges__c"] = float(return_row['CONTRIBUTION_AMOUNT'])
+    if pd.notna(return_row['INVOICE_AMOUNT']):
+        return_body["InvoiceAmount__c"] = float(return_row['INVOICE_AMOUNT'])
+        return_body["AmountPayable__c"] = float(return_row['INVOICE_AMOUNT'])
+    if pd.notna(return_row['PAYMENT_DUE_DATE']):
+        return_body["InvoiceDueDate__c"] = return_row['PAYMENT_DUE_DATE'].strftime('%Y-%m-%d')
     
-    for idx, return_row in returns_batch.iterrows():
-        wsr_id = int(return_row['WSR_ID'])
-        employer_id = str(int(return_row['EMPLOYER_ID'])) if pd.notna(return_row['EMPLOYER_ID']) else None
+    return_node = {
+        "method": "PATCH",
+        "url": f"/services/data/{API_VERSION}/sobjects/Return__c/External_Id__c/{wsr_id}",
+        "referenceId": reference_id,
+        "body": return_body
+    }
+    
+    # 2. CREATE ServiceReport__c children
+    service_nodes = []
+    for service_idx, service in enumerate(services):
+        worker_id = str(int(service['WORKER_ID'])) if pd.notna(service['WORKER_ID']) else None
+        service_id = int(service['SERVICE_ID'])
         
-        if not employer_id:
+        if not worker_id:
             continue
         
-        # Check if we have room for this Return + its services
-        services = services_by_return.get(wsr_id, [])
-        total_ops = 1 + len(services)  # 1 Return + N services
-        
-        if operation_count + total_ops > max_operations:
-            break  # Batch is full
-        
-        reference_id = f"return_{wsr_id}"
-        
-        # 1. UPSERT Return__c
-        return_body = {
-            "External_Id__c": str(wsr_id),
-            "Employer__r": {"External_Id__c": employer_id}
+        service_body = {
+            "External_Id__c": f"{wsr_id}_{service_id}",
+            "Return__c": f"@{{{reference_id}.id}}",  # Reference parent Return
+            "Worker__r": {"External_Id__c": worker_id}
         }
         
         # Add optional fields
-        if pd.notna(return_row['DATE_RECEIVED']):
-            return_body["ReturnSubmittedDate__c"] = return_row['DATE_RECEIVED'].strftime('%Y-%m-%d')
-        if pd.notna(return_row['TOTAL_DAYS']):
-            return_body["TotalDaysWorked__c"] = int(return_row['TOTAL_DAYS'])
-            return_body["TotalDaysReported__c"] = int(return_row['TOTAL_DAYS'])
-        if pd.notna(return_row['EMPLOYER_TOTAL_WAGES']):
-            return_body["TotalWagesReported__c"] = float(return_row['EMPLOYER_TOTAL_WAGES'])
-        if pd.notna(return_row['CONTRIBUTION_AMOUNT']):
-            return_body["Charges__c"] = float(return_row['CONTRIBUTION_AMOUNT'])
-        if pd.notna(return_row['INVOICE_AMOUNT']):
-            return_body["InvoiceAmount__c"] = float(return_row['INVOICE_AMOUNT'])
-            return_body["AmountPayable__c"] = float(return_row['INVOICE_AMOUNT'])
-        if pd.notna(return_row['PAYMENT_DUE_DATE']):
-            return_body["InvoiceDueDate__c"] = return_row['PAYMENT_DUE_DATE'].strftime('%Y-%m-%d')
+        if pd.notna(service['SERVICE_PERIOD']):
+            service_body["ServicePeriod__c"] = str(int(service['SERVICE_PERIOD']))
+        if pd.notna(service['DAYS_WORKED']):
+            service_body["DaysWorked__c"] = int(service['DAYS_WORKED'])
+        if pd.notna(service['WAGES']):
+            service_body["WagesEarned__c"] = float(service['WAGES'])
         
-        composite_request["compositeRequest"].append({
-            "method": "PATCH",
-            "url": f"/services/data/v59.0/sobjects/Return__c/External_Id__c/{wsr_id}",
-            "referenceId": reference_id,
-            "body": return_body
+        service_nodes.append({
+            "method": "POST",
+            "url": f"/services/data/{API_VERSION}/sobjects/ServiceReport__c",
+            "referenceId": f"service_{wsr_id}_{service_idx}",
+            "body": service_body
         })
-        operation_count += 1
-        
-        # 2. CREATE ServiceReport__c children
-        for service_idx, service in enumerate(services):
-            worker_id = str(int(service['WORKER_ID'])) if pd.notna(service['WORKER_ID']) else None
-            service_id = int(service['SERVICE_ID'])
-            
-            if not worker_id:
-                continue
-            
-            service_body = {
-                "External_Id__c": f"{wsr_id}_{service_id}",
-                "Return__c": f"@{{{reference_id}.id}}",  # Reference parent Return
-                "Worker__r": {"External_Id__c": worker_id}
-            }
-            
-            # Add optional fields
-            if pd.notna(service['SERVICE_PERIOD']):
-                service_body["ServicePeriod__c"] = str(int(service['SERVICE_PERIOD']))
-            if pd.notna(service['DAYS_WORKED']):
-                service_body["DaysWorked__c"] = int(service['DAYS_WORKED'])
-            if pd.notna(service['WAGES']):
-                service_body["WagesEarned__c"] = float(service['WAGES'])
-            
-            composite_request["compositeRequest"].append({
-                "method": "POST",
-                "url": "/services/data/v59.0/sobjects/ServiceReport__c",
-                "referenceId": f"service_{wsr_id}_{service_idx}",
-                "body": service_body
-            })
-            operation_count += 1
-    
-    return composite_request
+    
+    # Overflow children (split over continuation graphs) use Return__r by External ID
+    return make_unit(str(wsr_id), return_node, service_nodes,
+                     'Return__c', 'Return__r', {"External_Id__c": str(wsr_id)})
 
-def execute_composite_request(sf, composite_request):
-    """Execute Composite API request"""
+def plan_returns(df_returns, services_by_return, backend=BACKEND):
+    """Build units for every Return and pack them into calls for the chosen backend"""
+    units = []
+    skipped_no_employer = 0
     
-    composite_url = f"https://{sf.sf_instance}/services/data/v59.0/composite"
+    for _, return_row in df_returns.iterrows():
+        unit = build_return_unit(return_row, services_by_return.get(int(return_row['WSR_ID']), []))
+        if unit is None:
+            skipped_no_employer += 1
+            continue
+        units.append(unit)
     
-    headers = {
-        "Authorization": f"Bearer {sf.session_id}",
-        "Content-Type": "application/json"
-    }
+    if skipped_no_employer:
+        print(f"      [WARNING] Skipped {skipped_no_employer:,} Returns with no EMPLOYER_ID")
     
-    try:
-        response = requests.post(
-            composite_url,
-            headers=headers,
-            json=composite_request,
-            timeout=120
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Count successes and failures
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            for sub_response in result.get('compositeResponse', []):
-                http_status = sub_response.get('httpStatusCode')
-                if http_status in [200, 201, 204]:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    errors.append({
-                        'referenceId': sub_response.get('referenceId'),
-                        'httpStatus': http_status,
-                        'error': sub_response.get('body')
-                    })
-            
-            return {
-                'success': True,
-                'success_count': success_count,
-                'error_count': error_count,
-                'errors': errors,
-                'response': result
-            }
-        else:
-            return {
-                'success': False,
-                'error': f"HTTP {response.status_code}: {response.text}"
-            }
-            
-    except Exception as e:
-        return {
-            'success': False,
-            'error': str(e)
-        }
+    if backend == 'graph':
+        calls = plan_graph_calls(units)
+    else:
+        # /composite: 25 sub-requests per call, one non-transactional group per call
+        calls = plan_graph_calls(units, graph_target_nodes=COMPOSITE_MAX_NODES,
+                                 graph_max_nodes=COMPOSITE_MAX_NODES,
+                                 call_max_nodes=COMPOSITE_MAX_NODES, call_max_graphs=1)
+    
+    return units, calls
 
-def process_returns_composite(sf, df_returns, services_by_return, batch_size=5):
-    """Process Returns with Composite API in batches"""
-    print(f"[4/6] Processing with Composite API...")
-    print(f"      Batch size: {batch_size} Returns per composite request\n")
+def process_returns_composite(sf, df_returns, services_by_return, backend=BACKEND):
+    """Process Returns with Composite Graph (or /composite) calls planned by the bin-packer"""
+    print(f"[4/6] Processing with {'Composite Graph' if backend == 'graph' else 'Composite'} API...")
+    
+    units, calls = plan_returns(df_returns, services_by_return, backend)
+    plan = summarize_plan(calls)
+    
+    print(f"      Planned {plan['parents']:,} Returns ({plan['nodes']:,} operations) "
+          f"into {plan['graphs']:,} graphs over {plan['calls']:,} calls")
+    if plan['continuations']:
+        print(f"      {plan['continuations']:,} continuation graphs for Returns with large Service Report counts")
+    if plan['calls']:
+        print(f"      Avg operations per call: {plan['nodes']/plan['calls']:.1f}\n")
+    
+    execute_call = execute_graph_call if backend == 'graph' else execute_composite_call
+    
+    # Concurrency sized from the remaining daily API budget
+    governor = get_governor(sf, priority='high')
+    print(f"      API budget: {governor.summary()}")
     
-    total_returns = len(df_returns)
     total_success = 0
     total_errors = 0
     all_errors = []
+    graph_results = {}
     
     start_time = datetime.now()
     
-    for i in range(0, total_returns, batch_size):
-        batch_num = (i // batch_size) + 1
-        batch = df_returns.iloc[i:i+batch_size]
-        
-        print(f"  Batch {batch_num} ({len(batch)} Returns)...", end=" ")
-        
-        # Build composite request
-        composite_request = build_composite_request(batch, services_by_return)
-        operations_count = len(composite_request['compositeRequest'])
-        
-        print(f"{operations_count} operations...", end=" ")
-        
-        # Execute
-        result = execute_composite_request(sf, composite_request)
+    # Primary calls first, then continuation calls (their parent graphs must have succeeded)
+    numbered_calls = list(enumerate(calls, 1))
+    waves = [
+        [(num, graphs) for num, graphs in numbered_calls if not any(g['depends_on'] for g in graphs)],
+        [(num, graphs) for num, graphs in numbered_calls if any(g['depends_on'] for g in graphs)],
+    ]
+    
+    for wave in waves:
+        pending = []
+        for call_num, graphs in wave:
+            # Continuation graphs only run once their parent graph has succeeded
+            runnable = []
+            for graph in graphs:
+                if graph['depends_on'] and not graph_results.get(graph['depends_on']):
+                    total_errors += len(graph['nodes'])
+                    all_errors.append({
+                        'graphId': graph['graphId'],
+                        'error': f"Skipped - parent graph {graph['depends_on']} failed (Return {graph['keys'][0]})"
+                    })
+                    continue
+                runnable.append(graph)
+            if runnable:
+                pending.append((call_num, runnable))
         
-        if result['success']:
-            total_success += result['success_count']
-            total_errors += result['error_count']
-            all_errors.extend(result['errors'])
+        position = 0
+        while position < len(pending):
+            # Re-check the budget before every round of concurrent calls
+            governor.checkpoint()
+            workers = governor.max_workers(MAX_WORKERS)
+            round_calls = pending[position:position + workers]
+            position += len(round_calls)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(lambda item: execute_call(sf, item[1]), round_calls))
             
-            print(f"[OK] {result['success_count']} success, {result['error_count']} errors")
-        else:
-            total_errors += operations_count
-            print(f"[ERROR] {result['error']}")
-            all_errors.append({
-                'batch': batch_num,
-                'error': result['error']
-            })
+            for (call_num, runnable), result in zip(round_calls, results):
+                operations_count = sum(len(graph['nodes']) for graph in runnable)
+                print(f"  Call {call_num}/{len(calls)} ({len(runnable)} graphs, {operations_count} operations)...", end=" ")
+                
+                if result['success']:
+                    graph_results.update(result['graph_results'])
+                    total_success += result['success_count']
+                    total_errors += result['error_count']
+                    all_errors.extend(result['errors'])
+                    
+                    print(f"[OK] {result['success_count']} success, {result['error_count']} errors")
+                else:
+                    total_errors += operations_count
+                    print(f"[ERROR] {result['error']}")
+                    all_errors.append({
+                        'call': call_num,
+                        'graphIds': [graph['graphId'] for graph in runnable],
+                        'error': result['error']
+                    })
     
     elapsed = datetime.now() - start_time
     
     print(f"\n{'='*70}")
     print("COMPOSITE API LOAD SUMMARY")
     print(f"{'='*70}")
-    print(f"Returns processed: {total_returns:,}")
+    print(f"Returns processed: {len(units):,}")
+    print(f"API calls: {plan['calls']:,}")
     print(f"Total operations: {total_success + total_errors:,}")
     print(f"Successful: {total_success:,}")
     print(f"Errors: {total_errors:,}")
     print(f"Time taken: {elapsed}")
-    print(f"Rate: {(total_success + total_errors)/elapsed.total_seconds():.1f} operations/sec")
+    if elapsed.total_seconds() > 0:
+        print(f"Rate: {(total_success + total_errors)/elapsed.total_seconds():.1f} operations/sec")
     
     if all_errors and len(all_errors) <= 20:
         print(f"\nError details:")
         for err in all_errors:
-            print(f"  {err.get('referenceId', 'Unknown')}: {err.get('error', err)}")
+            print(f"  {err.get('referenceId', err.get('graphId', 'Unknown'))}: {err.get('error', err)}")
     
     return {
         'success_count': total_success,
@@ -361,7 +359,7 @@ def main():
         sys.exit(0)
     
     # Process with Composite API
-    result = process_returns_composite(sf, df_returns, services_by_return, COMPOSITE_BATCH_SIZE)
+    result = process_returns_composite(sf, df_returns, services_by_return, BACKEND)
     
     # Save errors if any
     if result['errors']:
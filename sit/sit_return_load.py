@@ -1,7 +1,7 @@
 """
 SIT - Salesforce Return__c Object Load
 Loads Return (Weekly Service Return) records from Oracle to Salesforce SIT environment
-Links to employer accounts via CO_WSR.EMPLOYER_ID
+Links to employer accounts via CO_WSR.EMPLOYER_ID (Employer__r.External_Id__c)
 Filters for active returns (PERIOD_END >= 202301)
 Includes invoice, charges, and interest data
 """
@@ -12,7 +12,10 @@ from datetime import datetime
 from dotenv import load_dotenv
 import oracledb
 import pandas as pd
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_relationships import parent_reference, save_unresolved_parents_report
+from sf_validate import LoadValidator
+from sf_describe import describe_field
 
 # Load SIT environment variables
 env_file = '.env.sit' if os.path.exists('.env.sit') else '.env'
@@ -55,12 +58,7 @@ def connect_salesforce():
     """Establish Salesforce connection"""
     print("[2/6] Connecting to Salesforce...")
     try:
-        sf = Salesforce(
-            username=os.getenv('SF_USERNAME'),
-            password=os.getenv('SF_PASSWORD'),
-            security_token=os.getenv('SF_SECURITY_TOKEN'),
-            domain=os.getenv('SF_DOMAIN', 'test')
-        )
+        sf = get_salesforce()
         print("      [OK] Salesforce connected")
         print(f"      Instance: {sf.sf_instance}")
         return sf
@@ -68,46 +66,6 @@ def connect_salesforce():
         print(f"      [ERROR] Salesforce connection failed: {e}")
         sys.exit(1)
 
-def fetch_account_ids(sf, employer_ids):
-    """Fetch Salesforce Account IDs for given External_Id__c values"""
-    print("[3/6] Fetching Account IDs from Salesforce...")
-    
-    # Remove None values and convert to set
-    valid_employer_ids = set(str(int(x)) for x in employer_ids if pd.notna(x))
-    
-    if not valid_employer_ids:
-        print("      [WARNING] No valid employer IDs to fetch")
-        return {}
-    
-    # Query Accounts in batches (SOQL IN clause limit is 4000)
-    account_map = {}  # employer_external_id -> salesforce_account_id
-    batch_size = 500  # Reduced from 2000 to avoid URI too long error
-    employer_list = list(valid_employer_ids)
-    
-    print(f"      Fetching {len(employer_list):,} Account IDs in batches of {batch_size}...")
-    
-    for i in range(0, len(employer_list), batch_size):
-        batch = employer_list[i:i+batch_size]
-        ids_str = "','".join(batch)
-        
-        query = f"""
-            SELECT Id, External_Id__c 
-            FROM Account 
-            WHERE External_Id__c IN ('{ids_str}')
-        """
-        
-        result = sf.query(query)
-        for record in result['records']:
-            account_map[record['External_Id__c']] = record['Id']
-    
-    print(f"      [OK] Found {len(account_map):,} matching Accounts")
-    
-    missing = len(valid_employer_ids) - len(account_map)
-    if missing > 0:
-        print(f"      [WARNING] {missing:,} employer IDs not found in Salesforce Accounts")
-    
-    return account_map
-
 def load_picklist_mappings(cursor):
     """Load code mappings for picklist fields from CO_CODE table"""
     print("[4/6] Loading picklist value mappings...")
@@ -258,24 +216,6 @@ def extract_return_data(conn, limit_rows=None):
                 # Remove duplicates - keep first occurrence
                 df = df.drop_duplicates(subset=['WSR_ID'], keep='first')
                 print(f"\n      [OK] After deduplication: {len(df):,} records")
-            
-            # Check for currency field overflows (Salesforce max: 999,999,999,999.99)
-            currency_max = 999999999999.99
-            currency_fields = ['TOTAL_WAGES_REPORTED', 'CHARGES', 'INTEREST', 'INVOICE_AMOUNT']
-            
-            overflow_issues = []
-            for field in currency_fields:
-                if field in df.columns:
-                    overflow = df[df[field] > currency_max]
-                    if len(overflow) > 0:
-                        max_val = df[field].max()
-                        overflow_issues.append(f"{field}: {len(overflow)} records exceed limit (max: {max_val:,.2f})")
-            
-            if overflow_issues:
-                print(f"\n      [WARNING] Currency field overflow detected:")
-                for issue in overflow_issues:
-                    print(f"        {issue}")
-                print(f"        These records will fail in Salesforce (Currency max: {currency_max:,.2f})")
         
         return df
         
@@ -283,27 +223,28 @@ def extract_return_data(conn, limit_rows=None):
         print(f"      [ERROR] Failed to extract data: {e}")
         sys.exit(1)
 
-def map_to_salesforce(df, account_map, picklist_mappings):
+def map_to_salesforce(df, picklist_mappings):
     """Map Oracle columns to Salesforce Return__c fields"""
     print("[6/6] Mapping to Salesforce Return__c fields...")
     
     mapped_records = []
-    skipped_no_account = 0
+    skipped_no_employer = 0
     skipped_invalid_data = 0
     
     for idx, row in df.iterrows():
-        employer_id = str(int(row['EMPLOYER_ID'])) if pd.notna(row['EMPLOYER_ID']) else None
+        # Employer lookup by External ID - Salesforce resolves Employer__c on upsert
+        employer_ref = parent_reference(row['EMPLOYER_ID'])
         
-        # Skip if no employer ID or account not found
-        if not employer_id or employer_id not in account_map:
-            skipped_no_account += 1
+        # Skip if no employer ID (unknown employers are reported after the load)
+        if not employer_ref:
+            skipped_no_employer += 1
             continue
         
         try:
             # Build Salesforce record
             sf_record = {
                 'External_Id__c': str(int(row['WSR_ID'])) if pd.notna(row['WSR_ID']) else None,
-                'Employer__c': account_map[employer_id],
+                'Employer__r': employer_ref,
                 'ReturnSubmittedDate__c': row['RETURN_SUBMITTED_DATE'].strftime('%Y-%m-%d') if pd.notna(row['RETURN_SUBMITTED_DATE']) else None,
                 'TotalDaysWorked__c': int(row['TOTAL_DAYS_WORKED']) if pd.notna(row['TOTAL_DAYS_WORKED']) else None,
                 'TotalDaysReported__c': int(row['TOTAL_DAYS_WORKED']) if pd.notna(row['TOTAL_DAYS_WORKED']) else None,  # Same field
@@ -338,7 +279,7 @@ def map_to_salesforce(df, account_map, picklist_mappings):
                 print(f"      [WARNING] Skipped WSR_ID {row.get('WSR_ID')}: {e}")
     
     print(f"      [OK] Mapped {len(mapped_records):,} records")
-    print(f"      Skipped {skipped_no_account:,} records (no Account found)")
+    print(f"      Skipped {skipped_no_employer:,} records (no EMPLOYER_ID)")
     if skipped_invalid_data > 0:
         print(f"      Skipped {skipped_invalid_data:,} records (data conversion errors)")
     
@@ -359,15 +300,18 @@ def map_to_salesforce(df, account_map, picklist_mappings):
     return mapped_records
 
 def upsert_to_salesforce(sf, records, batch_size=500):
-    """Upsert records to Salesforce Return__c object using External_Id__c"""
+    """
+    Upsert records to Salesforce Return__c object using External_Id__c
+    Records breaking a Return__c describe rule (e.g. currency precision) are quarantined
+    before upload and reported as errors
+    """
     print(f"\nUpserting {len(records):,} records to Salesforce Return__c...")
     print(f"  External ID field: External_Id__c")
     print(f"  Batch size: {batch_size}")
     
     # Verify External_Id__c field exists and is configured
     try:
-        return_metadata = sf.Return__c.describe()
-        external_id_field = next((f for f in return_metadata['fields'] if f['name'] == 'External_Id__c'), None)
+        external_id_field = describe_field(sf, 'Return__c', 'External_Id__c')
         
         if not external_id_field:
             print("\n[ERROR] External_Id__c field does not exist on Return__c object")
@@ -386,6 +330,7 @@ def upsert_to_salesforce(sf, records, batch_size=500):
         print("  Proceeding anyway...")
     
     # Upsert in batches
+    validator = LoadValidator(sf, 'Return__c')
     start_time = datetime.now()
     success_count = 0
     error_count = 0
@@ -397,11 +342,19 @@ def upsert_to_salesforce(sf, records, batch_size=500):
         batch_num = (i // batch_size) + 1
         batch = records[i:i+batch_size]
         
+        # Quarantine records that would fail server-side (length, picklist, precision, date rules)
+        valid, violations = validator.validate(pd.DataFrame(batch))
+        quarantined = validator.quarantine_errors(violations, batch_num, offset=i)
+        positions = [i + int(j) for j in valid.index]
+        batch = [batch[j] for j in valid.index]
+        errors.extend(quarantined)
+        error_count += len(quarantined)
+        
         print(f"  Batch {batch_num}/{total_batches} ({len(batch)} records)...", end=" ")
         
         try:
             # UPSERT using External_Id__c
-            result = sf.bulk.Return__c.upsert(batch, 'External_Id__c', batch_size=batch_size, use_serial=True)
+            result = sf.bulk.Return__c.upsert(batch, 'External_Id__c', batch_size=batch_size, use_serial=True) if batch else []
             
             # Count successes and errors
             batch_success = sum(1 for r in result if r.get('success'))
@@ -415,7 +368,7 @@ def upsert_to_salesforce(sf, records, batch_size=500):
                 if not r.get('success'):
                     error_record = {
                         'batch': batch_num,
-                        'index': i + idx,
+                        'index': positions[idx],
                         'external_id': batch[idx].get('External_Id__c'),
                         'error': r.get('errors', 'Unknown error')
                     }
@@ -426,7 +379,8 @@ def upsert_to_salesforce(sf, records, batch_size=500):
                         print(f"\n      [ERROR DETAIL] External_Id: {error_record['external_id']}")
                         print(f"                     Error: {error_record['error']}")
             
-            print(f"[OK] {batch_success} success, {batch_errors} errors")
+            print(f"[OK] {batch_success} success, {batch_errors} errors"
+                  f"{f', {len(quarantined)} quarantined' if quarantined else ''}")
             
         except Exception as e:
             error_count += len(batch)
@@ -434,7 +388,7 @@ def upsert_to_salesforce(sf, records, batch_size=500):
             for idx in range(len(batch)):
                 error_record = {
                     'batch': batch_num,
-                    'index': i + idx,
+                    'index': positions[idx],
                     'external_id': batch[idx].get('External_Id__c'),
                     'error': str(e)
                 }
@@ -450,6 +404,10 @@ def upsert_to_salesforce(sf, records, batch_size=500):
     print(f"Errors: {error_count:,}")
     print(f"Time taken: {elapsed_time}")
     print(f"Rate: {len(records)/elapsed_time.total_seconds():.1f} records/sec")
+    print(f"Pre-load validation: {validator.summary()}")
+    quarantine_file = validator.save()
+    if quarantine_file:
+        print(f"Quarantined records saved to: {quarantine_file}")
     
     # Show error details if any
     if errors and error_count <= 20:
@@ -485,18 +443,8 @@ def main():
     picklist_mappings = load_picklist_mappings(cursor)
     cursor.close()
     
-    # Fetch Account IDs
-    employer_ids = df['EMPLOYER_ID'].dropna().unique()
-    account_map = fetch_account_ids(sf, employer_ids)
-    
-    if not account_map:
-        print("\n[ERROR] No matching Accounts found in Salesforce")
-        print("Please ensure Accounts are loaded first")
-        conn.close()
-        sys.exit(1)
-    
-    # Map to Salesforce format
-    sf_records = map_to_salesforce(df, account_map, picklist_mappings)
+    # Map to Salesforce format (Employer__r resolved by Account.External_Id__c)
+    sf_records = map_to_salesforce(df, picklist_mappings)
     
     if not sf_records:
         print("\n[WARNING] No records to upsert. Exiting.")
@@ -515,6 +463,9 @@ def main():
         pd.DataFrame(error_details).to_csv(error_file, index=False)
         print(f"\nError details saved to: {error_file}")
     
+    # Fallback report for employers that Salesforce could not resolve
+    save_unresolved_parents_report(error_details, 'Return')
+    
     print("\n[COMPLETE] Return__c load finished")
 
 if __name__ == '__main__':
@@ -1,19 +1,16 @@
 """
 Verify new columns loaded successfully to Salesforce
 """
-from simple_salesforce import Salesforce
+from sf_session import get_salesforce
+from sf_limits import get_governor
 from dotenv import load_dotenv
 import os
 
 load_dotenv('.env.sit')
 
 print("Connecting to Salesforce SIT...")
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain=os.getenv('SF_DOMAIN')
-)
+sf = get_salesforce(domain=os.getenv('SF_DOMAIN', 'login'))
+get_governor(sf, priority='low').checkpoint('api')
 
 print(f"✓ Connected to {sf.sf_instance}")
 print("\n" + "="*80)
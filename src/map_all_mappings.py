@@ -1,32 +1,52 @@
 #!/usr/bin/env python3
 """
-Oracle to Salesforce Account Field Mapping Tool
+Oracle to Salesforce Field Mapping Tool
 
 This script connects to an Oracle database and Salesforce, reads schema/field metadata,
 generates pairwise mappings with explainable scores, and outputs results to various formats.
 """
 
 import os
+import sys
 import logging
 import re
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import oracledb
 import pandas as pd
 from dotenv import load_dotenv
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from simple_salesforce import Salesforce
 from tqdm import tqdm
 import json
 import yaml
 
+# Shared describe cache of the SIT scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sit'))
+from sf_describe import describe_all
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Constants
 OUTPUT_DIR = Path('out')
+SAMPLE_CACHE_DIR = OUTPUT_DIR / 'sample_cache'
+SAMPLE_WORKERS = 4
+SAMPLE_CACHE_HOURS = 24
+SCORE_CACHE_DIR = OUTPUT_DIR / 'score_cache'
+SCORE_BLOCK_PAIRS = 1_000_000    # Pairs scored and written per block
+SF_OBJECTS = ['Account', 'Contact', 'Return__c', 'ServiceReport__c', 'Claim__c', 'ClaimComponent__c']
+BLOCKING_MIN_CANDIDATES = 5      # Fields every Oracle column keeps regardless of blocking
+BLOCKING_MIN_OVERLAP = 3         # Index overlap (a shared word, or 3 shared trigrams) to be a candidate
+BLOCKING_RECALL = 0.99           # Target recall of plausible top-K pairs on the calibration sample
+BLOCKING_MIN_SCORE = 0.6         # Top-K pairs scoring below this are not plausible mappings (not counted)
+BLOCKING_AUDIT_ROWS = 200        # Oracle columns fully scored to calibrate blocking
 WEIGHTS = {
     'name': 0.60,
     'dtype': 0.20,
@@ -51,6 +71,25 @@ SYNONYMS = {
     'employees': ['staff', 'workforce']
 }
 
+# Salesforce buckets an Oracle bucket can plausibly map to (blocking prunes the rest)
+BUCKET_COMPATIBILITY = {
+    'string': {'string', 'numeric', 'datetime', 'boolean', 'reference', 'other'},
+    'numeric': {'numeric', 'string', 'boolean', 'reference', 'other'},
+    'datetime': {'datetime', 'string', 'other'},
+    'large_object': {'string', 'other'},
+    'other': {'string', 'numeric', 'datetime', 'boolean', 'reference', 'other'}
+}
+
+# Pattern keys from detect_patterns, with the Salesforce name fragments they reward
+PATTERN_KEYS = ['email', 'phone', 'url', 'postcode', 'abn']
+PATTERN_NAME_HINTS = {
+    'email': ('email',),
+    'phone': ('phone',),
+    'url': ('website', 'url'),
+    'postcode': ('postal',),
+    'abn': ('abn',)
+}
+
 def load_environment() -> None:
     """Load environment variables from .env file."""
     load_dotenv()
@@ -125,18 +164,96 @@ def get_oracle_schema(connection: oracledb.Connection) -> pd.DataFrame:
         logger.info(f"Using mock Oracle data: {len(df)} columns.")
         return df
 
-def sample_column_values(connection: oracledb.Connection, schema: str, table: str, column: str, sample_rows: int) -> List[str]:
-    """Sample values from a column for pattern detection."""
-    if sample_rows <= 0:
-        return []
-    
-    query = f"SELECT {column} FROM {schema}.{table} WHERE ROWNUM <= {sample_rows} AND {column} IS NOT NULL"
+def get_oracle_pool(max_connections: int) -> oracledb.ConnectionPool:
+    """Create an Oracle connection pool for concurrent sampling (client mode set by get_oracle_connection)."""
+    return oracledb.create_pool(
+        user=os.getenv('ORACLE_USER'),
+        password=os.getenv('ORACLE_PASSWORD'),
+        dsn=f"{os.getenv('ORACLE_HOST')}:{os.getenv('ORACLE_PORT')}/{os.getenv('ORACLE_SERVICE_NAME')}",
+        min=1,
+        max=max_connections
+    )
+
+def _sample_cache_path(schema: str, table: str, columns: List[str], sample_rows: int, sample_percent: Optional[float]) -> Path:
+    key = json.dumps([schema, table, sorted(columns), sample_rows, sample_percent])
+    return SAMPLE_CACHE_DIR / f"{schema}_{table}_{hashlib.sha1(key.encode()).hexdigest()[:12]}.json"
+
+def sample_table_values(connection: oracledb.Connection, schema: str, table: str, columns: List[str],
+                        sample_rows: int, sample_percent: Optional[float] = None) -> Dict[str, List[str]]:
+    """
+    Sample values of all a table's columns with one query.
+    With sample_percent, Oracle SAMPLE(p) gives a representative sample instead of the first rows;
+    it falls back to the first rows where SAMPLE is not allowed (e.g. views).
+    """
+    select = ', '.join(f'"{column}"' for column in columns)
+    sample_clause = f" SAMPLE({sample_percent})" if sample_percent else ""
+    query = f'SELECT {select} FROM {schema}."{table}"{sample_clause} WHERE ROWNUM <= {sample_rows}'
     try:
         df = pd.read_sql(query, connection)
-        return df[column].astype(str).tolist()
     except Exception as e:
-        logger.warning(f"Failed to sample {schema}.{table}.{column}: {e}")
-        return []
+        if not sample_clause:
+            logger.warning(f"Failed to sample {schema}.{table}: {e}")
+            return {}
+        logger.warning(f"SAMPLE({sample_percent}) failed on {schema}.{table}, using first rows: {e}")
+        return sample_table_values(connection, schema, table, columns, sample_rows)
+    return {column: df[column].dropna().astype(str).tolist() for column in columns if column in df.columns}
+
+def sample_all_tables(oracle_df: pd.DataFrame, connection: Optional[oracledb.Connection], schema: str,
+                      sample_rows: int) -> Dict[Tuple[str, str], List[str]]:
+    """
+    Sampled values per (table, column): one query per table, tables sampled concurrently
+    over a connection pool, results cached on disk under SAMPLE_CACHE_DIR between runs.
+    Large object columns are not sampled (patterns are only detected on scalar values).
+    """
+    if sample_rows <= 0 or connection is None:
+        return {}
+    sample_percent = float(os.getenv('SAMPLE_PERCENT', 0)) or None
+    workers = int(os.getenv('SAMPLE_WORKERS', SAMPLE_WORKERS))
+    max_age = float(os.getenv('SAMPLE_CACHE_HOURS', SAMPLE_CACHE_HOURS)) * 3600
+    SAMPLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    scalar = oracle_df[oracle_df['DATA_TYPE'].map(map_oracle_dtype_to_bucket) != 'large_object']
+    samples = {}
+    pending = {}
+    for table, columns in scalar.groupby('TABLE_NAME', sort=False)['COLUMN_NAME']:
+        columns = list(dict.fromkeys(columns))
+        cache_path = _sample_cache_path(schema, table, columns, sample_rows, sample_percent)
+        if max_age > 0 and cache_path.exists() and time.time() - cache_path.stat().st_mtime < max_age:
+            with open(cache_path) as f:
+                samples.update({(table, column): values for column, values in json.load(f).items()})
+        else:
+            pending[table] = (columns, cache_path)
+    logger.info(f"Sampling {len(pending)} tables ({len(scalar['TABLE_NAME'].unique()) - len(pending)} cached).")
+    
+    def sample(sample_connection, table, columns, cache_path):
+        values = sample_table_values(sample_connection, schema, table, columns, sample_rows, sample_percent)
+        with open(cache_path, 'w') as f:
+            json.dump(values, f)
+        samples.update({(table, column): column_values for column, column_values in values.items()})
+    
+    if not pending:
+        return samples
+    try:
+        pool = get_oracle_pool(workers)
+    except Exception as e:
+        logger.warning(f"Connection pool unavailable ({e}); sampling tables one at a time.")
+        for table, (columns, cache_path) in tqdm(pending.items(), desc="Sampling Oracle tables"):
+            sample(connection, table, columns, cache_path)
+        return samples
+    
+    def sample_pooled(table, columns, cache_path):
+        with pool.acquire() as pooled_connection:
+            sample(pooled_connection, table, columns, cache_path)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(sample_pooled, table, columns, cache_path)
+                       for table, (columns, cache_path) in pending.items()]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Sampling Oracle tables"):
+                future.result()
+    finally:
+        pool.close()
+    return samples
 
 def detect_patterns(values: List[str]) -> Dict[str, float]:
     """Detect patterns in sampled values."""
@@ -194,10 +311,28 @@ def get_salesforce_connection() -> Salesforce:
         logger.error(f"Failed to connect to Salesforce: {e}")
         raise
 
-def get_salesforce_fields(sf: Salesforce) -> List[Dict]:
-    """Get Account field metadata from Salesforce."""
-    # For now, using mock fields from screenshots/user input
-    # TODO: Replace with actual API call once credentials are available
+def get_salesforce_fields(sf: Optional[Salesforce], objects: List[str] = SF_OBJECTS) -> List[Dict]:
+    """
+    Get writable field metadata (object, name, type, label) of the target objects from
+    Salesforce, described in parallel through the shared describe cache.
+    Without a connection, mock Account fields are returned.
+    """
+    if sf is not None:
+        described = describe_all(sf, objects)
+        fields = [
+            {'object': sobject, 'name': field['name'], 'type': field['type'], 'label': field['label']}
+            for sobject in objects if sobject in described
+            for field in described[sobject]['fields']
+            if field.get('createable') or field.get('updateable')
+        ]
+        if not fields:
+            raise ValueError(f"No fields described for {', '.join(objects)}")
+        missing = [sobject for sobject in objects if sobject not in described]
+        if missing:
+            logger.warning(f"Objects not described (skipped): {', '.join(missing)}")
+        logger.info(f"Retrieved {len(fields)} Salesforce fields from {len(described)} objects.")
+        return fields
+    
     mock_fields = [
         {'name': 'Id', 'type': 'id'},
         {'name': 'Name', 'type': 'string'},
@@ -227,6 +362,7 @@ def get_salesforce_fields(sf: Salesforce) -> List[Dict]:
         {'name': 'Description', 'type': 'textarea'},
         # Add more from screenshots as needed
     ]
+    mock_fields = [dict(field, object='Account') for field in mock_fields]
     logger.info(f"Using mock Salesforce fields: {len(mock_fields)}")
     return mock_fields
 
@@ -321,94 +457,540 @@ def calculate_total_score(name_score: float, dtype_score: float, pattern_bonus:
         WEIGHTS['synonym'] * synonym_bonus
     )
 
-def generate_mappings(oracle_df: pd.DataFrame, sf_fields: List[Dict], connection: oracledb.Connection) -> pd.DataFrame:
-    """Generate all pairwise mappings with scores."""
+def name_score_matrix(oracle_names: List[str], sf_names: List[str]) -> np.ndarray:
+    """Name similarity for all pairs in one multi-core rapidfuzz call."""
+    scores = process.cdist(
+        [name.lower() for name in oracle_names],
+        [name.lower() for name in sf_names],
+        scorer=fuzz.token_set_ratio,
+        dtype=np.float64,
+        workers=-1
+    )
+    return scores / 100.0
+
+def dtype_score_matrix(oracle_dtypes: List[str], sf_dtypes: List[str]) -> np.ndarray:
+    """Data type compatibility for all pairs, bucketing each distinct type once."""
+    oracle_buckets = {dtype: map_oracle_dtype_to_bucket(dtype) for dtype in set(oracle_dtypes)}
+    sf_buckets = {dtype: map_salesforce_dtype_to_bucket(dtype) for dtype in set(sf_dtypes)}
+    oracle_column = np.array([oracle_buckets[dtype] for dtype in oracle_dtypes], dtype=object)[:, None]
+    sf_row = np.array([sf_buckets[dtype] for dtype in sf_dtypes], dtype=object)[None, :]
+    return (oracle_column == sf_row).astype(np.float64)
+
+def synonym_bonus_matrix(oracle_names: List[str], sf_names: List[str]) -> np.ndarray:
+    """
+    Synonym bonus for all pairs: 1.0 when a name word has a synonym among the other
+    name's words (either direction), as calculate_synonym_bonus.
+    """
+    vocabulary = sorted(set(SYNONYMS) | {word for words in SYNONYMS.values() for word in words})
+    position = {word: i for i, word in enumerate(vocabulary)}
+    related = np.zeros((len(vocabulary), len(vocabulary)), dtype=np.int32)
+    for word, synonyms in SYNONYMS.items():
+        for synonym in synonyms:
+            related[position[word], position[synonym]] = 1
+            related[position[synonym], position[word]] = 1
+
+    def word_matrix(names: List[str]) -> np.ndarray:
+        words = np.zeros((len(names), len(vocabulary)), dtype=np.int32)
+        for i, name in enumerate(names):
+            for word in set(name.lower().split('_')):
+                if word in position:
+                    words[i, position[word]] = 1
+        return words
+
+    return ((word_matrix(oracle_names) @ related @ word_matrix(sf_names).T) > 0).astype(np.float64)
+
+def pattern_bonus_matrix(patterns: List[Dict[str, float]], sf_names: List[str], sf_dtypes: List[str]) -> np.ndarray:
+    """Pattern bonus for all pairs from per-column pattern rates, as calculate_pattern_bonus."""
+    rates = np.array([[p.get(key, 0.0) for key in PATTERN_KEYS] for p in patterns], dtype=np.float64)
+    rates = rates.reshape(len(patterns), len(PATTERN_KEYS))
+    strong = np.where(rates > 0.5, rates, 0.0)
+    hints = np.array([
+        [any(hint in name.lower() for hint in PATTERN_NAME_HINTS[key]) for key in PATTERN_KEYS]
+        for name in sf_names
+    ], dtype=np.float64).reshape(len(sf_names), len(PATTERN_KEYS))
+    is_string = np.array([map_salesforce_dtype_to_bucket(dtype) == 'string' for dtype in sf_dtypes], dtype=np.float64)
+    best = strong.max(axis=1)
+    bonus = strong @ hints.T + best[:, None] * is_string[None, :]
+    return np.minimum(bonus, 1.0)
+
+def candidate_name_scores(distinct_names: List[str], name_codes: np.ndarray, rows: np.ndarray,
+                          cols: np.ndarray, sf_names: List[str]) -> np.ndarray:
+    """Name similarity for the selected (row, field) pairs only, each distinct name/field pair scored once."""
+    n_sf = len(sf_names)
+    keys = name_codes[rows].astype(np.int64) * n_sf + cols
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    oracle_lower = [name.lower() for name in distinct_names]
+    sf_lower = [name.lower() for name in sf_names]
+    scores = np.fromiter(
+        (fuzz.token_set_ratio(oracle_lower[key // n_sf], sf_lower[key % n_sf]) for key in unique_keys.tolist()),
+        dtype=np.float64, count=len(unique_keys)
+    )
+    return scores[inverse] / 100.0
+
+def score_matrix(oracle_names: List[str], oracle_dtypes: List[str], patterns: List[Dict[str, float]],
+                 sf_names: List[str], sf_dtypes: List[str]) -> np.ndarray:
+    """Total score for all pairs of the given Oracle columns (dense)."""
+    return (
+        WEIGHTS['name'] * name_score_matrix(oracle_names, sf_names) +
+        WEIGHTS['dtype'] * dtype_score_matrix(oracle_dtypes, sf_dtypes) +
+        WEIGHTS['pattern'] * pattern_bonus_matrix(patterns, sf_names, sf_dtypes) +
+        WEIGHTS['synonym'] * synonym_bonus_matrix(oracle_names, sf_names)
+    )
+
+def name_tokens(name: str) -> List[str]:
+    """Lower-case words of a column/field name (snake_case, CamelCase, custom __c suffix)."""
+    name = re.sub(r'__[a-z]$', '', name)
+    return [word.lower() for word in re.findall(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+', name)]
+
+class CandidateIndex:
+    """
+    Blocking stage: an inverted index over Salesforce field name and label words (with
+    their synonyms) and character trigrams. An Oracle column is only scored against the
+    fields it shares enough index keys with and whose dtype bucket it can map to, plus
+    its min_candidates best-overlapping fields whatever their dtype. calibrate() raises
+    min_candidates until the candidates hold the target share of the plausible top-K
+    pairs of a fully scored sample, so recall is a knob: BLOCKING_RECALL=1.0 keeps every
+    such pair of the sample, and min_candidates reaching the field count keeps every pair.
+    """
+
+    WORD_WEIGHT = 3     # Overlap counted for a shared word (or synonym); a shared trigram counts 1
+
+    def __init__(self, sf_fields: List[Dict], min_candidates: int = BLOCKING_MIN_CANDIDATES,
+                 min_overlap: int = BLOCKING_MIN_OVERLAP, recall: float = BLOCKING_RECALL,
+                 min_score: float = BLOCKING_MIN_SCORE):
+        self.n_sf = len(sf_fields)
+        self.recall = recall
+        self.min_score = min_score
+        self.min_candidates = min(max(min_candidates, 0), self.n_sf)
+        self.min_overlap = min_overlap
+        self.sf_buckets = np.array([map_salesforce_dtype_to_bucket(field['type']) for field in sf_fields], dtype=object)
+        postings = {}
+        for i, field in enumerate(sf_fields):
+            keys = self.keys(field['name']) | (self.keys(field['label']) if field.get('label') else set())
+            for key in keys:
+                postings.setdefault(key, []).append(i)
+        self.postings = {key: np.array(fields, dtype=np.intp) for key, fields in postings.items()}
+        self._overlap = {}
+
+    def keys(self, name: str) -> set:
+        """Index keys of a name: its words and their synonyms, and trigrams of the joined words."""
+        words = name_tokens(name)
+        keys = {('w', word) for word in words}
+        for word in words:
+            keys.update(('w', synonym) for synonym in SYNONYMS.get(word, []))
+            keys.update(('w', base) for base, synonyms in SYNONYMS.items() if word in synonyms)
+        joined = ''.join(words)
+        keys.update(('g', joined[i:i + 3]) for i in range(len(joined) - 2))
+        return keys
+
+    def overlap(self, name: str) -> np.ndarray:
+        """Weighted count of index keys each Salesforce field shares with an Oracle name (cached)."""
+        if name not in self._overlap:
+            counts = np.zeros(self.n_sf, dtype=np.int32)
+            for key in self.keys(name):
+                fields = self.postings.get(key)
+                if fields is not None:
+                    counts[fields] += self.WORD_WEIGHT if key[0] == 'w' else 1
+            self._overlap[name] = counts
+        return self._overlap[name]
+
+    def candidate_mask(self, distinct_names: List[str], name_codes: np.ndarray, oracle_dtypes: List[str]) -> np.ndarray:
+        """Boolean (Oracle rows x Salesforce fields) mask of the pairs to score."""
+        overlap = np.array([self.overlap(name) for name in distinct_names], dtype=np.int32).reshape(-1, self.n_sf)
+        matched = overlap >= self.min_overlap
+        floor = np.zeros_like(matched)
+        if self.min_candidates:
+            best = np.argsort(-overlap, axis=1, kind='stable')[:, :self.min_candidates]
+            np.put_along_axis(floor, best, True, axis=1)
+        compatible = np.array([
+            np.isin(self.sf_buckets, list(BUCKET_COMPATIBILITY[map_oracle_dtype_to_bucket(dtype)]))
+            for dtype in oracle_dtypes
+        ], dtype=bool).reshape(len(oracle_dtypes), self.n_sf)
+        return (matched[name_codes] & compatible) | floor[name_codes]
+
+    def calibrate(self, oracle_names: List[str], oracle_dtypes: List[str], patterns: List[Dict[str, float]],
+                  sf_names: List[str], sf_dtypes: List[str], k: int, audit_rows: int = BLOCKING_AUDIT_ROWS) -> float:
+        """
+        Fully score a sample of Oracle columns and double min_candidates until the candidate
+        sets reach at least self.recall of their plausible top-k scores: the top-k slots
+        scoring min_score or more, a slot being found when the candidates' k-th best scores
+        as high as the k-th best field (ties make the field identity arbitrary).
+        Returns the recall reached.
+        """
+        if not oracle_names or not self.n_sf:
+            return 1.0
+        rng = np.random.default_rng(0)
+        rows = np.sort(rng.choice(len(oracle_names), size=min(audit_rows, len(oracle_names)), replace=False))
+        names = [oracle_names[i] for i in rows]
+        dtypes = [oracle_dtypes[i] for i in rows]
+        scores = score_matrix(names, dtypes, [patterns[i] for i in rows], sf_names, sf_dtypes)
+        k = min(k, self.n_sf)
+        best = -np.sort(-scores, axis=1)[:, :k]
+        plausible = best >= self.min_score
+        name_codes, distinct_names = pd.factorize(pd.Series(names, dtype=object))
+        while True:
+            mask = self.candidate_mask(list(distinct_names), name_codes, dtypes)
+            found = -np.sort(-np.where(mask, scores, -np.inf), axis=1)[:, :k]
+            recall = float((found >= best - 1e-9)[plausible].mean()) if plausible.any() else 1.0
+            if recall >= self.recall or self.min_candidates >= self.n_sf:
+                break
+            self.min_candidates = min(self.n_sf, max(1, self.min_candidates * 2))
+        logger.info(f"Blocking calibrated on {len(rows)} columns: top-{k} recall {recall:.1%}, "
+                    f"{mask.mean():.1%} of pairs kept, min candidates {self.min_candidates}")
+        return recall
+
+def fingerprint(*parts) -> int:
+    """Stable 60-bit hash of JSON-serialisable parts."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return int(hashlib.sha1(text.encode()).hexdigest()[:15], 16)
+
+COMPONENTS = ['NAME_SCORE', 'DTYPE_SCORE', 'PATTERN_BONUS', 'SYNONYM_BONUS']
+
+def _pair_keys(row_fps: np.ndarray, field_fps: np.ndarray) -> np.ndarray:
+    """One int64 key per (column, field) fingerprint pair (wrapping multiply-xor)."""
+    return (row_fps.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15) ^ field_fps.astype(np.uint64)).view(np.int64)
+
+def score_pairs(distinct_names: List[str], name_codes: np.ndarray, oracle_dtypes: List[str],
+                patterns: List[Dict[str, float]], sf_names: List[str], sf_dtypes: List[str],
+                rows: np.ndarray, cols: np.ndarray, dense: bool = False) -> np.ndarray:
+    """
+    Score components (COMPONENTS order) of the selected (row, field) pairs of a block.
+    dense: the pairs are the whole block, so names are scored with one cdist call.
+    """
+    if dense:
+        name_scores = name_score_matrix(distinct_names, sf_names)[name_codes][rows, cols]
+    else:
+        name_scores = candidate_name_scores(distinct_names, name_codes, rows, cols, sf_names)
+    return np.column_stack([
+        name_scores,
+        dtype_score_matrix(oracle_dtypes, sf_dtypes)[rows, cols],
+        pattern_bonus_matrix(patterns, sf_names, sf_dtypes)[rows, cols],
+        synonym_bonus_matrix(distinct_names, sf_names)[name_codes[rows], cols]
+    ]).reshape(len(rows), len(COMPONENTS))
+
+class ScoreCache:
+    """
+    The scored pairs of the last run, kept for incremental re-scoring. Every pair's score
+    components are stored with the fingerprint of its Oracle column (table, name, dtype, sampled patterns) and of
+    its Salesforce field (object, name, type), in a Parquet file written block by block in
+    column name order, so a block's pairs are read back from its row groups only. Pairs whose
+    column and field are both unchanged reuse their stored scores; added and changed columns
+    and fields (and pairs newly selected by blocking) are scored. A change to the weights,
+    synonyms or pattern rules discards the cache.
+    """
+    
+    def __init__(self, schema: str, cache_dir: Path = SCORE_CACHE_DIR):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / f'{schema}_pairs.parquet'
+        self.tmp_path = cache_dir / f'{schema}_pairs.parquet.tmp'
+        self.manifest_path = cache_dir / f'{schema}_manifest.json'
+        self.scoring = fingerprint(WEIGHTS, SYNONYMS, PATTERN_KEYS, PATTERN_NAME_HINTS, BUCKET_COMPATIBILITY)
+        try:
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.valid = self.manifest.get('scoring') == self.scoring and self.path.exists()
+        self.writer = None
+        if self.valid:
+            import pyarrow.parquet as pq
+            self.file = pq.ParquetFile(self.path)
+            self.name_ranges = []
+            for i in range(self.file.metadata.num_row_groups):
+                stats = self.file.metadata.row_group(i).column(0).statistics
+                self.name_ranges.append((stats.min, stats.max) if stats is not None and stats.has_min_max else ('', '\uffff'))
+    
+    def compare(self, rows: Dict[str, int], fields: Dict[str, int]) -> None:
+        """Log the columns and fields added, removed and changed since the cached run."""
+        if not self.valid:
+            logger.info("Score cache: no usable previous run - scoring every pair.")
+            return
+        for kind, current in (('columns', rows), ('fields', fields)):
+            previous = self.manifest.get(kind, {})
+            added = len(current.keys() - previous.keys())
+            removed = len(previous.keys() - current.keys())
+            changed = sum(1 for key in current.keys() & previous.keys() if current[key] != previous[key])
+            logger.info(f"Score cache: {kind} {added} added, {removed} removed, {changed} changed "
+                        f"({len(current)} in this run).")
+    
+    def lookup(self, first_name: str, last_name: str, row_fps: np.ndarray, field_fps: np.ndarray) -> np.ndarray:
+        """Stored components of the given pairs (NaN where not cached) for a block's column name range."""
+        components = np.full((len(row_fps), len(COMPONENTS)), np.nan)
+        if not self.valid or not len(row_fps):
+            return components
+        # Row groups whose column name range overlaps the block (from the Parquet statistics)
+        groups = [i for i, (low, high) in enumerate(self.name_ranges) if high >= first_name and low <= last_name]
+        if not groups:
+            return components
+        cached = self.file.read_row_groups(groups, columns=['row_fp', 'field_fp'] + COMPONENTS).to_pandas()
+        # Join on one combined int64 key, then confirm both fingerprints
+        cached_row_fps = cached['row_fp'].to_numpy()
+        cached_field_fps = cached['field_fp'].to_numpy()
+        index = pd.Index(_pair_keys(cached_row_fps, cached_field_fps))
+        if not index.is_unique:
+            return components
+        positions = index.get_indexer(_pair_keys(row_fps, field_fps))
+        found = positions >= 0
+        found[found] = (cached_row_fps[positions[found]] == row_fps[found]) & \
+                       (cached_field_fps[positions[found]] == field_fps[found])
+        components[found] = cached[COMPONENTS].to_numpy()[positions[found]]
+        return components
+    
+    def append(self, block: pd.DataFrame, name_codes: np.ndarray, distinct_names: List[str],
+               row_fps: np.ndarray, field_fps: np.ndarray) -> None:
+        """Store the components of one scored block (one row group) in the next cache file."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({
+            'oracle_column': pa.DictionaryArray.from_arrays(name_codes.astype(np.int32), pa.array(distinct_names, type=pa.string())),
+            'row_fp': row_fps,
+            'field_fp': field_fps,
+            **{component: block[component].to_numpy() for component in COMPONENTS}
+        })
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.tmp_path, table.schema)
+        self.writer.write_table(table)
+    
+    def commit(self, rows: Dict[str, int], fields: Dict[str, int]) -> None:
+        """Replace the cache with this run's pairs and fingerprints."""
+        if self.writer is None:
+            return
+        self.writer.close()
+        if self.valid:
+            self.file.close()
+        os.replace(self.tmp_path, self.path)
+        with open(self.manifest_path, 'w') as f:
+            json.dump({'scoring': self.scoring, 'columns': rows, 'fields': fields}, f)
+    
+    def abort(self) -> None:
+        """Drop a partly written cache file, keeping the previous cache."""
+        if self.writer is not None:
+            self.writer.close()
+            self.tmp_path.unlink(missing_ok=True)
+
+def score_blocks(oracle_df: pd.DataFrame, sf_fields: List[Dict], connection: oracledb.Connection,
+                 block_pairs: int = SCORE_BLOCK_PAIRS, index: Optional[CandidateIndex] = None,
+                 cache: Optional[ScoreCache] = None) -> Iterator[pd.DataFrame]:
+    """
+    Generate all pairwise mappings with scores, block by block.
+    Every score component is an (Oracle columns x Salesforce fields) matrix: names via
+    rapidfuzz cdist over distinct column names, dtype and synonym scores from precomputed
+    lookups, so no per-pair Python calls are made. Oracle columns are taken in column name
+    order and a column name never spans two blocks, so per-column outputs can be finished
+    block by block. With a CandidateIndex only the candidate pairs of each column are
+    scored and yielded; with a ScoreCache only pairs of added or changed columns and
+    fields are scored.
+    """
     sample_rows = int(os.getenv('SAMPLE_ROWS', 0))
     schema = os.getenv('ORACLE_SCHEMA').upper()
     
-    mappings = []
+    oracle_df = oracle_df.sort_values('COLUMN_NAME', kind='stable')
+    oracle_names = oracle_df['COLUMN_NAME'].tolist()
+    oracle_dtypes = oracle_df['DATA_TYPE'].tolist()
+    table_names = oracle_df['TABLE_NAME'].tolist()
+    sf_names = [field['name'] for field in sf_fields]
+    sf_dtypes = [field['type'] for field in sf_fields]
+    sf_tables = np.array([field['object'] for field in sf_fields], dtype=object)
+    sf_labels = np.array([f"{field['object']}.{field['name']}" for field in sf_fields], dtype=object)
+    n_sf = len(sf_names)
     
-    for _, oracle_row in tqdm(oracle_df.iterrows(), total=len(oracle_df), desc="Processing Oracle columns"):
-        oracle_name = oracle_row['COLUMN_NAME']
-        oracle_dtype = oracle_row['DATA_TYPE']
-        table_name = oracle_row['TABLE_NAME']
-        
-        # Sample values if enabled
-        values = sample_column_values(connection, schema, table_name, oracle_name, sample_rows)
-        patterns = detect_patterns(values)
-        
-        for sf_field in sf_fields:
-            sf_name = sf_field['name']
-            sf_dtype = sf_field['type']
-            
-            name_score = calculate_name_score(oracle_name, sf_name)
-            dtype_score = calculate_dtype_score(oracle_dtype, sf_dtype)
-            pattern_bonus = calculate_pattern_bonus(patterns, sf_name, sf_dtype)
-            synonym_bonus = calculate_synonym_bonus(oracle_name, sf_name)
-            
-            total_score = calculate_total_score(name_score, dtype_score, pattern_bonus, synonym_bonus)
+    # Sample values if enabled (one query per table)
+    samples = sample_all_tables(oracle_df, connection, schema, sample_rows)
+    patterns = [detect_patterns(samples.get((table_name, oracle_name), []))
+                for table_name, oracle_name in zip(table_names, oracle_names)]
+    if index is not None:
+        index.calibrate(oracle_names, oracle_dtypes, patterns, sf_names, sf_dtypes, k=int(os.getenv('TOPK', 5)))
+    
+    # Fingerprints of everything a pair's score depends on, per column and per field
+    row_fps = np.array([fingerprint(table_name, oracle_name, dtype, pattern) for table_name, oracle_name, dtype, pattern
+                        in zip(table_names, oracle_names, oracle_dtypes, patterns)], dtype=np.int64)
+    field_fps = np.array([fingerprint(field['object'], field['name'], field['type']) for field in sf_fields], dtype=np.int64)
+    if cache is not None:
+        row_keys = {f'{table_name}.{oracle_name}': int(fp) for table_name, oracle_name, fp in zip(table_names, oracle_names, row_fps)}
+        field_keys = dict(zip(sf_labels.tolist(), field_fps.tolist()))
+        cache.compare(row_keys, field_keys)
+
+    # Block boundaries: about block_pairs pairs, cut only where the column name changes
+    rows_per_block = max(1, block_pairs // max(n_sf, 1))
+    name_starts = [i for i in range(len(oracle_names)) if i == 0 or oracle_names[i] != oracle_names[i - 1]]
+    boundaries = [0]
+    for i in name_starts[1:]:
+        if i - boundaries[-1] >= rows_per_block:
+            boundaries.append(i)
+    boundaries.append(len(oracle_names))
+    
+    total = full = scored = 0
+    try:
+        for start, end in zip(boundaries, boundaries[1:]):
+            names = oracle_names[start:end]
+            # Column names repeat across tables: score each distinct name once
+            name_codes, distinct_names = pd.factorize(pd.Series(names, dtype=object))
+            distinct_names = list(distinct_names)
+            n_oracle = end - start
+            if index is None:
+                rows, cols = np.divmod(np.arange(n_oracle * n_sf), n_sf)
+            else:
+                rows, cols = np.nonzero(index.candidate_mask(distinct_names, name_codes, oracle_dtypes[start:end]))
+            pair_row_fps = row_fps[start:end][rows]
+            pair_field_fps = field_fps[cols]
+            if cache is not None:
+                components = cache.lookup(names[0], names[-1], pair_row_fps, pair_field_fps)
+            else:
+                components = np.full((len(rows), len(COMPONENTS)), np.nan)
+            missing = np.isnan(components[:, 0])
+            if missing.any():
+                components[missing] = score_pairs(
+                    distinct_names, name_codes, oracle_dtypes[start:end], patterns[start:end], sf_names, sf_dtypes,
+                    rows[missing], cols[missing], dense=index is None and missing.all()
+                )
+            name_scores, dtype_scores, pattern_bonus, synonym_bonus = components.T
+            total_scores = (
+                WEIGHTS['name'] * name_scores +
+                WEIGHTS['dtype'] * dtype_scores +
+                WEIGHTS['pattern'] * pattern_bonus +
+                WEIGHTS['synonym'] * synonym_bonus
+            )
             
-            mappings.append({
-                'oracle_table': table_name,
-                'oracle_column': oracle_name,
-                'oracle_dtype': oracle_dtype,
-                'sf_table': 'Account',
-                'sf_field': f'Account.{sf_name}',
-                'sf_dtype': sf_dtype,
-                'SCORE': total_score,
-                'NAME_SCORE': name_score,
-                'DTYPE_SCORE': dtype_score,
+            full += n_oracle * n_sf
+            total += len(rows)
+            scored += int(missing.sum())
+            block = pd.DataFrame({
+                'oracle_table': np.array(table_names[start:end], dtype=object)[rows],
+                'oracle_column': np.array(names, dtype=object)[rows],
+                'oracle_dtype': np.array(oracle_dtypes[start:end], dtype=object)[rows],
+                'sf_table': sf_tables[cols],
+                'sf_field': sf_labels[cols],
+                'sf_dtype': np.array(sf_dtypes, dtype=object)[cols],
+                'SCORE': total_scores,
+                'NAME_SCORE': name_scores,
+                'DTYPE_SCORE': dtype_scores,
                 'PATTERN_BONUS': pattern_bonus,
                 'SYNONYM_BONUS': synonym_bonus
             })
-    
-    df = pd.DataFrame(mappings)
-    logger.info(f"Generated {len(df)} mappings.")
-    return df
+            if cache is not None:
+                cache.append(block, name_codes[rows], distinct_names, pair_row_fps, pair_field_fps)
+            yield block
+    except BaseException:
+        if cache is not None:
+            cache.abort()
+        raise
+    if cache is not None:
+        cache.commit(row_keys, field_keys)
+    if index is None:
+        logger.info(f"Generated {total} mappings.")
+    else:
+        logger.info(f"Generated {total} mappings ({total / max(full, 1):.1%} of {full} pairs after blocking).")
+    if cache is not None:
+        logger.info(f"Scored {scored} pairs, reused {total - scored} from the score cache.")
 
-def save_outputs(mappings_df: pd.DataFrame) -> None:
-    """Save all outputs to files."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    
-    # All pairs CSV
-    mappings_df.to_csv(OUTPUT_DIR / 'oracle_to_account_all_pairs.csv', index=False)
-    
-    # Top K per Oracle column
-    topk = int(os.getenv('TOPK', 5))
-    topk_df = mappings_df.sort_values(['oracle_column', 'SCORE'], ascending=[True, False]).groupby('oracle_column').head(topk)
-    topk_df.to_csv(OUTPUT_DIR / 'oracle_to_account_topk.csv', index=False)
+def generate_mappings(oracle_df: pd.DataFrame, sf_fields: List[Dict], connection: oracledb.Connection) -> pd.DataFrame:
+    """Generate all pairwise mappings with scores as one DataFrame (small schemas; see score_blocks)."""
+    blocks = list(score_blocks(oracle_df, sf_fields, connection))
+    return pd.concat(blocks, ignore_index=True) if blocks else pd.DataFrame()
+
+def top_k(df: pd.DataFrame, key: str, k: int) -> pd.DataFrame:
+    """The k best-scoring rows per key, ordered by key then score (descending)."""
+    best = df.iloc[np.argsort(-df['SCORE'].to_numpy(), kind='stable')].groupby(key, sort=False).head(k)
+    return best.sort_values(key, kind='stable')
+
+class MappingWriter:
+    """
+    Streams scored blocks to the all-pairs file (CSV, or Parquet with ALL_PAIRS_FORMAT=parquet)
+    and keeps only what the summary outputs need: top-K rows per Oracle column and per
+    Salesforce field, and the YAML entries of each finished column.
+    """
     
-    # Top K per SF field
-    sf_topk_df = mappings_df.sort_values(['sf_field', 'SCORE'], ascending=[True, False]).groupby('sf_field').head(topk)
-    sf_topk_df.to_csv(OUTPUT_DIR / 'account_to_oracle_topk.csv', index=False)
+    def __init__(self, output_dir: Path = OUTPUT_DIR, topk: int = 5, all_pairs_format: str = 'csv'):
+        output_dir.mkdir(exist_ok=True)
+        self.output_dir = output_dir
+        self.topk = topk
+        self.all_pairs_format = all_pairs_format
+        self.parquet_writer = None
+        self.csv_path = output_dir / 'oracle_to_account_all_pairs.csv'
+        self.parquet_path = output_dir / 'oracle_to_account_all_pairs.parquet'
+        self.oracle_topk = []       # Finished per-block top-K (columns never span blocks)
+        self.sf_topk = None         # Running top-K per Salesforce field
+        self.first_choice = {}
+        self.yaml_file = open(output_dir / 'mappings_full.yaml', 'w')
+        self.rows = 0
     
-    # Full YAML
-    full_yaml = {}
-    for oracle_col in mappings_df['oracle_column'].unique():
-        col_mappings = mappings_df[mappings_df['oracle_column'] == oracle_col].sort_values('SCORE', ascending=False)
-        full_yaml[oracle_col] = [
-            {
-                'sf_field': row['sf_field'],
-                'score': row['SCORE'],
-                'reasons': {
-                    'name_similarity': row['NAME_SCORE'],
-                    'dtype_compatibility': row['DTYPE_SCORE'],
-                    'pattern_bonus': row['PATTERN_BONUS'],
-                    'synonym_bonus': row['SYNONYM_BONUS']
+    def write(self, block: pd.DataFrame) -> None:
+        """Write one block and fold it into the summaries."""
+        if block.empty:
+            return
+        if self.all_pairs_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(block, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+            self.parquet_writer.write_table(table)
+        else:
+            block.to_csv(self.csv_path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(block)
+        
+        # Top K per Oracle column (finished within the block) and per SF field (merged with the running best)
+        self.oracle_topk.append(top_k(block, 'oracle_column', self.topk))
+        candidates = top_k(block, 'sf_field', self.topk)
+        if self.sf_topk is not None:
+            candidates = pd.concat([self.sf_topk, candidates], ignore_index=True)
+        self.sf_topk = top_k(candidates, 'sf_field', self.topk)
+        
+        # Full YAML entries of the block's columns, in one groupby pass
+        ordered = block.iloc[np.lexsort((-block['SCORE'].to_numpy(), block['oracle_column'].to_numpy()))]
+        entries = pd.DataFrame({
+            'sf_field': ordered['sf_field'],
+            'score': ordered['SCORE'],
+            'name_similarity': ordered['NAME_SCORE'],
+            'dtype_compatibility': ordered['DTYPE_SCORE'],
+            'pattern_bonus': ordered['PATTERN_BONUS'],
+            'synonym_bonus': ordered['SYNONYM_BONUS']
+        })
+        block_yaml = {}
+        for oracle_col, group in entries.groupby(ordered['oracle_column'].to_numpy(), sort=True):
+            block_yaml[oracle_col] = [
+                {
+                    'sf_field': row['sf_field'],
+                    'score': row['score'],
+                    'reasons': {
+                        'name_similarity': row['name_similarity'],
+                        'dtype_compatibility': row['dtype_compatibility'],
+                        'pattern_bonus': row['pattern_bonus'],
+                        'synonym_bonus': row['synonym_bonus']
+                    }
                 }
-            }
-            for _, row in col_mappings.iterrows()
-        ]
-    
-    with open(OUTPUT_DIR / 'mappings_full.yaml', 'w') as f:
-        yaml.dump(full_yaml, f, default_flow_style=False)
-    
-    # First choice YAML
-    first_choice_yaml = {col: mappings[0]['sf_field'] for col, mappings in full_yaml.items()}
-    with open(OUTPUT_DIR / 'mappings.yaml', 'w') as f:
-        yaml.dump(first_choice_yaml, f, default_flow_style=False)
+                for row in group.to_dict('records')
+            ]
+            self.first_choice[oracle_col] = block_yaml[oracle_col][0]['sf_field']
+        yaml.dump(block_yaml, self.yaml_file, default_flow_style=False)
     
-    logger.info("All outputs saved to 'out/' directory.")
+    def close(self) -> None:
+        """Finish the all-pairs file and write the top-K and first-choice outputs."""
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        self.yaml_file.close()
+        if self.oracle_topk:
+            pd.concat(self.oracle_topk, ignore_index=True).to_csv(self.output_dir / 'oracle_to_account_topk.csv', index=False)
+        if self.sf_topk is not None:
+            self.sf_topk.to_csv(self.output_dir / 'account_to_oracle_topk.csv', index=False)
+        with open(self.output_dir / 'mappings.yaml', 'w') as f:
+            yaml.dump(self.first_choice, f, default_flow_style=False)
+
+def save_outputs(blocks: Iterable[pd.DataFrame]) -> None:
+    """Save all outputs to files, streaming scored blocks (a single DataFrame also works)."""
+    if isinstance(blocks, pd.DataFrame):
+        blocks = [blocks.sort_values('oracle_column', kind='stable')]
+    writer = MappingWriter(
+        OUTPUT_DIR,
+        topk=int(os.getenv('TOPK', 5)),
+        all_pairs_format=os.getenv('ALL_PAIRS_FORMAT', 'csv').lower()
+    )
+    try:
+        for block in blocks:
+            writer.write(block)
+    finally:
+        writer.close()
+    logger.info(f"All outputs ({writer.rows:,} pairs) saved to '{OUTPUT_DIR}/' directory.")
 
 def main() -> None:
     """Main execution function."""
@@ -427,17 +1009,30 @@ def main() -> None:
         # Salesforce
         try:
             sf_conn = get_salesforce_connection()
-            sf_fields = get_salesforce_fields(sf_conn)
+            objects = [o.strip() for o in os.getenv('SF_OBJECTS', ','.join(SF_OBJECTS)).split(',') if o.strip()]
+            sf_fields = get_salesforce_fields(sf_conn, objects)
         except Exception as e:
             logger.warning(f"Salesforce connection failed: {e}. Using mock fields.")
             sf_conn = None
             sf_fields = get_salesforce_fields(None)  # Mock fields
         
-        # Generate mappings
-        mappings_df = generate_mappings(oracle_schema, sf_fields, oracle_conn)
+        # Blocking: score only candidate pairs (BLOCKING=1)
+        index = None
+        if os.getenv('BLOCKING', '0') == '1':
+            index = CandidateIndex(
+                sf_fields,
+                min_candidates=int(os.getenv('BLOCKING_MIN_CANDIDATES', BLOCKING_MIN_CANDIDATES)),
+                recall=float(os.getenv('BLOCKING_RECALL', BLOCKING_RECALL)),
+                min_score=float(os.getenv('BLOCKING_MIN_SCORE', BLOCKING_MIN_SCORE))
+            )
+        
+        # Incremental re-scoring against the last run (SCORE_CACHE=0 scores everything)
+        cache = None
+        if os.getenv('SCORE_CACHE', '1') != '0':
+            cache = ScoreCache(os.getenv('ORACLE_SCHEMA').upper())
         
-        # Save outputs
-        save_outputs(mappings_df)
+        # Generate mappings, streaming each scored block to the outputs
+        save_outputs(score_blocks(oracle_schema, sf_fields, oracle_conn, index=index, cache=cache))
         
         logger.info("Mapping process completed successfully.")
         
@@ -2,16 +2,20 @@
 Update existing Salesforce Accounts with SQL Server ABR enrichment data
 Matches on ABN field and updates: ABNRegistrationDate__c, AccountStatus__c, 
 Classifications__c, OSCACode__c
+Salesforce Accounts are streamed through Bulk API 2.0 query/update jobs (sit/sf_patch.py),
+so the Account set is never held in memory
 """
 
-import os
 from dotenv import load_dotenv
 import oracledb
 import pyodbc
 import pandas as pd
-from simple_salesforce import Salesforce
 from datetime import datetime
 
+import _sit_path
+from sf_session import get_salesforce
+from sf_patch import patch_records
+
 load_dotenv('.env.sit')
 
 print("\n" + "="*80)
@@ -20,41 +24,10 @@ print("="*80)
 print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print("="*80)
 
-# Configuration
-BATCH_SIZE = 500
-
 # ============================================================================
-# 1. Connect to Salesforce and get existing accounts with ABN
+# 1. Extract ABR data from SQL Server
 # ============================================================================
-print("\n[1/6] Fetching existing Salesforce Accounts...")
-
-sf = Salesforce(
-    username=os.getenv('SF_USERNAME'),
-    password=os.getenv('SF_PASSWORD'),
-    security_token=os.getenv('SF_SECURITY_TOKEN'),
-    domain='test'
-)
-
-# Query accounts with ABN
-query = """
-SELECT Id, External_Id__c, ABN__c, 
-       ABNRegistrationDate__c, AccountStatus__c, 
-       Classifications__c, OSCACode__c
-FROM Account
-WHERE External_Id__c != null AND ABN__c != null
-"""
-
-print("  Querying Salesforce...")
-result = sf.query_all(query)
-df_sf = pd.DataFrame(result['records'])
-df_sf = df_sf.drop(columns=['attributes'], errors='ignore')
-
-print(f"  [OK] Found {len(df_sf):,} accounts with ABN")
-
-# ============================================================================
-# 2. Extract ABR data from SQL Server
-# ============================================================================
-print("\n[2/6] Extracting ABR data from SQL Server...")
+print("\n[1/4] Extracting ABR data from SQL Server...")
 
 try:
     sql_server = 'cosql-test.coinvest.com.au'
@@ -109,32 +82,9 @@ except Exception as e:
     exit(1)
 
 # ============================================================================
-# 3. Join Salesforce accounts with SQL Server ABR data
-# ============================================================================
-print("\n[3/6] Matching Salesforce accounts with ABR data...")
-
-# Clean ABN fields for joining
-df_sf['ABN_CLEAN'] = df_sf['ABN__c'].astype(str).str.replace(' ', '').str.strip()
-df_abr['ABN_CLEAN'] = df_abr['ABN'].astype(str).str.replace(' ', '').str.strip()
-
-print(f"  SF ABN sample: {df_sf['ABN_CLEAN'].head(3).tolist()}")
-print(f"  ABR ABN sample: {df_abr['ABN_CLEAN'].head(3).tolist()}")
-
-# Join on cleaned ABN
-df_merged = df_sf.merge(
-    df_abr, 
-    on='ABN_CLEAN', 
-    how='left',
-    suffixes=('', '_abr')
-)
-
-matched = df_merged['ABN_Status'].notna().sum()
-print(f"  [OK] Matched {matched:,} of {len(df_sf):,} accounts ({matched/len(df_sf)*100:.1f}%)")
-
-# ============================================================================
-# 4. Map SQL Server values to Salesforce fields
+# 2. Map SQL Server values to Salesforce fields (keyed by cleaned ABN)
 # ============================================================================
-print("\n[4/6] Preparing updates...")
+print("\n[2/4] Preparing ABR updates...")
 
 # Map ABN Status: Active → Registered, Cancelled → Cancelled
 status_mapping = {
@@ -143,99 +93,90 @@ status_mapping = {
     'Suspended': 'Suspended'
 }
 
-df_merged['ABN_Status'] = df_merged['ABN_Status'].map(status_mapping)
+df_abr['ABN_CLEAN'] = df_abr['ABN'].astype(str).str.replace(' ', '').str.strip()
+df_abr['ABN_Status'] = df_abr['ABN_Status'].map(status_mapping)
 
 # Convert date to ISO format
-df_merged['ABN_Registration_Date'] = pd.to_datetime(
-    df_merged['ABN_Registration_Date'], 
+df_abr['ABN_Registration_Date'] = pd.to_datetime(
+    df_abr['ABN_Registration_Date'], 
     errors='coerce'
 ).dt.strftime('%Y-%m-%d')
 
 # Convert Industry Code to string
-df_merged['Industry_Class_Code'] = df_merged['Industry_Class_Code'].apply(
+df_abr['Industry_Class_Code'] = df_abr['Industry_Class_Code'].apply(
     lambda x: str(int(x)) if pd.notna(x) else None
 )
 
 # Replace NaN with None
-df_merged = df_merged.where(pd.notna(df_merged), None)
+df_abr = df_abr.where(pd.notna(df_abr), None)
 
-# Filter to only records that have at least one new value
+# Only ABNs that have at least one new value
 # SKIP Classifications__c for now - picklist values don't match ANZSIC codes
-df_to_update = df_merged[
-    df_merged['ABN_Status'].notna() | 
-    df_merged['ABN_Registration_Date'].notna() |
-    df_merged['Industry_Class_Code'].notna()
-].copy()
+df_abr = df_abr[
+    df_abr['ABN_Status'].notna() | 
+    df_abr['ABN_Registration_Date'].notna() |
+    df_abr['Industry_Class_Code'].notna()
+]
+abr_updates = {
+    row.ABN_CLEAN: {
+        'ABNRegistrationDate__c': row.ABN_Registration_Date,
+        'AccountStatus__c': row.ABN_Status,
+        # Skip Classifications__c - ANZSIC values don't match SF picklist
+        # 'Classifications__c': row.Industry_Class,
+        'OSCACode__c': row.Industry_Class_Code
+    }
+    for row in df_abr.itertuples(index=False)
+}
+del df_abr
 
-print(f"  Records to update: {len(df_to_update):,}")
+print(f"  ABNs with updates: {len(abr_updates):,}")
 print(f"  NOTE: Skipping Classifications__c (ANZSIC values don't match SF picklist)")
-print(f"  Sample updates:")
-for i, row in df_to_update.head(3).iterrows():
-    print(f"    ID {row['Id']}: Status={row['ABN_Status']}, RegDate={row['ABN_Registration_Date']}, Code={row['Industry_Class_Code']}")
 
 # ============================================================================
-# 5. Update Salesforce accounts
+# 3. Stream Salesforce accounts with ABN and patch matches
 # ============================================================================
-print(f"\n[5/6] Updating {len(df_to_update):,} accounts in Salesforce...")
-print(f"  Batch size: {BATCH_SIZE}")
+print("\n[3/4] Updating Salesforce Accounts with ABR data...")
 
-success_count = 0
-error_count = 0
-errors = []
+sf = get_salesforce(domain='test')
 
-for i in range(0, len(df_to_update), BATCH_SIZE):
-    batch = df_to_update.iloc[i:i+BATCH_SIZE]
-    batch_num = i // BATCH_SIZE + 1
-    total_batches = (len(df_to_update) + BATCH_SIZE - 1) // BATCH_SIZE
-    
-    # Prepare records for bulk update
-    records = []
-    for _, row in batch.iterrows():
-        record = {
-            'Id': row['Id'],
-            'ABNRegistrationDate__c': row['ABN_Registration_Date'],
-            'AccountStatus__c': row['ABN_Status'],
-            # Skip Classifications__c - ANZSIC values don't match SF picklist
-            # 'Classifications__c': row['Industry_Class'],
-            'OSCACode__c': row['Industry_Class_Code']
-        }
-        records.append(record)
-    
-    try:
-        results = sf.bulk.Account.update(records)
-        
-        # Count successes and errors
-        batch_success = sum(1 for r in results if r['success'])
-        batch_errors = [r for r in results if not r['success']]
-        
-        success_count += batch_success
-        error_count += len(batch_errors)
-        
-        if batch_errors:
-            errors.extend(batch_errors[:5])  # Keep first 5 errors
-        
-        print(f"  Batch {batch_num}/{total_batches}: {batch_success}/{len(batch)} successful")
-        
-    except Exception as e:
-        print(f"  Batch {batch_num}/{total_batches}: [ERROR] {e}")
-        error_count += len(batch)
+samples = []
+
+def abr_patch(row):
+    """ABR fields for an Account row, or None when its ABN has no ABR match"""
+    update = abr_updates.get(str(row['ABN__c']).replace(' ', '').strip())
+    if update is not None and len(samples) < 3:
+        samples.append((row['Id'], update))
+    return update
+
+summary = patch_records(
+    sf, 'Account', "External_Id__c != null AND ABN__c != null",
+    transform=abr_patch, fields=['ABN__c']
+)
+matched = summary['planned']
+
+print(f"  Sample updates:")
+for account_id, update in samples:
+    print(f"    ID {account_id}: Status={update['AccountStatus__c']}, "
+          f"RegDate={update['ABNRegistrationDate__c']}, Code={update['OSCACode__c']}")
 
 # ============================================================================
-# 6. Summary
+# 4. Summary
 # ============================================================================
 print("\n" + "="*80)
 print("UPDATE SUMMARY")
 print("="*80)
-print(f"Total accounts queried: {len(df_sf):,}")
-print(f"Matched with ABR data: {matched:,} ({matched/len(df_sf)*100:.1f}%)")
-print(f"Records updated: {len(df_to_update):,}")
-print(f"Successful updates: {success_count:,}")
-print(f"Failed updates: {error_count:,}")
-print(f"Success rate: {success_count/len(df_to_update)*100:.1f}%")
-
-if errors:
+print(f"Total accounts queried: {summary['matched']:,}")
+if summary['matched']:
+    print(f"Matched with ABR data: {matched:,} ({matched/summary['matched']*100:.1f}%)")
+print(f"Records updated: {matched:,}")
+print(f"Successful updates: {summary['patched']:,}")
+print(f"Failed updates: {summary['failed']:,}")
+if matched:
+    print(f"Success rate: {summary['patched']/matched*100:.1f}%")
+
+if summary['failures']:
     print(f"\nSample errors:")
-    for err in errors[:3]:
-        print(f"  - {err}")
+    for err in summary['failures'][:3]:
+        print(f"  - {err['Id']}: {err['error']}")
 
 print("="*80)